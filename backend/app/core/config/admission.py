@@ -0,0 +1,27 @@
+import os
+
+# admission control for upstream model calls (per process)
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+
+
+def _limits(name: str, global_limit: int, per_user: int, queue: int) -> tuple[int, int, int]:
+    return (
+        int(os.getenv(f"ADMISSION_{name}_GLOBAL", str(global_limit))),
+        int(os.getenv(f"ADMISSION_{name}_PER_USER", str(per_user))),
+        int(os.getenv(f"ADMISSION_{name}_QUEUE", str(queue))),
+    )
+
+
+# operation -> (concurrent calls in the process, concurrent calls per user, waiters queued)
+# tts per user covers the legacy pipeline parallelism (LEGACY_TTS_PARALLELISM)
+ADMISSION_LIMITS = {
+    "stt": _limits("STT", 32, 2, 64),
+    "response": _limits("RESPONSE", 48, 2, 96),
+    "tts": _limits("TTS", 48, 4, 96),
+    "summary": _limits("SUMMARY", 8, 1, 32),
+    # open Realtime sockets (held for the whole call)
+    "realtime": _limits("REALTIME", 100, 2, 0),
+}
+
+# longest a call waits for a slot before it is rejected as busy
+ADMISSION_MAX_WAIT_MS = int(os.getenv("ADMISSION_MAX_WAIT_MS", "3000"))
@@ -0,0 +1,65 @@
+import os
+
+# audio downlink mode: buffered (send whole reply at once) / stream (framed PCM chunks as audio arrives)
+# realtime: chunks per output_audio delta, legacy: streamed TTS in PCM
+DOWNLINK_MODE = os.getenv("DOWNLINK_MODE", "buffered")
+
+# max PCM bytes per downlink frame (4800 bytes = 100ms @ 24kHz mono 16-bit)
+DOWNLINK_CHUNK_BYTES = int(os.getenv("DOWNLINK_CHUNK_BYTES", "4800"))
+
+# upstream sender queue (frontend audio -> Realtime), in frames
+UPSTREAM_QUEUE_MAX = int(os.getenv("UPSTREAM_QUEUE_MAX", "50"))
+
+# upstream queue overflow policy: coalesce / drop_oldest / disconnect
+UPSTREAM_OVERFLOW_POLICY = os.getenv("UPSTREAM_OVERFLOW_POLICY", "coalesce")
+
+# OpenAI Realtime input/output PCM rate
+REALTIME_SAMPLE_RATE = 24000
+
+# upstream append window: frames are merged into one input_audio_buffer.append per window
+UPSTREAM_WINDOW_MS = int(os.getenv("UPSTREAM_WINDOW_MS", "100"))
+
+# flush a partial window if no new frame arrives within this time
+UPSTREAM_FLUSH_TIMEOUT_MS = int(os.getenv("UPSTREAM_FLUSH_TIMEOUT_MS", "150"))
+
+# legacy recording buffer: max duration, and size past which it spills to a memory-mapped temp file
+LEGACY_MAX_RECORDING_SEC = int(os.getenv("LEGACY_MAX_RECORDING_SEC", "120"))
+LEGACY_SPILL_THRESHOLD_BYTES = int(os.getenv("LEGACY_SPILL_THRESHOLD_BYTES", str(2 * 1024 * 1024)))
+
+# local VAD (energy + zero-crossing): gate for realtime upstream, trimmer for legacy STT
+VAD_ENABLED = os.getenv("VAD_ENABLED", "1") == "1"
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "10"))
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "-50"))
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "10"))
+# adaptive noise floor never rises above this, so steady speech is not learned as noise
+VAD_NOISE_FLOOR_MAX_DB = float(os.getenv("VAD_NOISE_FLOOR_MAX_DB", "-45"))
+VAD_ZCR_MAX = float(os.getenv("VAD_ZCR_MAX", "0.35"))
+# hangover must stay above the Realtime server_vad silence_duration_ms (500ms) so turns still end
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "700"))
+VAD_PREROLL_MS = int(os.getenv("VAD_PREROLL_MS", "300"))
+VAD_TRIM_PAD_MS = int(os.getenv("VAD_TRIM_PAD_MS", "200"))
+
+# legacy voice: split the streamed reply into sentences and synthesize them concurrently (in-order playback)
+LEGACY_TTS_PIPELINE = os.getenv("LEGACY_TTS_PIPELINE", "1") == "1"
+LEGACY_TTS_PARALLELISM = int(os.getenv("LEGACY_TTS_PARALLELISM", "3"))
+# short sentences are merged until this length so each TTS call carries enough text
+LEGACY_TTS_MIN_SENTENCE_CHARS = int(os.getenv("LEGACY_TTS_MIN_SENTENCE_CHARS", "20"))
+
+# realtime session.update: sent only when base instruction / summaries change, coalesced over this window
+REALTIME_UPDATE_DEBOUNCE_MS = int(os.getenv("REALTIME_UPDATE_DEBOUNCE_MS", "300"))
+
+# synthesized-audio cache, content-addressed by (model, voice, format, text)
+# small entries stay in memory, every entry is also written under MEDIA_ROOT/TTS_CACHE_SUBDIR
+TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "1") == "1"
+TTS_CACHE_SUBDIR = os.getenv("TTS_CACHE_SUBDIR", "tts_cache")
+TTS_CACHE_MEMORY_MAX_BYTES = int(os.getenv("TTS_CACHE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024)))
+TTS_CACHE_MEMORY_ITEM_MAX_BYTES = int(os.getenv("TTS_CACHE_MEMORY_ITEM_MAX_BYTES", str(512 * 1024)))
+TTS_CACHE_DISK_MAX_BYTES = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+# long replies rarely repeat verbatim; they are synthesized without being cached
+TTS_CACHE_MAX_TEXT_CHARS = int(os.getenv("TTS_CACHE_MAX_TEXT_CHARS", "500"))
+# formats rendered ahead of time for greeting / fallback text (buffered mp3, stream pcm)
+TTS_PRERENDER_FORMATS = tuple(
+    f.strip() for f in os.getenv("TTS_PRERENDER_FORMATS", "mp3,pcm").split(",") if f.strip()
+)
+# greeting_message played on connect for legacy configs without a "greeting" field (opt-in)
+LEGACY_GREETING = os.getenv("LEGACY_GREETING", "0") == "1"
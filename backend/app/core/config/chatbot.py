@@ -0,0 +1,23 @@
+import os
+
+# process-level chatbot config cache (row + resolved models + compiled instruction)
+# entries are dropped on admin save/delete in this process; the TTL bounds staleness
+# for changes made through another worker
+CHATBOT_CACHE_TTL_SEC = int(os.getenv("CHATBOT_CACHE_TTL_SEC", "300"))
+CHATBOT_CACHE_MAX_ENTRIES = int(os.getenv("CHATBOT_CACHE_MAX_ENTRIES", "256"))
+
+# load every chatbot into the cache at startup
+CHATBOT_CACHE_PREWARM = os.getenv("CHATBOT_CACHE_PREWARM", "0") == "1"
+
+# models used when a chatbot row leaves a column empty
+DEFAULT_STT_MODEL = os.getenv("DEFAULT_STT_MODEL", "gpt-4o-mini-transcribe")
+DEFAULT_TTS_MODEL = os.getenv("DEFAULT_TTS_MODEL", "gpt-4o-mini-tts")
+DEFAULT_RESPONSE_MODEL = os.getenv("DEFAULT_RESPONSE_MODEL", "gpt-4o-mini")
+DEFAULT_REALTIME_MODEL = os.getenv("DEFAULT_REALTIME_MODEL", "gpt-4o-mini-realtime-preview")
+
+# exact-match answer cache for the first question of a session (text-data bots only, opt-in)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "0") == "1"
+RESPONSE_CACHE_TTL_SEC = int(os.getenv("RESPONSE_CACHE_TTL_SEC", "3600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+# longer questions are not cached (unlikely to repeat verbatim)
+RESPONSE_CACHE_MAX_QUESTION_CHARS = int(os.getenv("RESPONSE_CACHE_MAX_QUESTION_CHARS", "300"))
@@ -0,0 +1,68 @@
+import os
+
+# shared OpenAI HTTP transport (one httpx pool per traffic class, see openai_clients.py)
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "1") == "1"
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# interactive pool: stt / responses / tts / summaries (latency sensitive)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "40"))
+
+# bulk pool: files / vector stores (admin uploads must not starve live calls)
+OPENAI_BULK_MAX_CONNECTIONS = int(os.getenv("OPENAI_BULK_MAX_CONNECTIONS", "10"))
+OPENAI_BULK_MAX_KEEPALIVE = int(os.getenv("OPENAI_BULK_MAX_KEEPALIVE", "5"))
+
+OPENAI_KEEPALIVE_EXPIRY_SEC = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SEC", "60"))
+OPENAI_CONNECT_TIMEOUT_SEC = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SEC", "5"))
+# waiting for a free pooled connection
+OPENAI_POOL_TIMEOUT_SEC = float(os.getenv("OPENAI_POOL_TIMEOUT_SEC", "5"))
+
+# per-operation timeout (seconds); for streams this bounds the wait between chunks
+OPENAI_TIMEOUTS = {
+    "stt": float(os.getenv("OPENAI_TIMEOUT_STT_SEC", "20")),
+    "response": float(os.getenv("OPENAI_TIMEOUT_RESPONSE_SEC", "30")),
+    "tts": float(os.getenv("OPENAI_TIMEOUT_TTS_SEC", "30")),
+    "summary": float(os.getenv("OPENAI_TIMEOUT_SUMMARY_SEC", "60")),
+    "vector_store": float(os.getenv("OPENAI_TIMEOUT_VECTOR_STORE_SEC", "300")),
+}
+
+# hard deadline per call including retries (ms); the response stream deadline is to the first token
+STT_DEADLINE_MS = int(os.getenv("STT_DEADLINE_MS", "15000"))
+RESPONSE_DEADLINE_MS = int(os.getenv("RESPONSE_DEADLINE_MS", "25000"))
+RESPONSE_FIRST_TOKEN_DEADLINE_MS = int(os.getenv("RESPONSE_FIRST_TOKEN_DEADLINE_MS", "10000"))
+
+# hedging: when a call is still running after the HEDGE_PERCENTILE latency recently observed
+# for its model, a duplicate is sent and the first result wins (the other is cancelled)
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "1") == "1"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_DELAY_MS = int(os.getenv("HEDGE_MIN_DELAY_MS", "300"))
+# no hedging until this many latencies were observed for the model
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+# hedges / calls per model never exceeds this (bounds the extra upstream cost)
+HEDGE_MAX_RATIO = float(os.getenv("HEDGE_MAX_RATIO", "0.1"))
+# recent latencies kept per operation + model
+LATENCY_SAMPLES = int(os.getenv("LATENCY_SAMPLES", "500"))
+
+# circuit breaker per upstream operation: opens when at least BREAKER_MIN_CALLS outcomes from the
+# last BREAKER_WINDOW_SEC are in the window and the failed-or-slow share reaches BREAKER_FAILURE_RATIO
+BREAKER_ENABLED = os.getenv("BREAKER_ENABLED", "1") == "1"
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_WINDOW_SEC = int(os.getenv("BREAKER_WINDOW_SEC", "60"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "8"))
+BREAKER_FAILURE_RATIO = float(os.getenv("BREAKER_FAILURE_RATIO", "0.5"))
+# fail fast this long, then let BREAKER_HALF_OPEN_PROBES calls through; all must succeed to close
+BREAKER_OPEN_MS = int(os.getenv("BREAKER_OPEN_MS", "15000"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "2"))
+
+# a call slower than this counts as a failure (ms, 0 = latency ignored)
+# response / tts are measured to the first token / byte
+BREAKER_SLOW_MS = {
+    "realtime": int(os.getenv("BREAKER_SLOW_REALTIME_MS", "5000")),
+    "response": int(os.getenv("BREAKER_SLOW_RESPONSE_MS", "8000")),
+    "stt": int(os.getenv("BREAKER_SLOW_STT_MS", "8000")),
+    "tts": int(os.getenv("BREAKER_SLOW_TTS_MS", "5000")),
+    "vector_store": int(os.getenv("BREAKER_SLOW_VECTOR_STORE_MS", "0")),
+}
+# non-stream response calls share the response circuit but are timed end to end
+# (summaries in the background are not timed at all, only their failures count)
+BREAKER_SLOW_RESPONSE_FULL_MS = int(os.getenv("BREAKER_SLOW_RESPONSE_FULL_MS", "20000"))
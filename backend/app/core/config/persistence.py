@@ -0,0 +1,15 @@
+import os
+
+# write-behind queue for transcript messages / log-end updates (flushed in batches off the hot path)
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "1") == "1"
+
+# flush when this many records are queued, or this long after the first queued record
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100"))
+WRITE_BEHIND_FLUSH_MS = int(os.getenv("WRITE_BEHIND_FLUSH_MS", "500"))
+
+# queued records; when full, writes fall back to inline (caller waits on the DB)
+WRITE_BEHIND_QUEUE_MAX = int(os.getenv("WRITE_BEHIND_QUEUE_MAX", "10000"))
+
+# retries per batch (exponential backoff from WRITE_BEHIND_RETRY_BASE_MS) before it is dropped
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "3"))
+WRITE_BEHIND_RETRY_BASE_MS = int(os.getenv("WRITE_BEHIND_RETRY_BASE_MS", "200"))
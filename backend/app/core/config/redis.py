@@ -1,6 +1,7 @@
 import os
 
 import redis
+import redis.asyncio as aioredis
 
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
@@ -8,9 +9,20 @@ REDIS_DB = int(os.getenv("REDIS_DB", "0"))
 
 SESSION_TTL = int(os.getenv("SESSION_TTL", "3600")) 
 
+# conversation state backend: memory (per process) / redis (shared across workers, survives restarts)
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+
 redis_client = redis.Redis(
     host=REDIS_HOST,
     port=REDIS_PORT,
     db=REDIS_DB,
     decode_responses=True,
 )
+
+# asyncio client for request/websocket paths
+async_redis_client = aioredis.Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=REDIS_DB,
+    decode_responses=True,
+)
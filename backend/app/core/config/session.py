@@ -0,0 +1,39 @@
+import os
+
+from app.core.config.redis import SESSION_TTL
+
+# in-process session store bounds (SESSION_STORE=memory)
+# idle sessions are dropped after SESSION_TTL seconds, and hibernated (compressed) after this many
+SESSION_HIBERNATE_AFTER_SEC = int(os.getenv("SESSION_HIBERNATE_AFTER_SEC", "300"))
+SESSION_IDLE_TTL_SEC = int(os.getenv("SESSION_IDLE_TTL_SEC", str(SESSION_TTL)))
+
+# global byte budget: past it, least recently used sessions are hibernated, then evicted
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+
+SESSION_SWEEP_INTERVAL_SEC = int(os.getenv("SESSION_SWEEP_INTERVAL_SEC", "30"))
+
+# prompt token budget per response model (instructions + summaries + history), set below the
+# context limit on purpose: past a few thousand tokens latency and cost grow with little gain
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000"))
+CONTEXT_TOKEN_BUDGETS = {
+    "gpt-4o-mini": CONTEXT_TOKEN_BUDGET,
+    "gpt-4o": CONTEXT_TOKEN_BUDGET,
+    "gpt-4.1-mini": CONTEXT_TOKEN_BUDGET,
+    "gpt-4.1-nano": 4000,
+    "gpt-4o-mini-realtime-preview": 4000,
+    "gpt-realtime": 6000,
+}
+
+# summarization: history is summarized in the background (single-flight per session) once it
+# takes more than this share of the budget left after base instruction + summaries
+HISTORY_SUMMARIZE_SHARE = float(os.getenv("HISTORY_SUMMARIZE_SHARE", "0.5"))
+
+# local token estimate: ASCII chars per token, tokens per non-ASCII char (Hangul etc.), per message
+TOKEN_EST_ASCII_CHARS_PER_TOKEN = float(os.getenv("TOKEN_EST_ASCII_CHARS_PER_TOKEN", "4.0"))
+TOKEN_EST_NON_ASCII_TOKENS_PER_CHAR = float(os.getenv("TOKEN_EST_NON_ASCII_TOKENS_PER_CHAR", "0.8"))
+TOKEN_EST_MESSAGE_OVERHEAD = int(os.getenv("TOKEN_EST_MESSAGE_OVERHEAD", "4"))
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-4o-mini")
+# max chars per summary; when the summary block grows past SUMMARY_BLOCK_MAX_CHARS,
+# older summaries are merged into one summary-of-summaries
+SUMMARY_MAX_CHARS = int(os.getenv("SUMMARY_MAX_CHARS", "1500"))
+SUMMARY_BLOCK_MAX_CHARS = int(os.getenv("SUMMARY_BLOCK_MAX_CHARS", "4000"))
@@ -1,4 +1,5 @@
 # app/core/database/base.py
+import time
 from datetime import datetime
 from typing import Optional
 import pytz
@@ -23,6 +24,57 @@ async def get_session():
     async with SessionLocal() as session:
         yield session
 
+# --- ✅ 작업 단위 세션 (WebSocket 등 오래 유지되는 연결용) ---
+# 레포지토리 메서드 호출마다 세션을 열고 끝나면 바로 풀에 반납
+class SessionPerCall:
+    # process-wide counters
+    opened = 0
+    in_flight = 0
+    max_in_flight = 0
+    held_ms = 0.0
+
+    def __init__(self, repo_cls):
+        self._repo_cls = repo_cls
+
+    def __getattr__(self, name):
+        method = getattr(self._repo_cls, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            cls = SessionPerCall
+            cls.opened += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            start = time.monotonic()
+            try:
+                async with SessionLocal() as session:
+                    return await method(self._repo_cls(session), *args, **kwargs)
+            finally:
+                cls.in_flight -= 1
+                cls.held_ms += (time.monotonic() - start) * 1000
+
+        return call
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            "opened": cls.opened,
+            "in_flight": cls.in_flight,
+            "max_in_flight": cls.max_in_flight,
+            "avg_held_ms": round(cls.held_ms / cls.opened, 1) if cls.opened else 0.0,
+        }
+
+# 커넥션 풀 사용량
+def pool_stats() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checked_in": pool.checkedin(),
+    }
+
 def parse_date(d: Optional[str]):
     if not d:
         return None
@@ -3,7 +3,7 @@
 from fastapi import Depends, Request, WebSocket
 from typing import Union
 from typing import Optional
-from app.core.database.base import get_session
+from app.core.database.base import SessionPerCall, get_session
 
 # repo & service import는 나중에
 # -> 순환 참조 방지를 위해 내부에서 import
@@ -25,25 +25,31 @@ class ServiceProvider:
         self._native_service = None
         self._ws_service = None
 
+    # db가 없으면(WebSocket) 메서드 호출마다 짧은 세션을 쓰는 레포지토리
+    def _repo(self, repo_cls):
+        if self.db is None:
+            return SessionPerCall(repo_cls)
+        return repo_cls(self.db)
+
     @property
     def user_repo(self):
         if not self._user_repo:
             from app.module.user.user_repository import UserRepository
-            self._user_repo = UserRepository(self.db)
+            self._user_repo = self._repo(UserRepository)
         return self._user_repo
 
     @property
     def admin_repo(self):
         if not self._admin_repo:
             from app.module.admin.admin_repository import AdminRepository
-            self._admin_repo = AdminRepository(self.db)
+            self._admin_repo = self._repo(AdminRepository)
         return self._admin_repo
 
     @property
     def gpt_repo(self):
         if not self._gpt_repo:
             from app.module.infra.gpt_repository import GptRepository
-            self._gpt_repo = GptRepository(self.db)
+            self._gpt_repo = self._repo(GptRepository)
         return self._gpt_repo
 
     @property
@@ -57,7 +63,7 @@ class ServiceProvider:
     def admin_service(self):
         if not self._admin_service:
             from app.module.admin.admin_service import AdminService
-            self._admin_service = AdminService(self.admin_repo, self.gpt_repo)
+            self._admin_service = AdminService(self.admin_repo, self.gpt_repo, self.gpt_service)
         return self._admin_service
 
     @property
@@ -108,8 +114,8 @@ async def get_provider(
 ):
     return ServiceProvider(request, db)
 
+# WebSocket은 연결 내내 세션을 잡지 않음 (레포지토리 호출 단위로 세션 사용)
 async def get_provider_ws(
     websocket: WebSocket,
-    db=Depends(get_session),
 ):
-    return ServiceProvider(websocket, db)
\ No newline at end of file
+    return ServiceProvider(websocket, None)
\ No newline at end of file
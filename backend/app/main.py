@@ -1,15 +1,38 @@
 # 역할: FastAPI 앱 진입점 / 앱 생성, 미들웨어 등록, DB 초기화, 라우터 연결 등
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config.settings import settings  # 글로벌 설정 인스턴스
+from app.core.config.chatbot import CHATBOT_CACHE_PREWARM
 from app.core.middleware import register
+from app.module.infra.chatbot_cache import chatbot_cache
+from app.module.infra.openai_clients import openai_clients
+from app.module.infra.session_store import session_store
+from app.module.infra.tts_cache import tts_cache
+from app.module.infra.write_behind import write_behind
 from app.module import *
 
 
+# 앱 수명주기: 시작 시 챗봇 설정 캐시 prewarm(옵션), 종료 시 write-behind 큐에 남은 메시지/로그를 모두 DB에 기록, 세션 저장소 / TTS 캐시 디스크 쓰기 / OpenAI 커넥션 풀 정리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if CHATBOT_CACHE_PREWARM:
+        try:
+            print(f"[chatbot_cache] prewarmed {await chatbot_cache.prewarm()} chatbots")
+        except Exception as e:
+            print(f"Error in chatbot_cache.prewarm: {e}")
+    yield
+    await write_behind.close()
+    await session_store.close()
+    await tts_cache.close()
+    await openai_clients.close()
+
+
 # FastAPI 앱을 생성하고 필요한 설정을 적용하는 팩토리 함수
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     # CORS 및 보안 헤더 미들웨어 등록
     register.register_middlewares(app)
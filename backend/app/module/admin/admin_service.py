@@ -1,29 +1,44 @@
 from fastapi.param_functions import Body
 from app.module.admin.admin_repository import AdminRepository
+from app.module.infra.chatbot_cache import DEFAULT_MODELS, chatbot_cache
+from app.module.infra.response_cache import response_cache
+from app.module.infra.circuit_breaker import CircuitOpen, breaker
 from app.module.infra.gpt_repository import GptRepository
-from app.core.utils.response import success
+from app.module.infra.gpt_service import GPTService
+from app.module.infra.openai_clients import VECTOR_STORE, openai_client
+from app.core.utils.response import fail, success
 import json
-from openai import AsyncOpenAI
-from app.core.config.settings import settings
+from contextlib import asynccontextmanager
 from typing import List, Optional, Tuple
 from io import BytesIO
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
-
 class AdminService:
-    def __init__(self, admin_repo: AdminRepository, gpt_repo: GptRepository):
+    def __init__(self, admin_repo: AdminRepository, gpt_repo: GptRepository, gpt_service: GPTService):
         self.admin_repo = admin_repo
         self.gpt_repo = gpt_repo
+        self.gpt_service = gpt_service
 
     # ===================================
     # helpers (create_vc, delete_vc, add_file, delete_file, dedupe_pair)
     # ===================================
+    # vector store / file calls go through the vector_store circuit; open -> 503 right away
+    # the client (bulk OpenAI pool) is looked up per call, like every other caller
+    @asynccontextmanager
+    async def vector_store_call(self):
+        try:
+            async with breaker(VECTOR_STORE).guard():
+                yield openai_client(VECTOR_STORE)
+        except CircuitOpen as e:
+            fail(str(e), error_code="UPSTREAM_UNAVAILABLE", status_code=503)
+
     async def create_vc(self) -> str:
-        vs = await client.vector_stores.create(name="quick_data_vc")
+        async with self.vector_store_call() as client:
+            vs = await client.vector_stores.create(name="quick_data_vc")
         return vs.id
 
     async def delete_vc(self, vc_id: str):
-        await client.vector_stores.delete(vector_store_id=vc_id)
+        async with self.vector_store_call() as client:
+            await client.vector_stores.delete(vector_store_id=vc_id)
         return True
 
     async def add_file(self, vc_id, files):
@@ -36,34 +51,38 @@ class AdminService:
             else:
                 continue
 
-            created = await client.files.create(
-                file=(file_name, BytesIO(file_content)),
-                purpose="assistants",
-            )
+            async with self.vector_store_call() as client:
+                created = await client.files.create(
+                    file=(file_name, BytesIO(file_content)),
+                    purpose="assistants",
+                )
 
             vc_file_ids.append(created.id)
             vc_file_names.append(file_name)
 
         if vc_file_ids:
-            await client.vector_stores.file_batches.create_and_poll(
-                vector_store_id=vc_id,
-                file_ids=vc_file_ids,
-            )
+            async with self.vector_store_call() as client:
+                await client.vector_stores.file_batches.create_and_poll(
+                    vector_store_id=vc_id,
+                    file_ids=vc_file_ids,
+                )
         return vc_file_ids, vc_file_names
 
     async def delete_file(self, vc_id: str, file_ids: list[str]):
         for fid in file_ids:
             try:
-                await client.vector_stores.files.delete(
-                    vector_store_id=vc_id,
-                    file_id=fid,
-                )
+                async with self.vector_store_call() as client:
+                    await client.vector_stores.files.delete(
+                        vector_store_id=vc_id,
+                        file_id=fid,
+                    )
             except Exception as e:
                 print(f"[unlink warn] vc={vc_id}, file={fid}, err={e}")
 
         for fid in file_ids:
             try:
-                await client.files.delete(fid)
+                async with self.vector_store_call() as client:
+                    await client.files.delete(fid)
             except Exception as e:
                 print(f"[files.delete warn] file={fid}, err={e}")
 
@@ -233,6 +252,15 @@ class AdminService:
             vector_file_ids=vector_file_ids,
             vector_file_names=vector_file_names,
         )
+        if chatbot_id:
+            chatbot_cache.invalidate(chatbot_id)
+            response_cache.invalidate(chatbot_id)
+
+        # greeting / fixed fallback audio rendered now, so sessions never wait on TTS for them
+        self.gpt_service.schedule_prerender(
+            [greeting_message, fallback_text if fallback_type else None],
+            tts_model=(chatbot.tts_model if chatbot else None) or DEFAULT_MODELS["tts_model"],
+        )
 
         return success("success")
 
@@ -245,4 +273,6 @@ class AdminService:
                 await self.delete_file(chatbot.vector_store_id, chatbot.vector_file_ids)
                 await self.delete_vc(chatbot.vector_store_id)
         await self.gpt_repo.delete_chatbot(chatbot_id)
+        chatbot_cache.invalidate(chatbot_id)
+        response_cache.invalidate(chatbot_id)
         return success("success")
\ No newline at end of file
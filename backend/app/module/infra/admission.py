@@ -0,0 +1,187 @@
+# app/module/infra/admission.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Hashable, Optional
+
+from app.core.config.admission import ADMISSION_ENABLED, ADMISSION_LIMITS, ADMISSION_MAX_WAIT_MS
+
+# operations besides the OpenAI HTTP ones (openai_clients.STT / RESPONSE / TTS / SUMMARY)
+REALTIME = "realtime"
+
+QUEUE_FULL = "queue_full"
+TIMEOUT = "timeout"
+
+# recent admission waits kept per operation for the percentiles
+WAIT_SAMPLES = 1000
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, operation: str, reason: str):
+        super().__init__(f"{operation} busy ({reason})")
+        self.operation = operation
+        self.reason = reason
+
+
+@dataclass(slots=True)
+class _Waiter:
+    user: Optional[Hashable]
+    future: asyncio.Future
+    start: float
+
+
+# one operation: a global limit, a per-user limit and a bounded FIFO of waiters
+# a waiter blocked by its own user limit does not hold back other users behind it
+class _Gate:
+    def __init__(self, operation: str, global_limit: int, per_user: int, queue_max: int):
+        self.operation = operation
+        self.global_limit = max(1, global_limit)
+        self.per_user = max(1, per_user)
+        self.queue_max = max(0, queue_max)
+
+        self.in_flight = 0
+        self._users: Dict[Hashable, int] = {}
+        self._waiters: deque[_Waiter] = deque()
+
+        # counters
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = {QUEUE_FULL: 0, TIMEOUT: 0}
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.max_wait_ms = 0.0
+
+    def _fits(self, user: Optional[Hashable]) -> bool:
+        return self.in_flight < self.global_limit and (
+            user is None or self._users.get(user, 0) < self.per_user
+        )
+
+    def _take(self, user: Optional[Hashable], wait_ms: float) -> None:
+        self.in_flight += 1
+        if user is not None:
+            self._users[user] = self._users.get(user, 0) + 1
+        self.admitted += 1
+        self._waits.append(wait_ms)
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def _grant(self) -> None:
+        for waiter in list(self._waiters):
+            if self.in_flight >= self.global_limit:
+                return
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+            elif self._fits(waiter.user):
+                # the slot is taken here, before the waiter resumes, so nobody can overtake it
+                self._waiters.remove(waiter)
+                self._take(waiter.user, (time.monotonic() - waiter.start) * 1000)
+                waiter.future.set_result(None)
+
+    async def acquire(self, user: Optional[Hashable], max_wait_ms: int) -> None:
+        # every waiter that fits is granted on release, so anyone queued is blocked
+        if self._fits(user):
+            self._take(user, 0.0)
+            return
+
+        if len(self._waiters) >= self.queue_max:
+            self.rejected[QUEUE_FULL] += 1
+            raise AdmissionRejected(self.operation, QUEUE_FULL)
+
+        waiter = _Waiter(user, asyncio.get_running_loop().create_future(), time.monotonic())
+        self._waiters.append(waiter)
+        self.queued += 1
+        # asyncio.wait leaves the future alone and never swallows a cancellation
+        # (wait_for returns the result instead when the grant and the cancel race)
+        try:
+            await asyncio.wait((waiter.future,), timeout=max_wait_ms / 1000)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(user)  # granted, but the caller went away: hand the slot on
+            else:
+                waiter.future.cancel()
+                self._remove(waiter)
+            raise
+        if not waiter.future.done():
+            waiter.future.cancel()
+            self._remove(waiter)
+            self.rejected[TIMEOUT] += 1
+            raise AdmissionRejected(self.operation, TIMEOUT)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, user: Optional[Hashable]) -> None:
+        self.in_flight -= 1
+        if user is not None:
+            count = self._users.get(user, 0) - 1
+            if count > 0:
+                self._users[user] = count
+            else:
+                self._users.pop(user, None)
+        self._grant()
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "global_limit": self.global_limit,
+            "per_user_limit": self.per_user,
+            "queue_max": self.queue_max,
+            "in_flight": self.in_flight,
+            "users": len(self._users),
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits), 1) if waits else 0.0,
+                "p95": round(p95, 1),
+                "max": round(self.max_wait_ms, 1),
+            },
+        }
+
+
+# per-process admission for upstream model calls; a call that cannot get a slot within
+# max_wait_ms (or finds the wait queue full) fails fast with AdmissionRejected
+class AdmissionController:
+    def __init__(
+        self,
+        limits: Dict[str, tuple[int, int, int]] = ADMISSION_LIMITS,
+        max_wait_ms: int = ADMISSION_MAX_WAIT_MS,
+        enabled: bool = ADMISSION_ENABLED,
+    ):
+        self.enabled = enabled
+        self.max_wait_ms = max_wait_ms
+        self._gates = {op: _Gate(op, *limit) for op, limit in limits.items()}
+
+    async def acquire(self, operation: str, user: Optional[Hashable] = None) -> None:
+        if self.enabled:
+            await self._gates[operation].acquire(user, self.max_wait_ms)
+
+    def release(self, operation: str, user: Optional[Hashable] = None) -> None:
+        if self.enabled:
+            self._gates[operation].release(user)
+
+    @asynccontextmanager
+    async def slot(self, operation: str, user: Optional[Hashable] = None) -> AsyncIterator[None]:
+        await self.acquire(operation, user)
+        try:
+            yield
+        finally:
+            self.release(operation, user)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_wait_ms": self.max_wait_ms,
+            "operations": {op: gate.stats() for op, gate in self._gates.items()},
+        }
+
+
+admission = AdmissionController()
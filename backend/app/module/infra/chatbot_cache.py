@@ -0,0 +1,190 @@
+# app/module/infra/chatbot_cache.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, Optional
+
+from app.core.config.chatbot import (
+    CHATBOT_CACHE_MAX_ENTRIES,
+    CHATBOT_CACHE_TTL_SEC,
+    DEFAULT_REALTIME_MODEL,
+    DEFAULT_RESPONSE_MODEL,
+    DEFAULT_STT_MODEL,
+    DEFAULT_TTS_MODEL,
+)
+from app.core.database.base import SessionPerCall
+from app.module.infra.gpt import Chatbot
+from app.module.infra.gpt_repository import GptRepository
+
+DEFAULT_MODELS = {
+    "stt_model": DEFAULT_STT_MODEL,
+    "tts_model": DEFAULT_TTS_MODEL,
+    "response_model": DEFAULT_RESPONSE_MODEL,
+    "realtime_model": DEFAULT_REALTIME_MODEL,
+}
+
+
+# base instruction (persona + training data + fallback rule) for a chatbot row
+def compile_instruction(chatbot: Chatbot) -> str:
+    instruction = f"[지침]\n{chatbot.description}"
+
+    if chatbot.data_type == "text":
+        instruction += f"\n[학습 데이터]\n 해당 데이터를 활용하여 답해주세요.\n{chatbot.text_data}"
+
+    if chatbot.fallback_type:
+        instruction += (
+            "[데이터 찾기 실패시 아래 텍스트로만 답해주세요.]"
+            f"{chatbot.fallback_text}"
+        )
+    else:
+        instruction += (
+            "[데이터 찾기 실패시 학습 데이터말고도 알고있는 지식을 활용하여 답해주세요.]"
+            f"{chatbot.fallback_text}"
+        )
+    return instruction
+
+
+# immutable snapshot of one chatbot row, detached from the DB session
+@dataclass(frozen=True)
+class ChatbotConfig:
+    id: int
+    version: int
+    name: str
+    data_type: Optional[str]
+    greeting_message: Optional[str]
+    fallback_type: Optional[bool]
+    fallback_text: Optional[str]
+    vector_store_id: Optional[str]
+    models: Dict[str, str]
+    instruction: str
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_row(cls, chatbot: Chatbot, version: int) -> "ChatbotConfig":
+        return cls(
+            id=chatbot.id,
+            version=version,
+            name=chatbot.name,
+            data_type=chatbot.data_type,
+            greeting_message=chatbot.greeting_message,
+            fallback_type=chatbot.fallback_type,
+            fallback_text=chatbot.fallback_text,
+            vector_store_id=chatbot.vector_store_id,
+            models={key: getattr(chatbot, key) or default for key, default in DEFAULT_MODELS.items()},
+            instruction=compile_instruction(chatbot),
+        )
+
+
+# chatbot_id -> ChatbotConfig for the whole process
+# the table has no version column, so each id carries an in-process version bumped on
+# invalidation: a load that started before a save/delete is returned to its waiters but
+# never cached. concurrent misses for one id share a single query (single-flight)
+class ChatbotConfigCache:
+    def __init__(
+        self,
+        ttl_sec: int = CHATBOT_CACHE_TTL_SEC,
+        max_entries: int = CHATBOT_CACHE_MAX_ENTRIES,
+        repo=None,
+    ):
+        self.ttl = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self._repo = repo or SessionPerCall(GptRepository)
+
+        self._entries: OrderedDict[int, ChatbotConfig] = OrderedDict()  # least recently used first
+        self._versions: Dict[int, int] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.invalidations = 0
+
+    def _fresh(self, config: ChatbotConfig) -> bool:
+        return (
+            config.version == self._versions.get(config.id, 0)
+            and time.monotonic() - config.loaded_at < self.ttl
+        )
+
+    def _store(self, config: ChatbotConfig) -> None:
+        self._entries[config.id] = config
+        self._entries.move_to_end(config.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, chatbot_id: int) -> Optional[ChatbotConfig]:
+        config = self._entries.get(chatbot_id)
+        if config is not None and self._fresh(config):
+            self.hits += 1
+            self._entries.move_to_end(chatbot_id)
+            return config
+
+        task = self._loading.get(chatbot_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(chatbot_id, self._versions.get(chatbot_id, 0)))
+            self._loading[chatbot_id] = task
+            task.add_done_callback(partial(self._load_done, chatbot_id))
+        else:
+            self.coalesced += 1
+        # a cancelled caller must not cancel the load the others are waiting on
+        return await asyncio.shield(task)
+
+    def _load_done(self, chatbot_id: int, task: asyncio.Task) -> None:
+        if self._loading.get(chatbot_id) is task:
+            del self._loading[chatbot_id]
+
+    async def _load(self, chatbot_id: int, version: int) -> Optional[ChatbotConfig]:
+        self.loads += 1
+        try:
+            chatbot = await self._repo.get_admin_chatbot_detail(chatbot_id)
+        except Exception:
+            self.load_errors += 1
+            raise
+        if chatbot is None:
+            return None
+
+        config = ChatbotConfig.from_row(chatbot, version)
+        if version == self._versions.get(chatbot_id, 0):
+            self._store(config)
+        return config
+
+    # after the row changed or was deleted (call once the DB write is committed)
+    def invalidate(self, chatbot_id: int) -> None:
+        self._versions[chatbot_id] = self._versions.get(chatbot_id, 0) + 1
+        self._entries.pop(chatbot_id, None)
+        self._loading.pop(chatbot_id, None)
+        self.invalidations += 1
+
+    # load every chatbot with one query; returns the number cached
+    async def prewarm(self) -> int:
+        chatbots = await self._repo.get_admin_chatbot_list()
+        for chatbot in chatbots[: self.max_entries]:
+            self._store(ChatbotConfig.from_row(chatbot, self._versions.get(chatbot.id, 0)))
+        return min(len(chatbots), self.max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# process-wide cache used by GPTService / AdminService
+chatbot_cache = ChatbotConfigCache()
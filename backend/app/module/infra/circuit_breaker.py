@@ -0,0 +1,249 @@
+# app/module/infra/circuit_breaker.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import openai
+
+from app.core.config.openai import (
+    BREAKER_ENABLED,
+    BREAKER_FAILURE_RATIO,
+    BREAKER_HALF_OPEN_PROBES,
+    BREAKER_MIN_CALLS,
+    BREAKER_OPEN_MS,
+    BREAKER_SLOW_MS,
+    BREAKER_WINDOW,
+    BREAKER_WINDOW_SEC,
+)
+from app.module.infra.admission import AdmissionRejected
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+CIRCUIT_OPEN = "circuit_open"
+
+
+class CircuitOpen(Exception):
+    def __init__(self, operation: str, retry_after_ms: int):
+        super().__init__(f"{operation} unavailable (circuit open, retry in {retry_after_ms}ms)")
+        self.operation = operation
+        self.reason = CIRCUIT_OPEN
+        self.retry_after_ms = retry_after_ms
+
+
+# upstream trouble counts; our own rejections and client errors (4xx except 429) do not
+def is_failure(exc: BaseException) -> bool:
+    if isinstance(exc, (CircuitOpen, AdmissionRejected)):
+        return False
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return isinstance(exc, Exception)
+
+
+# one call through the breaker; mark() ends the latency measurement early (first token / byte)
+class _Call:
+    def __init__(self):
+        self.start = time.monotonic()
+        self.latency_ms: Optional[float] = None
+
+    def mark(self) -> None:
+        if self.latency_ms is None:
+            self.latency_ms = (time.monotonic() - self.start) * 1000
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.start) * 1000
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        operation: str,
+        slow_ms: int = 0,
+        window: int = BREAKER_WINDOW,
+        window_sec: int = BREAKER_WINDOW_SEC,
+        min_calls: int = BREAKER_MIN_CALLS,
+        failure_ratio: float = BREAKER_FAILURE_RATIO,
+        open_ms: int = BREAKER_OPEN_MS,
+        half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+        enabled: bool = BREAKER_ENABLED,
+    ):
+        self.operation = operation
+        self.slow_ms = slow_ms
+        self.window_sec = window_sec
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.open_ms = open_ms
+        self.half_open_probes = max(1, half_open_probes)
+        self.enabled = enabled
+
+        self.state = CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window)  # (time, failed or slow)
+        self._opened_at = 0.0
+        self._probes = 0           # probes in flight (half-open)
+        self._probe_successes = 0
+
+        # counters
+        self.calls = 0
+        self.failures = 0
+        self.slow = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def retry_after_ms(self) -> int:
+        if self.state != OPEN:
+            return 0
+        return max(0, int(self.open_ms - (time.monotonic() - self._opened_at) * 1000))
+
+    def is_open(self) -> bool:
+        return self.enabled and self.state == OPEN and self.retry_after_ms() > 0
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._probe_successes = 0
+        self._outcomes.clear()
+        self.opened += 1
+        print(f"[circuit] {self.operation} open for {self.open_ms}ms")
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._probes = 0
+        self._probe_successes = 0
+        self._outcomes.clear()
+        print(f"[circuit] {self.operation} closed")
+
+    # fail fast before queueing for anything else (no probe is taken)
+    def check(self) -> None:
+        if self.is_open():
+            self.rejected += 1
+            raise CircuitOpen(self.operation, self.retry_after_ms())
+
+    # admit a call or fail fast; returns True when the call is a half-open probe
+    def _admit(self) -> bool:
+        if self.state == OPEN:
+            if self.retry_after_ms() > 0:
+                self.rejected += 1
+                raise CircuitOpen(self.operation, self.retry_after_ms())
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probes + self._probe_successes >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpen(self.operation, 0)
+            self._probes += 1
+            return True
+        return False
+
+    # a probe that ended without a verdict (or after another probe decided)
+    def _release_probe(self) -> None:
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _record(self, probe: bool, bad: bool) -> None:
+        if probe:
+            if self.state != HALF_OPEN:
+                return  # another probe already decided
+            self._release_probe()
+            if bad:
+                self._open()
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._close()
+            return
+
+        if self.state != CLOSED:
+            return  # finished after the circuit opened
+        now = time.monotonic()
+        self._outcomes.append((now, bad))
+        while self._outcomes and now - self._outcomes[0][0] > self.window_sec:
+            self._outcomes.popleft()
+        if len(self._outcomes) >= self.min_calls:
+            bad_count = sum(1 for _, b in self._outcomes if b)
+            if bad_count / len(self._outcomes) >= self.failure_ratio:
+                self._open()
+
+    # slow_ms overrides the breaker's threshold for calls timed differently (0 = latency ignored)
+    @asynccontextmanager
+    async def guard(self, slow_ms: Optional[int] = None) -> AsyncIterator[_Call]:
+        if not self.enabled:
+            yield _Call()
+            return
+
+        slow_ms = self.slow_ms if slow_ms is None else slow_ms
+        probe = self._admit()
+        self.calls += 1
+        call = _Call()
+        try:
+            yield call
+        except asyncio.CancelledError:
+            # hedge loser / deadline: only counts when it was already too slow
+            slow = bool(slow_ms) and call.latency_ms is None and call.elapsed_ms() >= slow_ms
+            if slow:
+                self.slow += 1
+                self._record(probe, True)
+            elif probe:
+                self._release_probe()
+            raise
+        except BaseException as e:
+            if is_failure(e):
+                self.failures += 1
+                self._record(probe, True)
+            elif probe:
+                self._release_probe()
+            raise
+        else:
+            call.mark()
+            slow = bool(slow_ms) and call.latency_ms >= slow_ms
+            if slow:
+                self.slow += 1
+            self._record(probe, slow)
+
+    def stats(self) -> Dict[str, Any]:
+        window = list(self._outcomes)
+        return {
+            "state": self.state if self.enabled else "disabled",
+            "retry_after_ms": self.retry_after_ms(),
+            "window": len(window),
+            "window_failure_ratio": (
+                round(sum(1 for _, b in window if b) / len(window), 3) if window else 0.0
+            ),
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow": self.slow,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+# process-wide breakers, one per upstream operation
+class CircuitBreakers:
+    def __init__(self, slow_ms: Dict[str, int] = BREAKER_SLOW_MS):
+        self._breakers = {op: CircuitBreaker(op, slow) for op, slow in slow_ms.items()}
+
+    def get(self, operation: str) -> CircuitBreaker:
+        return self._breakers[operation]
+
+    # operation -> ms until the next probe, for every open circuit among `operations`
+    def open_operations(self, operations: Optional[list[str]] = None) -> Dict[str, int]:
+        return {
+            op: breaker.retry_after_ms()
+            for op, breaker in self._breakers.items()
+            if (operations is None or op in operations) and breaker.is_open()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {op: breaker.stats() for op, breaker in self._breakers.items()}
+
+
+breakers = CircuitBreakers()
+
+
+def breaker(operation: str) -> CircuitBreaker:
+    return breakers.get(operation)
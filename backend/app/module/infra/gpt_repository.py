@@ -52,6 +52,21 @@ class GptRepository:
         await self.db.refresh(message)
         return message
 
+    # write_batch (write-behind flush: bulk insert messages, then log-end updates, one commit)
+    async def write_batch(self, messages: List[dict], log_ends: List[dict]):
+        if messages:
+            await self.db.execute(insert(Messages), messages)
+        for end in log_ends:
+            await self.db.execute(
+                update(Logs)
+                .where(Logs.session_id == end["session_id"])
+                .values(
+                    ended_reason=end["ended_reason"],
+                    ended_at=end["ended_at"],
+                )
+            )
+        await self.db.commit()
+
     # ===================================
     # API (Admin)
     # ===================================
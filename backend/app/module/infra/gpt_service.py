@@ -1,42 +1,87 @@
 # app/module/infra/gpt_service.py
 
-from typing import Dict, Any, Optional
-from openai import AsyncOpenAI
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Any, Optional
 from app.core.config.settings import settings
-from app.module.ws.audio_utils import convert_pcm_to_wav
-import os
-import tempfile
+from app.core.config.session import (
+    HISTORY_SUMMARIZE_SHARE,
+    SUMMARY_BLOCK_MAX_CHARS,
+    SUMMARY_MAX_CHARS,
+    SUMMARY_MODEL,
+)
+from app.core.config.audio import REALTIME_SAMPLE_RATE, REALTIME_UPDATE_DEBOUNCE_MS, TTS_PRERENDER_FORMATS
+from app.core.config.openai import (
+    BREAKER_SLOW_RESPONSE_FULL_MS,
+    RESPONSE_DEADLINE_MS,
+    RESPONSE_FIRST_TOKEN_DEADLINE_MS,
+    STT_DEADLINE_MS,
+)
+from app.module.ws.audio_utils import build_wav
+import time
 import websockets
 import json
 import base64
+from app.core.database.base import now_kst
+from app.module.infra.admission import REALTIME, AdmissionRejected, admission
+from app.module.infra.chatbot_cache import DEFAULT_MODELS, ChatbotConfig, chatbot_cache
+from app.module.infra.circuit_breaker import CircuitOpen, breaker
 from app.module.infra.gpt_repository import GptRepository
+from app.module.infra.openai_clients import RESPONSE, STT, SUMMARY, TTS, openai_client
+from app.module.infra.response_cache import CacheKey, response_cache
+from app.module.infra.request_policy import FIRST_TOKEN, DeadlineExceeded, request_policy
+from app.module.infra.prompt_builder import HISTORY_HEADER, PromptBuilder, history_line
+from app.module.infra.tts_cache import tts_cache
+from app.module.infra.token_budget import context_budget, estimate_tokens, record_estimate
+from app.module.infra.session_store import SessionStore, session_store
+from app.module.infra.write_behind import LOG_END, MESSAGE, write_behind
 from app.module.infra.gpt import EndedReasonType, RoleType, MessageType, LatencyType
 
-# OpenAI 비동기 클라이언트
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+# realtime instructions per socket: the conversation already holds every turn server-side,
+# so only base + summaries are resent (plus history that predates the socket, until summarized)
+@dataclass
+class RealtimeContext:
+    seed: str = ""                      # rendered history from before the socket was created
+    model: Optional[str] = None         # realtime model (context budget)
+    last_sent: Optional[str] = None
+    pending: Optional[asyncio.Task] = None
+    dirty: bool = False                 # changed while an update was being built / sent
+    updates_sent: int = 0
+    updates_skipped: int = 0
+    bytes_sent: int = 0
 
-# 세션별 instruction / history / summary 저장소 (in-memory)
-SESSION_STORAGE: Dict[str, Dict[str, Any]] = {}
+# session_id -> RealtimeContext (module level so /ws/stats can read every connection)
+REALTIME_CONTEXTS: Dict[str, RealtimeContext] = {}
+
+# session_id -> in-flight background summarization (single-flight per session)
+SUMMARY_TASKS: Dict[str, asyncio.Task] = {}
+
+# greeting / fallback audio being rendered after a chatbot save
+PRERENDER_TASKS: set[asyncio.Task] = set()
 
 class GPTService:
-    def __init__(self, gpt_repository: GptRepository):
+    def __init__(self, gpt_repository: GptRepository, store: SessionStore = session_store):
         self.gpt_repository = gpt_repository
+        # 세션별 instruction / history / summary 저장소 (memory / redis)
+        self.session_store = store
+        # session_id -> incrementally rendered instruction (this connection's sessions)
+        self._prompts: dict[str, PromptBuilder] = {}
         # session_id -> Realtime WebSocket
         self._rt_sockets: dict[str, Any] = {}
+        # session_id -> chatbot config the instruction was built from (response cache key)
+        self._chatbots: dict[str, ChatbotConfig] = {}
+        # sessions that already have history / summary (never cacheable again)
+        self._stateful: set[str] = set()
+        # per-user admission key (ws sets it per connection; None = global limits only)
+        self.admission_key: Optional[Any] = None
 
     # ===================================
     # internal helpers (same behavior, only整理 duplicates)
     # ===================================
     @staticmethod
     def _history_to_lines(history: list[dict[str, Any]]) -> list[str]:
-        lines: list[str] = []
-        for msg in history:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if not content:
-                continue
-            lines.append(f"{role}: {content}")
-        return lines
+        return [line for line in map(history_line, history) if line]
 
     @staticmethod
     def _get_total_tokens(usage: Any, type: str) -> int:
@@ -44,16 +89,14 @@ class GPTService:
             return 0
         return getattr(usage, f"{type}_tokens", 0) or 0
 
-    @staticmethod
-    def _safe_remove_file(path: Optional[str], label: str) -> None:
-        if not path:
-            return
-        if not os.path.exists(path):
-            return
-        try:
-            os.remove(path)
-        except Exception as e:
-            print(f"{label} 파일 삭제 중 오류: {e}")
+    # upstream call: circuit check, admission slot, then the breaker measures the call itself
+    @asynccontextmanager
+    async def _upstream(self, operation: str, circuit: Optional[str] = None, slow_ms: Optional[int] = None):
+        circuit_breaker = breaker(circuit or operation)
+        circuit_breaker.check()
+        async with admission.slot(operation, self.admission_key):
+            async with circuit_breaker.guard(slow_ms) as call:
+                yield call
 
     # ===================================
     # session management related
@@ -62,78 +105,69 @@ class GPTService:
         if not session_id:
             return
 
-        if session_id not in SESSION_STORAGE:
-            SESSION_STORAGE[session_id] = {
-                "instruction": "",
-                "history": [],
-                "summary": [],
-                "vector_store_id": None,
-            }
+        await self.session_store.ensure(session_id)
+        # live connection: kept until clear_session, whatever the store's budget
+        self.session_store.pin(session_id)
 
     # clear session storage
     async def clear_session(self, session_id: str) -> None:
         if not session_id:
             return
-        SESSION_STORAGE.pop(session_id, None)
+        task = SUMMARY_TASKS.pop(session_id, None)
+        if task:
+            task.cancel()
+        self._prompts.pop(session_id, None)
+        self._chatbots.pop(session_id, None)
+        self._stateful.discard(session_id)
+        await self.session_store.clear(session_id)
 
     # set base instruction (persona, etc.)
     async def build_instruction(self, session_id: str, chatbot_id: int) -> None:
         if not session_id:
             return
 
-        chatbot = await self.gpt_repository.get_admin_chatbot_detail(chatbot_id)
-        if not chatbot:
+        # compiled once per chatbot version (process-level cache)
+        config = await chatbot_cache.get(chatbot_id)
+        if not config:
             return
 
-        description = chatbot.description
-        data_type = chatbot.data_type
-        text_data = chatbot.text_data
-        fall_back_type = chatbot.fallback_type
-        fall_back_text = chatbot.fallback_text
-
-        instruction = f"[지침]\n{description}"
-
-        if data_type == "text":
-            instruction += f"\n[학습 데이터]\n 해당 데이터를 활용하여 답해주세요.\n{text_data}"
-
-        if fall_back_type:
-            instruction += (
-                "[데이터 찾기 실패시 아래 텍스트로만 답해주세요.]"
-                f"{fall_back_text}"
-            )
-        else:
-            instruction += (
-                "[데이터 찾기 실패시 학습 데이터말고도 알고있는 지식을 활용하여 답해주세요.]"
-                f"{fall_back_text}"
-            )
-
-        await self.get_or_create_session_storage(session_id)
-        SESSION_STORAGE[session_id]["instruction"] = instruction
+        await self.session_store.set_instruction(session_id, config.instruction)
+        self._invalidate_prompt(session_id)
+        self._chatbots[session_id] = config
 
     # append message to history
     async def append_history(self, session_id: str, text: str, role: str) -> None:
         if not session_id:
             return
 
-        await self.get_or_create_session_storage(session_id)
-
-        SESSION_STORAGE[session_id]["history"].append(
+        await self.session_store.append_history(
+            session_id,
             {
                 "role": role,
                 "content": text or "",
-            }
+            },
         )
 
     # ===================================
     # summary related
     # ===================================
+    async def _summarize(self, instructions: str, text: str) -> str:
+        # background call over a long history: only failures count against the response circuit
+        async with self._upstream(SUMMARY, RESPONSE, slow_ms=0):
+            resp = await openai_client(SUMMARY).responses.create(
+                model=SUMMARY_MODEL,
+                instructions=instructions,
+                input=text,
+            )
+        # hard cap so the summary block stays bounded even if the model overshoots
+        return (resp.output_text or "").strip()[:SUMMARY_MAX_CHARS]
+
     async def summarize_text(self, session_id: str) -> str:
         if not session_id:
             return ""
 
-        await self.get_or_create_session_storage(session_id)
-
-        history = SESSION_STORAGE[session_id].get("history", [])
+        storage = await self.session_store.snapshot(session_id)
+        history = storage.get("history", [])
         if not history:
             return ""
 
@@ -143,96 +177,198 @@ class GPTService:
 
         history_text = "\n".join(history_lines)
 
-        resp = await client.responses.create(
-            model="gpt-4o-mini",
-            instructions=(
-                "You are a summarization assistant.\n"
-                "Summarize the following chat history between a user and an assistant.\n"
-                "Return only the summary in Korean if the conversation is in Korean.\n"
-                "Make it about 30 sentences, capturing important facts, requests, and decisions."
-            ),
-            input=history_text,
+        summary_text = await self._summarize(
+            "You are a summarization assistant.\n"
+            "Summarize the following chat history between a user and an assistant.\n"
+            "Return only the summary in Korean if the conversation is in Korean.\n"
+            "Capture important facts, requests, and decisions "
+            f"in at most {SUMMARY_MAX_CHARS} characters.",
+            history_text,
         )
+        if not summary_text:
+            return ""
 
-        summary_text = resp.output_text
+        # only the summarized messages are dropped (turns appended meanwhile are kept)
+        await self.session_store.commit_summary(session_id, summary_text, len(history))
+        self._invalidate_prompt(session_id)
 
-        SESSION_STORAGE[session_id]["summary"].append(summary_text)
-        SESSION_STORAGE[session_id]["history"] = []
+        # pre-socket history is covered by the summary now
+        ctx = REALTIME_CONTEXTS.get(session_id)
+        if ctx:
+            ctx.seed = ""
 
         return summary_text
 
+    # hierarchical compaction: once the block is too long, all but the newest summary are
+    # merged into one summary-of-summaries (so the block stays under ~2 x SUMMARY_MAX_CHARS)
+    async def compact_summaries(self, session_id: str) -> None:
+        storage = await self.session_store.snapshot(session_id)
+        summaries = storage.get("summary", [])
+        if len(summaries) < 3 or sum(len(s) for s in summaries) <= SUMMARY_BLOCK_MAX_CHARS:
+            return
+
+        older = summaries[:-1]
+        merged = await self._summarize(
+            "You are a summarization assistant.\n"
+            "Merge the following summaries of earlier parts of one conversation, oldest first, "
+            "into a single summary.\n"
+            "Return only the summary in Korean if the summaries are in Korean.\n"
+            "Keep important facts, requests, and decisions; drop details that were superseded. "
+            f"Use at most {SUMMARY_MAX_CHARS} characters.",
+            "\n\n".join(f"- {s}" for s in older),
+        )
+        if not merged:
+            return
+
+        await self.session_store.compact_summaries(session_id, merged, len(older))
+        self._invalidate_prompt(session_id)
+
+    # background summarization: the live turn keeps the current history until the summary lands
+    def schedule_summary(self, session_id: str) -> None:
+        task = SUMMARY_TASKS.get(session_id)
+        if task and not task.done():
+            return
+        SUMMARY_TASKS[session_id] = asyncio.create_task(self._summarize_in_background(session_id))
+
+    async def _summarize_in_background(self, session_id: str) -> None:
+        try:
+            if await self.summarize_text(session_id):
+                await self.compact_summaries(session_id)
+                self.schedule_realtime_update(session_id)
+        except Exception as e:
+            print(f"Error in summarize_text: {e}")
+        finally:
+            if SUMMARY_TASKS.get(session_id) is asyncio.current_task():
+                SUMMARY_TASKS.pop(session_id, None)
+
     # ===================================
     # common instruction builder (legacy + realtime common use)
     # ===================================
-    async def build_full_instruction(self, session_id: str) -> str:
+    def _invalidate_prompt(self, session_id: str) -> None:
+        builder = self._prompts.get(session_id)
+        if builder:
+            builder.reset()
+
+    async def build_full_instruction(self, session_id: str, model: str | None = None) -> str:
         if not session_id:
             return ""
 
-        await self.get_or_create_session_storage(session_id)
-        storage = SESSION_STORAGE[session_id]
+        builder = self._prompts.get(session_id)
+        if builder is None:
+            builder = self._prompts[session_id] = PromptBuilder()
 
-        base_instruction = storage.get("instruction", "")
-        history = storage.get("history", [])
-        summaries = storage.get("summary", [])
+        # only history not rendered yet is read
+        storage = await self.session_store.snapshot(session_id, history_from=builder.history_count)
 
-        # if history is too long, summarize and put into summary, then clear history
-        if len(history) > 30:
-            await self.summarize_text(session_id)
-            storage = SESSION_STORAGE[session_id]
-            history = storage.get("history", [])
-            summaries = storage.get("summary", [])
-
-        # summary block
-        summary_block = ""
-        if summaries:
-            summary_block = "\n\n[Previous summaries]\n" + "\n".join(
-                f"- {s}" for s in summaries
+        # base + summaries unchanged: append new history lines to the cached text
+        if builder.is_current(storage):
+            builder.extend(storage.get("history", []))
+        else:
+            if builder.history_count and storage.get("history_len", 0):
+                storage = await self.session_store.snapshot(session_id)
+            builder.rebuild(storage)
+
+        budget = context_budget(model)
+
+        # history over its share of the budget: summarize oldest turns in the background
+        if builder.history_tokens > HISTORY_SUMMARIZE_SHARE * max(0, budget - builder.prefix_tokens):
+            self.schedule_summary(session_id)
+
+        # over budget right now: leave the oldest turns out of this prompt until the summary lands
+        text = builder.fit(budget)
+        if builder.trimmed:
+            print(
+                f"[{session_id}] context over budget ({budget}): left out {builder.trimmed} oldest lines, "
+                f"est {builder.prompt_tokens} tokens"
             )
+        if builder.prefix_tokens > budget:
+            print(f"[{session_id}] base instruction + summaries alone exceed budget ({builder.prefix_tokens} > {budget})")
+        return text
+
+    async def _realtime_instruction(self, session_id: str) -> str:
+        ctx = REALTIME_CONTEXTS.get(session_id)
+        # keeps the prompt builder current (and summarizes when history is too long)
+        await self.build_full_instruction(session_id, model=ctx.model if ctx else None)
+        prefix = self._prompts[session_id].prefix
+        if ctx and ctx.seed:
+            return prefix + HISTORY_HEADER + ctx.seed
+        return prefix
+
+    # send session.update only when the instructions differ from what the session has
+    async def update_realtime_instruction(self, session_id: str) -> int:
+        if not session_id:
+            return 0
 
-        # recent history block
-        history_block = ""
-        if history:
-            history_lines = self._history_to_lines(history)
-            if history_lines:
-                history_block = "\n\n[Recent history]\n" + "\n".join(history_lines)
+        ws = self._rt_sockets.get(session_id)
+        ctx = REALTIME_CONTEXTS.get(session_id)
+        if not ws or not ctx:
+            return 0
 
-        full_instruction = base_instruction + summary_block + history_block
-        return full_instruction
+        instruction = await self._realtime_instruction(session_id)
+        if instruction == ctx.last_sent:
+            ctx.updates_skipped += 1
+            return 0
 
-    async def update_realtime_instruction(self, session_id: str) -> None:
-        if not session_id:
+        message = json.dumps(
+            {
+                "type": "session.update",
+                "session": {
+                    "type": "realtime",
+                    "instructions": instruction,
+                },
+            },
+            ensure_ascii=False,
+        )
+        await ws.send(message)
+        ctx.last_sent = instruction
+        ctx.updates_sent += 1
+        size = len(message.encode("utf-8"))
+        ctx.bytes_sent += size
+        return size
+
+    # debounce: changes within REALTIME_UPDATE_DEBOUNCE_MS are coalesced into one check/update
+    def schedule_realtime_update(self, session_id: str) -> None:
+        ctx = REALTIME_CONTEXTS.get(session_id)
+        if not ctx:
             return
-
-        ws = self._rt_sockets.get(session_id)
-        if not ws:
+        if ctx.pending and not ctx.pending.done():
+            ctx.dirty = True  # picked up by the pending task once its update is sent
             return
+        ctx.pending = asyncio.create_task(self._debounced_realtime_update(session_id, ctx))
 
-        full_instruction = await self.build_full_instruction(session_id)
+    async def _debounced_realtime_update(self, session_id: str, ctx: RealtimeContext) -> None:
+        await asyncio.sleep(REALTIME_UPDATE_DEBOUNCE_MS / 1000)
+        while True:
+            ctx.dirty = False
+            try:
+                await self.update_realtime_instruction(session_id)
+            except Exception as e:
+                print(f"Error in update_realtime_instruction: {e}")
+            # e.g. a summary committed while the previous update was building / sending
+            if not ctx.dirty:
+                return
 
-        await ws.send(
-            json.dumps(
-                {
-                    "type": "session.update",
-                    "session": {
-                        "instructions": full_instruction,
-                    },
-                }
-            )
-        )
+    @staticmethod
+    def realtime_context_stats(session_id: str) -> Dict[str, Any]:
+        ctx = REALTIME_CONTEXTS.get(session_id)
+        if not ctx:
+            return {}
+        return {
+            "updates_sent": ctx.updates_sent,
+            "updates_skipped": ctx.updates_skipped,
+            "bytes_sent": ctx.bytes_sent,
+        }
 
     # ===================================
     # legacy text GPT call
     # ===================================
-    async def openai_response(
+    async def _response_params(
         self,
         session_id: str,
         text: str,
         gpt_model: str | None = None,
-    ) -> tuple[str, int, int]:
-        if not session_id:
-            return "", 0, 0
-
-        storage = SESSION_STORAGE[session_id]
+    ) -> tuple[dict, int]:
+        storage = await self.session_store.snapshot(session_id)
         vector_store_id = storage.get("vector_store_id", None)
         if vector_store_id:
             tools = [{
@@ -243,47 +379,188 @@ class GPTService:
         else:
             tools = []
 
+        model = gpt_model or "gpt-4o-mini"
+
         # use common helper to include instruction + summary + history
-        full_instruction = await self.build_full_instruction(session_id)
+        full_instruction = await self.build_full_instruction(session_id, model=model)
+        estimated_tokens = self._prompts[session_id].prompt_tokens + estimate_tokens(text)
 
-        resp = await client.responses.create(
-            model=gpt_model or "gpt-4o-mini",
-            instructions=full_instruction,
-            tools=tools,
-            input=text,
-        )
+        return {
+            "model": model,
+            "instructions": full_instruction,
+            "tools": tools,
+            "input": text,
+        }, estimated_tokens
+
+    # estimated vs actual input tokens (file_search results add to actual when a vector store is used)
+    @staticmethod
+    def _log_token_estimate(session_id: str, params: dict, estimated: int, actual: int) -> None:
+        record_estimate(params["model"], estimated, actual)
+        tools = " +file_search" if params.get("tools") else ""
+        print(f"[{session_id}] input tokens est {estimated} actual {actual}{tools}")
+
+    async def openai_response(
+        self,
+        session_id: str,
+        text: str,
+        gpt_model: str | None = None,
+    ) -> tuple[str, int, int]:
+        if not session_id:
+            return "", 0, 0
+
+        params, estimated_tokens = await self._response_params(session_id, text, gpt_model)
+
+        async def call():
+            # whole answer, not the first token
+            async with self._upstream(RESPONSE, slow_ms=BREAKER_SLOW_RESPONSE_FULL_MS):
+                return await openai_client(RESPONSE).responses.create(**params)
+
+        resp = await request_policy.execute(RESPONSE, params["model"], call, RESPONSE_DEADLINE_MS)
         response_text = resp.output_text
         usage = getattr(resp, "usage", None)
         input_tokens = self._get_total_tokens(usage, "input")
         output_tokens = self._get_total_tokens(usage, "output")
+        self._log_token_estimate(session_id, params, estimated_tokens, input_tokens)
 
         return response_text, input_tokens, output_tokens
 
     # ===================================
-    # STT (convert PCM to WAV and then call Whisper)
+    # exact-match response cache (first question of a session)
+    # ===================================
+    # cache key for this question, or None when the answer may depend on more than the
+    # chatbot config (history / summary, file_search over a vector store) or caching is off
+    async def response_cache_key(
+        self,
+        session_id: str,
+        text: str,
+        gpt_model: str | None = None,
+    ) -> Optional[CacheKey]:
+        if not response_cache.enabled or not session_id or session_id in self._stateful:
+            return None
+        config = self._chatbots.get(session_id)
+        if config is None or config.data_type != "text" or config.vector_store_id:
+            return None
+
+        storage = await self.session_store.snapshot(session_id)
+        if storage["history_len"] or storage["summary"] or storage.get("vector_store_id"):
+            self._stateful.add(session_id)
+            return None
+        return response_cache.key(config.id, config.version, gpt_model or "gpt-4o-mini", text)
+
+    # (key, cached answer); a miss with a key should be stored once the answer is known
+    async def cached_response(
+        self,
+        session_id: str,
+        text: str,
+        gpt_model: str | None = None,
+    ) -> tuple[Optional[CacheKey], Optional[str]]:
+        key = await self.response_cache_key(session_id, text, gpt_model)
+        return key, response_cache.get(key) if key else None
+
+    @staticmethod
+    def store_response(key: Optional[CacheKey], text: str) -> None:
+        if key and text:
+            response_cache.put(key, text)
+
+    # ===================================
+    # streaming text GPT call (yield text deltas)
+    # ===================================
+    async def openai_response_stream(
+        self,
+        session_id: str,
+        text: str,
+        gpt_model: str | None = None,
+        meta: Optional[dict] = None,
+    ) -> AsyncIterator[str]:
+        if not session_id:
+            return
+
+        # meta: text / input_tokens / output_tokens / first_token_ms / total_ms filled in for the caller
+        meta = meta if meta is not None else {}
+        start = time.monotonic()
+
+        params, estimated_tokens = await self._response_params(session_id, text, gpt_model)
+        model = params["model"]
+        # deadline to the first token only; a long answer that is already streaming is not cut
+        deadline = time.monotonic() + RESPONSE_FIRST_TOKEN_DEADLINE_MS / 1000
+
+        def before_first_token(aw):
+            if "first_token_ms" in meta:
+                return aw
+            return asyncio.wait_for(aw, max(0.0, deadline - time.monotonic()))
+
+        parts: list[str] = []
+        try:
+            async with self._upstream(RESPONSE) as call:
+                stream = await before_first_token(
+                    openai_client(RESPONSE).responses.create(**params, stream=True)
+                )
+                try:
+                    events = stream.__aiter__()
+                    while True:
+                        try:
+                            event = await before_first_token(events.__anext__())
+                        except StopAsyncIteration:
+                            break
+                        event_type = getattr(event, "type", "")
+
+                        if event_type == "response.output_text.delta":
+                            delta = event.delta or ""
+                            if not delta:
+                                continue
+                            if "first_token_ms" not in meta:
+                                meta["first_token_ms"] = int((time.monotonic() - start) * 1000)
+                                call.mark()
+                                request_policy.observe(FIRST_TOKEN, model, meta["first_token_ms"])
+                            parts.append(delta)
+                            yield delta
+
+                        elif event_type == "response.completed":
+                            resp = event.response
+                            usage = getattr(resp, "usage", None)
+                            meta["input_tokens"] = self._get_total_tokens(usage, "input")
+                            meta["output_tokens"] = self._get_total_tokens(usage, "output")
+                            meta["text"] = resp.output_text or "".join(parts)
+                            self._log_token_estimate(session_id, params, estimated_tokens, meta["input_tokens"])
+
+                        elif event_type in ("response.failed", "error"):
+                            raise RuntimeError(f"response stream {event_type}: {event}")
+                finally:
+                    await stream.close()
+        except asyncio.TimeoutError:
+            if "first_token_ms" in meta:
+                raise
+            request_policy.deadline_exceeded(FIRST_TOKEN, model)
+            raise DeadlineExceeded(FIRST_TOKEN, RESPONSE_FIRST_TOKEN_DEADLINE_MS) from None
+
+        meta.setdefault("text", "".join(parts))
+        meta["total_ms"] = int((time.monotonic() - start) * 1000)
+
+    # ===================================
+    # STT (wrap PCM as in-memory WAV and then call Whisper)
     # ===================================
     async def openai_stt(
         self,
-        pcm_bytes: bytes,
+        pcm_bytes: bytes | memoryview,
         sample_rate: int = 16000,
         stt_model: str | None = None,
     ) -> tuple[str, int]:
         if not pcm_bytes:
             return "", 0
 
-        tmp_path: Optional[str] = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
+            # convert PCM to WAV (in memory); bytes so a hedged duplicate can upload it too
+            wav = build_wav(pcm_bytes, sample_rate).getvalue()
+            model = stt_model or "gpt-4o-mini-transcribe"
 
-            # convert PCM to WAV
-            await convert_pcm_to_wav(tmp_path, pcm_bytes, sample_rate)
+            async def call():
+                async with self._upstream(STT):
+                    return await openai_client(STT).audio.transcriptions.create(
+                        model=model,
+                        file=("audio.wav", wav, "audio/wav"),
+                    )
 
-            with open(tmp_path, "rb") as f:
-                resp = await client.audio.transcriptions.create(
-                    model=stt_model or "gpt-4o-mini-transcribe",
-                    file=f,
-                )
+            resp = await request_policy.execute(STT, model, call, STT_DEADLINE_MS)
 
             text = (getattr(resp, "text", "") or "").strip()
 
@@ -293,12 +570,86 @@ class GPTService:
 
             return text, tokens
 
+        except (AdmissionRejected, CircuitOpen):
+            raise
         except Exception as e:
             print(f"Error in openai_stt: {e}")
             return "", 0
 
-        finally:
-            self._safe_remove_file(tmp_path, "WAV")
+    # ===================================
+    # TTS streaming (yield audio chunks as they arrive)
+    # ===================================
+    async def _tts_upstream_stream(
+        self,
+        text: str,
+        voice_id: str,
+        tts_model: str,
+        response_format: str,
+        chunk_size: int | None,
+        meta: dict,
+    ) -> AsyncIterator[bytes]:
+        start = time.monotonic()
+
+        async with self._upstream(TTS) as call:
+            async with openai_client(TTS).audio.speech.with_streaming_response.create(
+                model=tts_model,
+                voice=voice_id,
+                input=text,
+                response_format=response_format,
+            ) as response:
+                async for chunk in response.iter_bytes(chunk_size):
+                    if not chunk:
+                        continue
+                    if "ttfb_ms" not in meta:
+                        meta["ttfb_ms"] = int((time.monotonic() - start) * 1000)
+                        call.mark()
+                    yield chunk
+
+                usage = getattr(response, "usage", None)
+                meta["tokens"] = self._get_total_tokens(usage, "total")
+
+        meta["total_ms"] = int((time.monotonic() - start) * 1000)
+
+    async def openai_tts_stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        tts_model: str | None = None,
+        response_format: str = "mp3",
+        chunk_size: int | None = None,
+        meta: Optional[dict] = None,
+    ) -> AsyncIterator[bytes]:
+        text = (text or "").strip()
+        if not text:
+            return
+
+        # meta: tokens / ttfb_ms / total_ms (+ cached) filled in for the caller
+        meta = meta if meta is not None else {}
+        voice_id = voice_id or "coral"
+        tts_model = tts_model or "gpt-4o-mini-tts"
+
+        # same text, voice and model: replay the stored audio in chunk_size pieces
+        key = tts_cache.key(tts_model, voice_id, response_format, text)
+        if key:
+            audio = await tts_cache.get(key)
+            if audio is not None:
+                meta.update(tokens=0, ttfb_ms=0, total_ms=0, cached=True)
+                step = chunk_size or len(audio)
+                for offset in range(0, len(audio), step):
+                    yield audio[offset:offset + step]
+                return
+
+        chunks: list[bytes] = []
+        async for chunk in self._tts_upstream_stream(
+            text, voice_id, tts_model, response_format, chunk_size, meta
+        ):
+            if key:
+                chunks.append(chunk)
+            yield chunk
+
+        # only complete renders are stored (an abandoned stream never gets here)
+        if key:
+            tts_cache.put(key, b"".join(chunks))
 
     # ===================================
     # TTS (text to audio MP3)
@@ -308,40 +659,55 @@ class GPTService:
         text: str,
         voice_id: str | None = None,
         tts_model: str | None = None,
+        response_format: str = "mp3",
     ) -> tuple[bytes, int]:
         text = (text or "").strip()
         if not text:
             return b"", 0
 
-        tmp_path: Optional[str] = None
-        tts_tokens = 0
-
+        meta: dict = {}
         try:
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-                tmp_path = tmp.name
-
-            async with client.audio.speech.with_streaming_response.create(
-                model=tts_model or "gpt-4o-mini-tts",
-                voice=voice_id or "coral",
-                input=text,
-            ) as response:
-                # stream audio file to file
-                await response.stream_to_file(tmp_path)
-
-                usage = getattr(response, "usage", None)
-                tts_tokens = self._get_total_tokens(usage, "total")
-
-            with open(tmp_path, "rb") as f:
-                audio_bytes = f.read()
-
-            return audio_bytes, tts_tokens
+            chunks = [
+                chunk
+                async for chunk in self.openai_tts_stream(
+                    text,
+                    voice_id=voice_id,
+                    tts_model=tts_model,
+                    response_format=response_format,
+                    meta=meta,
+                )
+            ]
+            return chunks[0] if len(chunks) == 1 else b"".join(chunks), meta.get("tokens", 0)
 
+        except (AdmissionRejected, CircuitOpen):
+            raise
         except Exception as e:
             print(f"Error in openai_tts: {e}")
             return b"", 0
 
-        finally:
-            self._safe_remove_file(tmp_path, "TTS mp3")
+    # render fixed texts (greeting / fallback) into the TTS cache ahead of the first session
+    async def prerender_tts(self, texts: list[str], tts_model: str | None = None) -> int:
+        rendered = 0
+        tts_model = tts_model or "gpt-4o-mini-tts"
+        for text in {(text or "").strip() for text in texts} - {""}:
+            for response_format in TTS_PRERENDER_FORMATS:
+                key = tts_cache.key(tts_model, "coral", response_format, text)
+                if not key or await tts_cache.contains(key):
+                    continue
+                try:
+                    audio, _ = await self.openai_tts(
+                        text, tts_model=tts_model, response_format=response_format
+                    )
+                except (AdmissionRejected, CircuitOpen) as e:
+                    print(f"[tts_cache] prerender skipped: {e}")
+                    return rendered
+                rendered += bool(audio)
+        return rendered
+
+    def schedule_prerender(self, texts: list[str], tts_model: str | None = None) -> None:
+        task = asyncio.create_task(self.prerender_tts(texts, tts_model))
+        PRERENDER_TASKS.add(task)
+        task.add_done_callback(PRERENDER_TASKS.discard)
 
     # ===================================
     # Realtime API related
@@ -355,25 +721,42 @@ class GPTService:
             return self._rt_sockets[session_id]
 
         # GA Realtime endpoint
-        url = f"wss://api.openai.com/v1/realtime?model={realtime_model or 'gpt-4o-mini-realtime-preview'}"
-
-        ws = await websockets.connect(
-            url,
-            additional_headers=[
-                ("Authorization", f"Bearer {settings.openai_api_key}"),
-            ],
-            subprotocols=["realtime"],
-        )
+        realtime_model = realtime_model or "gpt-4o-mini-realtime-preview"
+        url = f"wss://api.openai.com/v1/realtime?model={realtime_model}"
+
+        # one realtime slot per open socket, released in close_realtime_socket
+        circuit_breaker = breaker(REALTIME)
+        circuit_breaker.check()
+        await admission.acquire(REALTIME, self.admission_key)
+        try:
+            async with circuit_breaker.guard():
+                ws = await websockets.connect(
+                    url,
+                    additional_headers=[
+                        ("Authorization", f"Bearer {settings.openai_api_key}"),
+                    ],
+                    subprotocols=["realtime"],
+                )
+        except BaseException:
+            admission.release(REALTIME, self.admission_key)
+            raise
+        self._rt_sockets[session_id] = ws
 
         # ensure session storage
         await self.get_or_create_session_storage(session_id)
 
         # if base instruction is not set, set it
-        if not SESSION_STORAGE[session_id].get("instruction"):
+        storage = await self.session_store.snapshot(session_id)
+        if not storage.get("instruction"):
             await self.build_instruction(session_id)
 
-        # include summary + history full instruction
-        full_instruction = await self.build_full_instruction(session_id)
+        # include summary + history full instruction (history so far is not in the new conversation)
+        full_instruction = await self.build_full_instruction(session_id, model=realtime_model)
+        builder = self._prompts[session_id]
+        seed = full_instruction[len(builder.prefix) + len(HISTORY_HEADER):] if builder.history_count else ""
+        REALTIME_CONTEXTS[session_id] = RealtimeContext(
+            seed=seed, model=realtime_model, last_sent=full_instruction
+        )
 
         # GA style session.update
         await ws.send(
@@ -382,14 +765,14 @@ class GPTService:
                     "type": "session.update",
                     "session": {
                         "type": "realtime",
-                        "model": realtime_model or "gpt-4o-mini-realtime-preview",
+                        "model": realtime_model,
                         "instructions": full_instruction,
                         # audio settings
                         "audio": {
                             "input": {
                                 "format": {
                                     "type": "audio/pcm",
-                                    "rate": 24000,
+                                    "rate": REALTIME_SAMPLE_RATE,
                                 },
                                 "transcription": {
                                     "model": stt_model or "gpt-4o-mini-transcribe",
@@ -404,7 +787,7 @@ class GPTService:
                             "output": {
                                 "format": {
                                     "type": "audio/pcm",
-                                    "rate": 24000,
+                                    "rate": REALTIME_SAMPLE_RATE,
                                 },
                                 "voice": "alloy",
                             },
@@ -414,7 +797,6 @@ class GPTService:
             )
         )
 
-        self._rt_sockets[session_id] = ws
         return ws
 
     async def realtime_send_pcm(
@@ -443,8 +825,12 @@ class GPTService:
         # server_vad mode, commit event is handled by server
 
     async def close_realtime_socket(self, session_id: str) -> None:
+        ctx = REALTIME_CONTEXTS.pop(session_id, None)
+        if ctx and ctx.pending:
+            ctx.pending.cancel()
         ws = self._rt_sockets.pop(session_id, None)
         if ws:
+            admission.release(REALTIME, self.admission_key)
             try:
                 await ws.close()
             except Exception:
@@ -453,20 +839,16 @@ class GPTService:
     # ==================================
     # REPO logic
     # ==================================
-    async def get_current_models(self) -> dict:
-        # TODO: 추후 DB에서 조회
-        return {
-            "stt_model": "gpt-4o-mini-transcribe",
-            "tts_model": "gpt-4o-mini-tts",
-            "response_model": "gpt-4o-mini",
-            "realtime_model": "gpt-4o-mini-realtime-preview",
-        }
+    # models configured for the chatbot (empty columns fall back to the defaults)
+    async def get_current_models(self, chatbot_id: Optional[int] = None) -> dict:
+        config = await chatbot_cache.get(chatbot_id) if chatbot_id else None
+        return dict(config.models if config else DEFAULT_MODELS)
 
     async def get_chatbot_setting(self, chatbot_id: int) -> dict:
-        chatbot = await self.gpt_repository.get_admin_chatbot_detail(chatbot_id)
+        config = await chatbot_cache.get(chatbot_id)
 
         return {
-            "vector_store_id": chatbot.vector_store_id,
+            "vector_store_id": config.vector_store_id if config else None,
         }
 
     async def create_or_get_log(
@@ -487,7 +869,11 @@ class GPTService:
             realtime_model,
         )
 
+    # log end / messages go through the write-behind queue (inline only when it is full or closed)
     async def update_log(self, session_id: str, ended_reason: EndedReasonType):
+        record = dict(session_id=session_id, ended_reason=ended_reason, ended_at=now_kst())
+        if write_behind.put(LOG_END, record):
+            return
         await self.gpt_repository.update_log(session_id, ended_reason)
 
     async def create_message(
@@ -500,6 +886,18 @@ class GPTService:
         latency_type: LatencyType | None = None,
         tokens: int | None = None,
     ):
+        record = dict(
+            log_id=log_id,
+            role=role,
+            message=message,
+            message_type=message_type,
+            latency_ms=latency_ms,
+            latency_type=latency_type,
+            tokens=tokens,
+            created_at=now_kst(),
+        )
+        if write_behind.put(MESSAGE, record):
+            return None
         return await self.gpt_repository.create_message(
             log_id,
             role,
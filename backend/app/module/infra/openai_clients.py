@@ -0,0 +1,158 @@
+# app/module/infra/openai_clients.py
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.core.config.openai import (
+    OPENAI_BULK_MAX_CONNECTIONS,
+    OPENAI_BULK_MAX_KEEPALIVE,
+    OPENAI_CONNECT_TIMEOUT_SEC,
+    OPENAI_HTTP2,
+    OPENAI_KEEPALIVE_EXPIRY_SEC,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE,
+    OPENAI_MAX_RETRIES,
+    OPENAI_POOL_TIMEOUT_SEC,
+    OPENAI_TIMEOUTS,
+)
+from app.core.config.settings import settings
+
+# operations
+STT = "stt"
+RESPONSE = "response"
+TTS = "tts"
+SUMMARY = "summary"
+VECTOR_STORE = "vector_store"
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# operation -> pool
+OPERATION_POOLS = {
+    STT: INTERACTIVE,
+    RESPONSE: INTERACTIVE,
+    TTS: INTERACTIVE,
+    SUMMARY: INTERACTIVE,
+    VECTOR_STORE: BULK,
+}
+
+POOL_LIMITS = {
+    INTERACTIVE: (OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE),
+    BULK: (OPENAI_BULK_MAX_CONNECTIONS, OPENAI_BULK_MAX_KEEPALIVE),
+}
+
+
+# one httpx pool + counters, kept from the httpcore trace extension (public API) only:
+# new connections on connect_tcp, requests in flight from request headers sent to response closed
+class _Pool:
+    def __init__(self, name: str, max_connections: int, max_keepalive: int):
+        self.name = name
+        self.max_connections = max_connections
+        self.requests = 0
+        self.new_connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.http2_requests = 0
+        self.http = DefaultAsyncHttpxClient(
+            http2=OPENAI_HTTP2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SEC,
+            ),
+            event_hooks={"request": [self._on_request]},
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self.http,
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._tracer()
+
+    # per request, so a request is counted in flight at most once
+    def _tracer(self):
+        sent = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal sent
+            if event == "connection.connect_tcp.complete":
+                self.new_connections += 1
+            elif event.endswith(".send_request_headers.started") and not sent:
+                sent = True
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                if event.startswith("http2."):
+                    self.http2_requests += 1
+            elif event.endswith((".response_closed.complete", ".response_closed.failed")) and sent:
+                sent = False
+                self.in_flight -= 1
+
+        return trace
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            # one request per connection on HTTP/1.1 (HTTP/2 streams share a connection)
+            "utilization": round(self.in_flight / self.max_connections, 3),
+            "requests": self.requests,
+            "http2_requests": self.http2_requests,
+            "new_connections": self.new_connections,
+            # share of requests sent on an already open connection
+            "reuse_rate": (
+                round(1 - min(self.new_connections, self.requests) / self.requests, 3)
+                if self.requests else 0.0
+            ),
+        }
+
+
+# process-wide OpenAI clients: every caller asks for its operation and gets a client that
+# shares the pool of its traffic class, with that operation's timeout
+class OpenAIClients:
+    def __init__(self):
+        self._pools: Dict[str, _Pool] = {}
+        self._clients: Dict[str, AsyncOpenAI] = {}
+
+    def _pool(self, name: str) -> _Pool:
+        pool = self._pools.get(name)
+        if pool is None:
+            pool = self._pools[name] = _Pool(name, *POOL_LIMITS[name])
+        return pool
+
+    def get(self, operation: str) -> AsyncOpenAI:
+        client = self._clients.get(operation)
+        if client is None:
+            pool = self._pool(OPERATION_POOLS[operation])
+            # with_options keeps the pool's http client; only the timeout differs
+            client = pool.client.with_options(
+                timeout=httpx.Timeout(
+                    OPENAI_TIMEOUTS[operation],
+                    connect=OPENAI_CONNECT_TIMEOUT_SEC,
+                    pool=OPENAI_POOL_TIMEOUT_SEC,
+                )
+            )
+            self._clients[operation] = client
+        return client
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            await pool.http.aclose()
+        self._pools.clear()
+        self._clients.clear()
+
+
+openai_clients = OpenAIClients()
+
+
+def openai_client(operation: str) -> AsyncOpenAI:
+    return openai_clients.get(operation)
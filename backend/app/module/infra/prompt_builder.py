@@ -0,0 +1,119 @@
+# app/module/infra/prompt_builder.py
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.config.session import TOKEN_EST_MESSAGE_OVERHEAD
+from app.module.infra.token_budget import estimate_tokens
+
+SUMMARY_HEADER = "\n\n[Previous summaries]\n"
+HISTORY_HEADER = "\n\n[Recent history]\n"
+
+
+def history_line(msg: Dict[str, Any]) -> Optional[str]:
+    content = msg.get("content", "")
+    if not content:
+        return None
+    return f"{msg.get('role', 'user')}: {content}"
+
+
+# per-session rendered instruction: base + summary prefix is cached, history lines are appended
+# as they arrive; rebuilt only when the instruction, the summaries or the history base changes
+# estimated tokens are tracked per part so the prompt can be fitted to a budget (oldest lines first)
+class PromptBuilder:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.instruction: Optional[str] = None
+        self.summary_count = -1
+        self.history_count = 0  # history messages already rendered
+        self._prefix = ""
+        self._text = ""
+        self._lines: deque[tuple[str, int]] = deque()  # rendered history lines + estimated tokens
+        self.prefix_tokens = 0
+        self.history_tokens = 0
+        self.prompt_tokens = 0  # estimate of the last fitted prompt
+        self.trimmed = 0  # history lines left out of the last fitted prompt (still cached here)
+
+    # snapshot from SessionStore.snapshot(history_from=self.history_count)
+    def is_current(self, storage: Dict[str, Any]) -> bool:
+        return (
+            self.instruction is not None
+            and storage.get("instruction", "") == self.instruction
+            and len(storage.get("summary", [])) == self.summary_count
+            and storage.get("history_len", 0) >= self.history_count
+        )
+
+    def rebuild(self, storage: Dict[str, Any]) -> str:
+        self.instruction = storage.get("instruction", "")
+        summaries = storage.get("summary", [])
+        self.summary_count = len(summaries)
+
+        prefix = self.instruction
+        if summaries:
+            prefix += SUMMARY_HEADER + "\n".join(f"- {s}" for s in summaries)
+        self._prefix = prefix
+        self._text = prefix
+        self._lines.clear()
+        self.prefix_tokens = estimate_tokens(prefix)
+        self.history_tokens = 0
+        self.prompt_tokens = 0
+        self.trimmed = 0
+        self.history_count = 0
+        return self.extend(storage.get("history", []))
+
+    def extend(self, new_history: Iterable[Dict[str, Any]]) -> str:
+        lines = []
+        for msg in new_history:
+            self.history_count += 1
+            line = history_line(msg)
+            if line:
+                lines.append(line)
+
+        if lines:
+            had_lines = bool(self._lines)
+            for line in lines:
+                tokens = estimate_tokens(line) + TOKEN_EST_MESSAGE_OVERHEAD
+                self._lines.append((line, tokens))
+                self.history_tokens += tokens
+
+            block = "\n".join(lines)
+            if had_lines:
+                self._text = f"{self._text}\n{block}"
+            else:
+                self._text = self._prefix + HISTORY_HEADER + block
+        return self._text
+
+    # render the prompt without its oldest history lines until the estimate fits the budget
+    # the cached lines are untouched: a later prompt with a larger budget still gets them
+    def fit(self, budget: int) -> str:
+        tokens = self.tokens
+        dropped = 0
+        for _, line_tokens in self._lines:
+            if tokens <= budget:
+                break
+            tokens -= line_tokens
+            dropped += 1
+
+        self.prompt_tokens = tokens
+        self.trimmed = dropped
+        if not dropped:
+            return self._text
+        kept = [line for line, _ in islice(self._lines, dropped, None)]
+        return self._prefix + HISTORY_HEADER + "\n".join(kept) if kept else self._prefix
+
+    @property
+    def tokens(self) -> int:
+        return self.prefix_tokens + self.history_tokens
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    # base instruction + summaries, without history
+    @property
+    def prefix(self) -> str:
+        return self._prefix
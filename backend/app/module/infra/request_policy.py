@@ -0,0 +1,196 @@
+# app/module/infra/request_policy.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.core.config.openai import (
+    HEDGE_ENABLED,
+    HEDGE_MAX_RATIO,
+    HEDGE_MIN_DELAY_MS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    LATENCY_SAMPLES,
+)
+
+T = TypeVar("T")
+
+# response stream latency is tracked to the first token
+FIRST_TOKEN = "response_first_token"
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, operation: str, deadline_ms: int):
+        super().__init__(f"{operation} exceeded its {deadline_ms}ms deadline")
+        self.operation = operation
+        self.deadline_ms = deadline_ms
+
+
+# recent latencies + hedge counters for one operation and model
+class _ModelStats:
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self.latencies: deque[float] = deque(maxlen=samples)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+        self.errors = 0
+
+    def percentile(self, q: float) -> float:
+        values = sorted(self.latencies)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * q))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "samples": len(self.latencies),
+            "p50_ms": round(self.percentile(0.5), 1),
+            "p95_ms": round(self.percentile(0.95), 1),
+            "p99_ms": round(self.percentile(0.99), 1),
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            # extra upstream calls per call
+            "extra_cost_ratio": round(self.hedged / self.calls, 3) if self.calls else 0.0,
+            "deadline_exceeded": self.deadline_exceeded,
+            "errors": self.errors,
+        }
+
+
+# per-call deadline + optional hedging for idempotent upstream calls (STT, non-stream responses)
+# the hedge delay follows the observed latency of the same operation and model
+class RequestPolicy:
+    def __init__(
+        self,
+        hedge_enabled: bool = HEDGE_ENABLED,
+        percentile: float = HEDGE_PERCENTILE,
+        min_delay_ms: int = HEDGE_MIN_DELAY_MS,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        max_ratio: float = HEDGE_MAX_RATIO,
+    ):
+        self.hedge_enabled = hedge_enabled
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self._models: Dict[tuple[str, str], _ModelStats] = {}
+
+    def _stats_for(self, operation: str, model: str) -> _ModelStats:
+        key = (operation, model)
+        stats = self._models.get(key)
+        if stats is None:
+            stats = self._models[key] = _ModelStats()
+        return stats
+
+    # ms after which a duplicate is sent, or None (not enough samples / over the cost budget)
+    def hedge_delay_ms(self, operation: str, model: str) -> Optional[float]:
+        stats = self._stats_for(operation, model)
+        if (
+            not self.hedge_enabled
+            or len(stats.latencies) < self.min_samples
+            or stats.hedged >= self.max_ratio * stats.calls
+        ):
+            return None
+        return max(float(self.min_delay_ms), stats.percentile(self.percentile))
+
+    def record(self, operation: str, model: str, latency_ms: float) -> None:
+        self._stats_for(operation, model).latencies.append(latency_ms)
+
+    # calls that are not run through execute (response stream: time to first token)
+    def observe(self, operation: str, model: str, latency_ms: float) -> None:
+        stats = self._stats_for(operation, model)
+        stats.calls += 1
+        stats.latencies.append(latency_ms)
+
+    def deadline_exceeded(self, operation: str, model: str) -> None:
+        self._stats_for(operation, model).deadline_exceeded += 1
+
+    async def execute(
+        self,
+        operation: str,
+        model: str,
+        call: Callable[[], Awaitable[T]],
+        deadline_ms: int,
+        hedge: bool = True,
+    ) -> T:
+        stats = self._stats_for(operation, model)
+        stats.calls += 1
+        try:
+            return await asyncio.wait_for(
+                self._race(operation, model, call, stats, hedge), deadline_ms / 1000
+            )
+        except DeadlineExceeded:
+            raise
+        except asyncio.TimeoutError:
+            self.deadline_exceeded(operation, model)
+            raise DeadlineExceeded(operation, deadline_ms) from None
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+
+    async def _attempt(self, operation: str, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        result = await call()
+        self.record(operation, model, (time.monotonic() - start) * 1000)
+        return result
+
+    async def _race(
+        self,
+        operation: str,
+        model: str,
+        call: Callable[[], Awaitable[T]],
+        stats: _ModelStats,
+        hedge: bool,
+    ) -> T:
+        start = time.monotonic()
+        primary = asyncio.create_task(self._attempt(operation, model, call))
+        delay_ms = self.hedge_delay_ms(operation, model) if hedge else None
+        tasks = [primary]
+        try:
+            if delay_ms is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000)
+                if not done:
+                    stats.hedged += 1
+                    tasks.append(asyncio.create_task(self._attempt(operation, model, call)))
+
+            # first successful attempt wins; an error only counts once every attempt failed
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            stats.hedge_wins += 1
+                            # the cancelled primary took at least this long (keeps the tail visible)
+                            self.record(operation, model, (time.monotonic() - start) * 1000)
+                        return task.result()
+                    if task is primary or error is None:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # losers (and the deadline) must not leave orphaned upstream calls behind
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_percentile": self.percentile,
+            "hedge_max_ratio": self.max_ratio,
+            "models": {
+                f"{operation}:{model}": stats.stats()
+                for (operation, model), stats in self._models.items()
+            },
+        }
+
+
+request_policy = RequestPolicy()
@@ -0,0 +1,108 @@
+# app/module/infra/response_cache.py
+from __future__ import annotations
+
+import re
+import time
+import unicodedata
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.core.config.chatbot import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_QUESTION_CHARS,
+    RESPONSE_CACHE_TTL_SEC,
+)
+
+# (chatbot_id, config version, model, normalized question)
+CacheKey = tuple[int, int, str, str]
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.~,…]+$")
+
+
+# width / case / spacing / trailing punctuation differences map to one key
+def normalize_question(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _SPACES.sub(" ", text).strip()
+    return _TRAILING.sub("", text)
+
+
+# answers to the first question of a session: with no history or summary the reply depends
+# only on the chatbot config, the model and the question, so an exact match can be reused
+class ResponseCache:
+    def __init__(
+        self,
+        enabled: bool = RESPONSE_CACHE_ENABLED,
+        ttl_sec: int = RESPONSE_CACHE_TTL_SEC,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_question_chars: int = RESPONSE_CACHE_MAX_QUESTION_CHARS,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self.max_question_chars = max_question_chars
+        self._entries: OrderedDict[CacheKey, tuple[str, float]] = OrderedDict()  # -> (answer, expires)
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, chatbot_id: int, version: int, model: str, question: str) -> Optional[CacheKey]:
+        normalized = normalize_question(question)
+        if not normalized or len(normalized) > self.max_question_chars:
+            return None
+        return chatbot_id, version, model, normalized
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            answer, expires = entry
+            if time.monotonic() < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return answer
+            del self._entries[key]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, answer: str) -> None:
+        if not answer:
+            return
+        self._entries[key] = (answer, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # chatbot saved / deleted: drop every answer for it (any version / model)
+    def invalidate(self, chatbot_id: int) -> None:
+        for key in [key for key in self._entries if key[0] == chatbot_id]:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,383 @@
+# app/module/infra/session_store.py
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+import zlib
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from redis.exceptions import WatchError
+
+from app.core.config.redis import SESSION_STORE, SESSION_TTL, async_redis_client
+from app.core.config.session import (
+    SESSION_HIBERNATE_AFTER_SEC,
+    SESSION_IDLE_TTL_SEC,
+    SESSION_MAX_BYTES,
+    SESSION_SWEEP_INTERVAL_SEC,
+)
+
+# rough per-object overheads for the byte budget (dict/list slots, dict per message)
+ENTRY_OVERHEAD = 512
+MESSAGE_OVERHEAD = 240
+
+
+def new_session() -> Dict[str, Any]:
+    return {
+        "instruction": "",
+        "history": [],
+        "summary": [],
+        "vector_store_id": None,
+    }
+
+
+# conversation state per session: base instruction, recent history, summaries, vector store
+class SessionStore(ABC):
+    @abstractmethod
+    async def ensure(self, session_id: str) -> None: ...
+
+    # {"instruction", "history", "history_len", "summary", "vector_store_id"} (one round trip)
+    # history holds messages from index history_from on; history_len is the full length
+    @abstractmethod
+    async def snapshot(self, session_id: str, history_from: int = 0) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    async def set_instruction(self, session_id: str, instruction: str) -> None: ...
+
+    @abstractmethod
+    async def append_history(self, session_id: str, message: Dict[str, Any]) -> None: ...
+
+    # append a summary and drop the first `consumed` history messages it covers
+    # (messages appended while summarizing are kept)
+    @abstractmethod
+    async def commit_summary(self, session_id: str, summary: str, consumed: int) -> None: ...
+
+    # replace the first `consumed` summaries with one merged summary
+    @abstractmethod
+    async def compact_summaries(self, session_id: str, merged: str, consumed: int) -> None: ...
+
+    @abstractmethod
+    async def clear(self, session_id: str) -> None: ...
+
+    # session of a live connection: never evicted by the store (clear() releases it)
+    def pin(self, session_id: str) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+    async def close(self) -> None:
+        return None
+
+
+def measure_session(storage: Dict[str, Any]) -> int:
+    size = ENTRY_OVERHEAD + sys.getsizeof(storage["instruction"])
+    size += sum(MESSAGE_OVERHEAD + sys.getsizeof(m.get("content", "")) for m in storage["history"])
+    size += sum(sys.getsizeof(summary) for summary in storage["summary"])
+    return size
+
+
+@dataclass(slots=True)
+class _Entry:
+    data: Optional[Dict[str, Any]]  # None while hibernated
+    blob: Optional[bytes]           # zlib(JSON) while hibernated
+    size: int
+    last_access: float
+
+
+# in-process store (single worker, lost on restart), bounded:
+# LRU order + last access, idle hibernation/eviction by a background sweeper, global byte budget
+class MemorySessionStore(SessionStore):
+    def __init__(
+        self,
+        max_bytes: int = SESSION_MAX_BYTES,
+        idle_ttl_sec: int = SESSION_IDLE_TTL_SEC,
+        hibernate_after_sec: int = SESSION_HIBERNATE_AFTER_SEC,
+        sweep_interval_sec: int = SESSION_SWEEP_INTERVAL_SEC,
+    ):
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl_sec
+        self.hibernate_after = hibernate_after_sec
+        self.sweep_interval = max(1, sweep_interval_sec)
+
+        self._sessions: OrderedDict[str, _Entry] = OrderedDict()  # least recently used first
+        self._bytes = 0
+        self._pinned: set[str] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        # counters
+        self.hibernations = 0
+        self.rehydrations = 0
+        self.idle_evictions = 0
+        self.budget_evictions = 0
+        self.over_budget = 0  # budget enforcement stopped at pinned (live) sessions
+
+    def _get(self, session_id: str, create: bool = True) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            if not create:
+                return None
+            data = new_session()
+            entry = _Entry(data, None, measure_session(data), 0.0)
+            self._sessions[session_id] = entry
+            self._bytes += entry.size
+        elif entry.data is None:
+            self._rehydrate(entry)
+
+        entry.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        self._start_sweeper()
+        return entry.data
+
+    def _resize(self, session_id: str, size: int) -> None:
+        entry = self._sessions[session_id]
+        self._bytes += size - entry.size
+        entry.size = size
+        if self._bytes > self.max_bytes:
+            self._enforce_budget(keep=session_id)
+
+    def _hibernate(self, entry: _Entry) -> None:
+        blob = zlib.compress(json.dumps(entry.data, ensure_ascii=False).encode("utf-8"))
+        entry.data, entry.blob = None, blob
+        self._bytes += len(blob) + ENTRY_OVERHEAD - entry.size
+        entry.size = len(blob) + ENTRY_OVERHEAD
+        self.hibernations += 1
+
+    def _rehydrate(self, entry: _Entry) -> None:
+        data = json.loads(zlib.decompress(entry.blob).decode("utf-8"))
+        entry.data, entry.blob = data, None
+        size = measure_session(data)
+        self._bytes += size - entry.size
+        entry.size = size
+        self.rehydrations += 1
+
+    def _evict(self, session_id: str) -> None:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    # over budget: hibernate least recently used sessions first, then drop them
+    # pinned sessions are only hibernated: dropping one would silently reset a live conversation
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        for session_id, entry in list(self._sessions.items()):
+            if self._bytes <= self.max_bytes:
+                return
+            if session_id != keep and entry.data is not None:
+                self._hibernate(entry)
+        for session_id in list(self._sessions):
+            if self._bytes <= self.max_bytes:
+                return
+            if session_id != keep and session_id not in self._pinned:
+                self._evict(session_id)
+                self.budget_evictions += 1
+        if self._bytes > self.max_bytes:
+            self.over_budget += 1
+            print(
+                f"[session_store] over budget with only live sessions left: "
+                f"{self._bytes}/{self.max_bytes} bytes, {len(self._pinned)} pinned"
+            )
+
+    def sweep(self) -> None:
+        now = time.monotonic()
+        for session_id, entry in list(self._sessions.items()):
+            idle = now - entry.last_access
+            if idle < self.hibernate_after and idle < self.idle_ttl:
+                break  # LRU order: everything after this is more recent
+            if idle >= self.idle_ttl and session_id not in self._pinned:
+                self._evict(session_id)
+                self.idle_evictions += 1
+            elif entry.data is not None:
+                self._hibernate(entry)
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is None:
+            try:
+                self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+            except RuntimeError:
+                pass  # no running loop (sync use); sweep() can be called directly
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error in session sweep: {e}")
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    def stats(self) -> Dict[str, Any]:
+        hibernated = sum(1 for entry in self._sessions.values() if entry.data is None)
+        return {
+            "backend": type(self).__name__,
+            "sessions": len(self._sessions),
+            "pinned": len(self._pinned),
+            "live": len(self._sessions) - hibernated,
+            "hibernated": hibernated,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hibernations": self.hibernations,
+            "rehydrations": self.rehydrations,
+            "idle_evictions": self.idle_evictions,
+            "budget_evictions": self.budget_evictions,
+            "over_budget": self.over_budget,
+        }
+
+    async def ensure(self, session_id: str) -> None:
+        self._get(session_id)
+
+    async def snapshot(self, session_id: str, history_from: int = 0) -> Dict[str, Any]:
+        storage = self._get(session_id)
+        return {
+            "instruction": storage["instruction"],
+            "history": storage["history"][history_from:],
+            "history_len": len(storage["history"]),
+            "summary": list(storage["summary"]),
+            "vector_store_id": storage["vector_store_id"],
+        }
+
+    async def set_instruction(self, session_id: str, instruction: str) -> None:
+        storage = self._get(session_id)
+        storage["instruction"] = instruction
+        self._resize(session_id, measure_session(storage))
+
+    async def append_history(self, session_id: str, message: Dict[str, Any]) -> None:
+        self._get(session_id)["history"].append(message)
+        entry = self._sessions[session_id]
+        self._resize(session_id, entry.size + MESSAGE_OVERHEAD + sys.getsizeof(message.get("content", "")))
+
+    async def commit_summary(self, session_id: str, summary: str, consumed: int) -> None:
+        # a summary finishing after clear_session must not recreate the session
+        storage = self._get(session_id, create=False)
+        if storage is None:
+            return
+        storage["summary"].append(summary)
+        del storage["history"][:consumed]
+        self._resize(session_id, measure_session(storage))
+
+    async def compact_summaries(self, session_id: str, merged: str, consumed: int) -> None:
+        storage = self._get(session_id, create=False)
+        if storage is None:
+            return
+        storage["summary"][:consumed] = [merged]
+        self._resize(session_id, measure_session(storage))
+
+    async def clear(self, session_id: str) -> None:
+        self._pinned.discard(session_id)
+        self._evict(session_id)
+
+    def pin(self, session_id: str) -> None:
+        self._pinned.add(session_id)
+
+
+# Redis: hash for scalar fields, lists for history/summary, every write refreshes the key TTLs
+class RedisSessionStore(SessionStore):
+    def __init__(self, client=async_redis_client, ttl: int = SESSION_TTL, prefix: str = "session"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _keys(self, session_id: str) -> tuple[str, str, str]:
+        base = f"{self.prefix}:{session_id}"
+        return f"{base}:meta", f"{base}:history", f"{base}:summary"
+
+    def _expire(self, pipe, session_id: str) -> None:
+        for key in self._keys(session_id):
+            pipe.expire(key, self.ttl)
+
+    async def ensure(self, session_id: str) -> None:
+        meta, _, _ = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(meta, "instruction", "")
+            self._expire(pipe, session_id)
+            await pipe.execute()
+
+    async def snapshot(self, session_id: str, history_from: int = 0) -> Dict[str, Any]:
+        meta, history, summary = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hgetall(meta)
+            pipe.lrange(history, history_from, -1)
+            pipe.llen(history)
+            pipe.lrange(summary, 0, -1)
+            fields, history_items, history_len, summaries = await pipe.execute()
+        return {
+            "instruction": fields.get("instruction", ""),
+            "history": [json.loads(item) for item in history_items],
+            "history_len": history_len,
+            "summary": summaries,
+            "vector_store_id": fields.get("vector_store_id") or None,
+        }
+
+    async def set_instruction(self, session_id: str, instruction: str) -> None:
+        meta, _, _ = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(meta, "instruction", instruction)
+            self._expire(pipe, session_id)
+            await pipe.execute()
+
+    async def append_history(self, session_id: str, message: Dict[str, Any]) -> None:
+        _, history, _ = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(history, json.dumps(message, ensure_ascii=False))
+            self._expire(pipe, session_id)
+            await pipe.execute()
+
+    # write only while the session still exists: a summary finishing after clear_session
+    # must not recreate orphan keys (same as the memory store's _get(create=False))
+    async def _update_existing(self, session_id: str, queue) -> None:
+        meta, _, _ = self._keys(session_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(meta)
+                    if not await pipe.exists(meta):
+                        return
+                    pipe.multi()
+                    queue(pipe)
+                    self._expire(pipe, session_id)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue  # meta changed (instruction / clear) between WATCH and EXEC
+
+    async def commit_summary(self, session_id: str, summary: str, consumed: int) -> None:
+        _, history, summary_key = self._keys(session_id)
+
+        def queue(pipe) -> None:
+            pipe.rpush(summary_key, summary)
+            pipe.ltrim(history, consumed, -1)
+
+        await self._update_existing(session_id, queue)
+
+    async def compact_summaries(self, session_id: str, merged: str, consumed: int) -> None:
+        _, _, summary_key = self._keys(session_id)
+
+        def queue(pipe) -> None:
+            pipe.ltrim(summary_key, consumed, -1)
+            pipe.lpush(summary_key, merged)
+
+        await self._update_existing(session_id, queue)
+
+    async def clear(self, session_id: str) -> None:
+        await self.client.delete(*self._keys(session_id))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_session_store(backend: str = SESSION_STORE) -> SessionStore:
+    if backend == "redis":
+        return RedisSessionStore()
+    return MemorySessionStore()
+
+
+# process-wide store used by GPTService
+session_store: SessionStore = create_session_store()
@@ -0,0 +1,52 @@
+# app/module/infra/token_budget.py
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from app.core.config.session import (
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_TOKEN_BUDGETS,
+    TOKEN_EST_ASCII_CHARS_PER_TOKEN,
+    TOKEN_EST_NON_ASCII_TOKENS_PER_CHAR,
+)
+
+# model -> [calls, estimated sum, actual sum, absolute error sum]
+_ESTIMATES: Dict[str, list] = {}
+
+
+# fast local estimate (no tokenizer): ASCII text ~4 chars/token, Hangul/CJK ~1 token per char or so
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    non_ascii_chars = len(text) - ascii_chars
+    return int(
+        ascii_chars / TOKEN_EST_ASCII_CHARS_PER_TOKEN
+        + non_ascii_chars * TOKEN_EST_NON_ASCII_TOKENS_PER_CHAR
+    ) + 1
+
+
+def context_budget(model: Optional[str]) -> int:
+    return CONTEXT_TOKEN_BUDGETS.get(model or "", CONTEXT_TOKEN_BUDGET)
+
+
+# estimated vs actual input_tokens, for tuning the estimator constants
+def record_estimate(model: Optional[str], estimated: int, actual: int) -> None:
+    if not actual:
+        return
+    stats = _ESTIMATES.setdefault(model or "default", [0, 0, 0, 0])
+    stats[0] += 1
+    stats[1] += estimated
+    stats[2] += actual
+    stats[3] += abs(actual - estimated)
+
+
+def estimate_stats() -> Dict[str, Any]:
+    return {
+        model: {
+            "calls": calls,
+            "actual_per_estimated": round(actual / estimated, 3) if estimated else None,
+            "mean_abs_error": round(abs_error / calls, 1),
+        }
+        for model, (calls, estimated, actual, abs_error) in _ESTIMATES.items()
+    }
@@ -0,0 +1,232 @@
+# app/module/infra/tts_cache.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config.audio import (
+    TTS_CACHE_DISK_MAX_BYTES,
+    TTS_CACHE_ENABLED,
+    TTS_CACHE_MAX_TEXT_CHARS,
+    TTS_CACHE_MEMORY_ITEM_MAX_BYTES,
+    TTS_CACHE_MEMORY_MAX_BYTES,
+    TTS_CACHE_SUBDIR,
+)
+from app.core.config.settings import settings
+
+TMP_SUFFIX = ".tmp"
+
+
+# synthesized audio by content: the same model / voice / format / text is never rendered twice
+# memory tier (LRU, small entries only) in front of a disk tier (LRU by last use, size-bounded)
+class TtsCache:
+    def __init__(
+        self,
+        root: Path = settings.MEDIA_ROOT / TTS_CACHE_SUBDIR,
+        enabled: bool = TTS_CACHE_ENABLED,
+        memory_max_bytes: int = TTS_CACHE_MEMORY_MAX_BYTES,
+        memory_item_max_bytes: int = TTS_CACHE_MEMORY_ITEM_MAX_BYTES,
+        disk_max_bytes: int = TTS_CACHE_DISK_MAX_BYTES,
+        max_text_chars: int = TTS_CACHE_MAX_TEXT_CHARS,
+    ):
+        self.root = Path(root)
+        self.enabled = enabled
+        self.memory_max_bytes = memory_max_bytes
+        self.memory_item_max_bytes = min(memory_item_max_bytes, memory_max_bytes)
+        self.disk_max_bytes = disk_max_bytes
+        self.max_text_chars = max_text_chars
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> size, least recently used first; None until the directory is scanned
+        self._disk: Optional[OrderedDict[str, int]] = None
+        self._disk_bytes = 0
+        self._index_lock = asyncio.Lock()
+        self._writes: set[asyncio.Task] = set()
+
+        # counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.bytes_served = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+        self.errors = 0
+
+    # "<sha256>.<format>", also the file name under root/<first two hex chars>/
+    def key(self, model: str, voice: str, response_format: str, text: str) -> Optional[str]:
+        if not self.enabled or not text or len(text) > self.max_text_chars:
+            return None
+        digest = hashlib.sha256("\0".join((model, voice, response_format, text)).encode()).hexdigest()
+        return f"{digest}.{response_format}"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    # ---------- memory tier ----------
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_item_max_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.memory_evictions += 1
+
+    # ---------- disk tier ----------
+    def _scan(self) -> list[tuple[float, str, int]]:
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for path in self.root.glob("*/*"):
+            if path.name.endswith(TMP_SUFFIX):
+                continue  # write in progress (or interrupted)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path.name, st.st_size))
+        entries.sort()
+        return entries
+
+    async def _load_index(self) -> OrderedDict[str, int]:
+        if self._disk is None:
+            async with self._index_lock:
+                if self._disk is None:
+                    try:
+                        entries = await asyncio.to_thread(self._scan)
+                    except OSError as e:
+                        print(f"[tts_cache] scan failed: {e}")
+                        entries = []
+                    self._disk = OrderedDict((key, size) for _, key, size in entries)
+                    self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _read(self, key: str) -> bytes:
+        path = self._path(key)
+        data = path.read_bytes()
+        os.utime(path)  # last use, kept across restarts for the LRU order
+        return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}{TMP_SUFFIX}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _unlink(self, keys: list[str]) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    async def _persist(self, key: str, data: bytes) -> None:
+        disk = await self._load_index()
+        if key in disk:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, data)
+        except OSError as e:
+            self.errors += 1
+            print(f"[tts_cache] write failed: {e}")
+            return
+        if key in disk:
+            return  # a concurrent write of the same content finished first
+        disk[key] = len(data)
+        self._disk_bytes += len(data)
+
+        evicted = []
+        while self._disk_bytes > self.disk_max_bytes and len(disk) > 1:
+            old_key, size = disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(old_key)
+        if evicted:
+            self.disk_evictions += len(evicted)
+            await asyncio.to_thread(self._unlink, evicted)
+
+    # ---------- public ----------
+    async def get(self, key: str) -> Optional[bytes]:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            self.bytes_served += len(data)
+            return data
+
+        disk = await self._load_index()
+        if key in disk:
+            try:
+                data = await asyncio.to_thread(self._read, key)
+            except OSError:
+                self.errors += 1
+                self._disk_bytes -= disk.pop(key, 0)
+            else:
+                disk.move_to_end(key)
+                self.disk_hits += 1
+                self.bytes_served += len(data)
+                self._remember(key, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    # without touching the hit / miss counters (pre-rendering)
+    async def contains(self, key: str) -> bool:
+        return key in self._memory or key in await self._load_index()
+
+    # memory right away, disk in the background (the caller is not held up by the write)
+    def put(self, key: str, data: bytes) -> None:
+        if not data:
+            return
+        self.stores += 1
+        self._remember(key, data)
+        task = asyncio.create_task(self._persist(key, data))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def close(self) -> None:
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "bytes_served": self.bytes_served,
+            "stores": self.stores,
+            "memory": {
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "max_bytes": self.memory_max_bytes,
+                "evictions": self.memory_evictions,
+            },
+            "disk": {
+                "entries": len(self._disk) if self._disk is not None else None,
+                "bytes": self._disk_bytes,
+                "max_bytes": self.disk_max_bytes,
+                "evictions": self.disk_evictions,
+                "pending_writes": len(self._writes),
+            },
+            "errors": self.errors,
+        }
+
+
+tts_cache = TtsCache()
@@ -0,0 +1,182 @@
+# app/module/infra/write_behind.py
+from __future__ import annotations
+
+import asyncio
+
+from collections import deque
+from typing import Any, Optional
+
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from app.core.config.persistence import (
+    WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_ENABLED,
+    WRITE_BEHIND_FLUSH_MS,
+    WRITE_BEHIND_MAX_RETRIES,
+    WRITE_BEHIND_QUEUE_MAX,
+    WRITE_BEHIND_RETRY_BASE_MS,
+)
+from app.core.database.base import SessionLocal
+from app.module.infra.gpt_repository import GptRepository
+
+# record kinds
+MESSAGE = "message"
+LOG_END = "log_end"
+
+# dropped records: retries exhausted (DB down) / rejected by the DB itself
+TRANSIENT = "transient"
+INVALID = "invalid"
+
+
+# connection / lock / timeout trouble is retried as a batch; anything else is about the data
+def is_transient(exc: BaseException) -> bool:
+    return isinstance(
+        exc,
+        (OperationalError, InterfaceError, DisconnectionError, PoolTimeout, OSError, asyncio.TimeoutError),
+    )
+
+
+# process-wide write-behind queue (transcript messages + log-end updates)
+# callers enqueue without waiting; a single worker flushes batches on a size or time trigger
+class WriteBehindQueue:
+    def __init__(
+        self,
+        enabled: bool = WRITE_BEHIND_ENABLED,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_ms: int = WRITE_BEHIND_FLUSH_MS,
+        maxsize: int = WRITE_BEHIND_QUEUE_MAX,
+        max_retries: int = WRITE_BEHIND_MAX_RETRIES,
+        retry_base_ms: int = WRITE_BEHIND_RETRY_BASE_MS,
+    ):
+        self.enabled = enabled
+        self.batch_size = max(1, batch_size)
+        self.flush_timeout = max(0, flush_ms) / 1000
+        self.maxsize = max(1, maxsize)
+        self.max_retries = max(0, max_retries)
+        self.retry_base = max(0, retry_base_ms) / 1000
+
+        self._queue: deque[tuple[str, dict]] = deque()
+        self._nonempty = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # counters
+        self.enqueued = 0
+        self.written = 0
+        self.commits = 0
+        self.retries = 0
+        self.splits = 0
+        self.failed = {TRANSIENT: 0, INVALID: 0}
+        self.rejected = 0  # queue full / closed -> caller wrote inline
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    # enqueue without waiting; False means the caller must write inline
+    def put(self, kind: str, record: dict) -> bool:
+        if not self.enabled or self._closed or len(self._queue) >= self.maxsize:
+            self.rejected += 1
+            return False
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+        self._queue.append((kind, record))
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._nonempty.set()
+        if len(self._queue) >= self.batch_size:
+            self._full.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                if self._closed:
+                    return
+                self._nonempty.clear()
+                await self._nonempty.wait()
+                continue
+
+            # time trigger: give a partial batch flush_timeout to fill up
+            if len(self._queue) < self.batch_size and not self._closed:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[str, dict]]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write_records(batch)
+                self.written += len(batch)
+                self.commits += 1
+                return
+            except Exception as e:
+                if not is_transient(e):
+                    # a bad record (stale log_id, enum mismatch) must not take the rest with it:
+                    # halve until the failing records are isolated, drop only those
+                    if len(batch) > 1:
+                        self.splits += 1
+                        middle = len(batch) // 2
+                        await self._flush(batch[:middle])
+                        await self._flush(batch[middle:])
+                        return
+                    self.failed[INVALID] += 1
+                    kind, record = batch[0]
+                    ref = record.get("session_id") or record.get("log_id")
+                    print(f"Error in write_behind flush, dropped {kind} record ({ref}): {e}")
+                    return
+                if attempt == self.max_retries:
+                    self.failed[TRANSIENT] += len(batch)
+                    print(f"Error in write_behind flush, dropped {len(batch)} records: {e}")
+                    return
+                self.retries += 1
+                print(f"Error in write_behind flush (retry {attempt + 1}): {e}")
+                await asyncio.sleep(self.retry_base * (2 ** attempt))
+
+    async def _write_records(self, batch: list[tuple[str, dict]]) -> None:
+        messages = [record for kind, record in batch if kind == MESSAGE]
+        log_ends = [record for kind, record in batch if kind == LOG_END]
+        await self._write(messages, log_ends)
+
+    @staticmethod
+    async def _write(messages: list[dict], log_ends: list[dict]) -> None:
+        # own short-lived session: the worker outlives any request/websocket session
+        async with SessionLocal() as db:
+            await GptRepository(db).write_batch(messages, log_ends)
+
+    # drain everything still queued (app shutdown)
+    async def close(self) -> None:
+        self._closed = True
+        self._nonempty.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+        print(f"write_behind stats: {self.stats()}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "commits": self.commits,
+            "records_per_commit": round(self.written / self.commits, 1) if self.commits else 0.0,
+            "retries": self.retries,
+            "splits": self.splits,
+            "failed": dict(self.failed),
+            "rejected": self.rejected,
+        }
+
+
+write_behind = WriteBehindQueue()
@@ -1,16 +1,51 @@
+import io
 import os
+import struct
 import tempfile
 import wave
 
-import numpy as np
+# downlink audio frame header: seq(uint32 LE) + flags(uint32 LE), 8 bytes keeps PCM int16-aligned
+AUDIO_FRAME_HEADER = struct.Struct("<II")
+AUDIO_FRAME_FLAG_END = 0x01
+
+# canonical 44-byte RIFF/WAVE header for PCM
+WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
 
 async def convert_pcm_to_wav(filename: str, pcm_data: bytes, sample_rate: int = 16000) -> None:
     try:
-        pcm_array = np.frombuffer(pcm_data, dtype=np.int16)
         with wave.open(filename, "wb") as wav_file:
             wav_file.setnchannels(1)      # mono
             wav_file.setsampwidth(2)      # 16-bit
             wav_file.setframerate(sample_rate)
-            wav_file.writeframes(pcm_array.tobytes())
+            wav_file.writeframes(pcm_data)
     except Exception as e:
-        print(f"WAV 변환 중 오류: {e}")
\ No newline at end of file
+        print(f"WAV 변환 중 오류: {e}")
+
+def wav_header(data_size: int, sample_rate: int = 16000, channels: int = 1, sample_width: int = 2) -> bytes:
+    block_align = channels * sample_width
+    return WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b"data", data_size,
+    )
+
+# in-memory WAV (header + PCM written straight from the buffer, no disk I/O)
+def build_wav(pcm_data, sample_rate: int = 16000) -> io.BytesIO:
+    view = memoryview(pcm_data).cast("B")
+    size = len(view) - (len(view) % 2)
+    buf = io.BytesIO()
+    buf.write(wav_header(size, sample_rate))
+    buf.write(view[:size])
+    buf.seek(0)
+    return buf
+
+def pack_audio_frame(seq: int, payload: bytes = b"", end: bool = False) -> bytes:
+    flags = AUDIO_FRAME_FLAG_END if end else 0
+    return AUDIO_FRAME_HEADER.pack(seq & 0xFFFFFFFF, flags) + payload
+
+def split_pcm(pcm_data: bytes, chunk_bytes: int):
+    # keep chunk size even so no int16 sample is split across frames
+    chunk_bytes = max(2, chunk_bytes - (chunk_bytes % 2))
+    view = memoryview(pcm_data)
+    for offset in range(0, len(view), chunk_bytes):
+        yield view[offset:offset + chunk_bytes]
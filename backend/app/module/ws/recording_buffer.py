@@ -0,0 +1,109 @@
+# app/module/ws/recording_buffer.py
+from __future__ import annotations
+
+import mmap
+import tempfile
+
+from typing import IO, Optional
+
+from app.core.config.audio import LEGACY_MAX_RECORDING_SEC, LEGACY_SPILL_THRESHOLD_BYTES
+
+# legacy mode recording buffer (mono 16-bit PCM)
+# bounded by max duration; past the spill threshold the data moves to a memory-mapped temp file
+class RecordingBuffer:
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        max_sec: int = LEGACY_MAX_RECORDING_SEC,
+        spill_threshold: int = LEGACY_SPILL_THRESHOLD_BYTES,
+    ):
+        max_bytes = int(sample_rate * 2 * max_sec)
+        self.max_bytes = max_bytes - (max_bytes % 2)
+        self.spill_threshold = spill_threshold
+
+        self._memory = bytearray()
+        self._file: Optional[IO[bytes]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._size = 0
+        self.truncated = False
+
+        # counters
+        self.dropped_bytes = 0
+        self.spills = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    # resident bytes held in process memory for this recording
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._memory)
+
+    def extend(self, pcm_chunk: bytes) -> None:
+        room = self.max_bytes - self._size
+        if room <= 0:
+            self.dropped_bytes += len(pcm_chunk)
+            self.truncated = True
+            return
+        if len(pcm_chunk) > room:
+            self.dropped_bytes += len(pcm_chunk) - room
+            self.truncated = True
+            pcm_chunk = pcm_chunk[:room]
+
+        if self._file is None and self._size + len(pcm_chunk) > self.spill_threshold:
+            self._spill()
+
+        if self._file is not None:
+            self._release_mmap()
+            self._file.write(pcm_chunk)
+        else:
+            self._memory.extend(pcm_chunk)
+        self._size += len(pcm_chunk)
+
+    def _spill(self) -> None:
+        self._file = tempfile.TemporaryFile(suffix=".pcm")
+        self._file.write(self._memory)
+        self._memory = bytearray()
+        self.spills += 1
+
+    def _release_mmap(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    # read-only view of the whole recording (valid until the next extend/clear)
+    def view(self) -> memoryview:
+        if self._file is None:
+            return memoryview(self._memory).toreadonly()
+        if not self._size:
+            return memoryview(b"")
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def clear(self) -> None:
+        self._release_mmap()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._memory = bytearray()
+        self._size = 0
+        self.truncated = False
+
+    def close(self) -> None:
+        self.clear()
+
+    def stats(self) -> dict:
+        return {
+            "bytes": self._size,
+            "memory_bytes": self.memory_bytes,
+            "spilled": self.spilled,
+            "max_bytes": self.max_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "spills": self.spills,
+        }
@@ -0,0 +1,128 @@
+# app/module/ws/resampler.py
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+# input taps per polyphase branch (scaled up by M/L when downsampling)
+TAPS_PER_PHASE = 16
+KAISER_BETA = 8.0
+
+# streaming polyphase resampler for mono 16-bit PCM (rational ratio L/M)
+# filter history is kept across chunks; work buffers are reused and only grow
+class StreamResampler:
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = TAPS_PER_PHASE):
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("sample rates must be positive")
+
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+
+        g = math.gcd(in_rate, out_rate)
+        self.up = out_rate // g    # L
+        self.down = in_rate // g   # M
+        self.passthrough = self.up == self.down
+
+        self.taps = int(math.ceil(taps_per_phase * max(1.0, self.down / self.up)))
+        self._coeffs = self._design_filter(self.up, self.down, self.taps)
+        self._offsets = np.arange(self.taps, dtype=np.int64)
+
+        # upsampled position of the next output, relative to the start of the next chunk
+        self._pos = 0
+        self._odd_byte = b""
+
+        # work buffers: [history (taps - 1) | chunk]
+        self._hist_len = self.taps - 1
+        self._ext = np.zeros(self._hist_len, dtype=np.float32)
+        self._win = np.empty((0, self.taps), dtype=np.float32)
+        self._coef_rows = np.empty((0, self.taps), dtype=np.float32)
+        self._acc = np.empty(0, dtype=np.float32)
+        self._pcm_out = np.empty(0, dtype=np.int16)
+
+    @staticmethod
+    def _design_filter(up: int, down: int, taps: int) -> np.ndarray:
+        # windowed-sinc lowpass at the upsampled rate, split into `up` branches of `taps` taps
+        n = up * taps
+        cutoff = 0.5 / max(up, down)
+        t = np.arange(n, dtype=np.float64) - (n - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n, KAISER_BETA)
+        h *= up / h.sum()
+        # coeffs[p, k] = h[p + k * up], applied to x[base - k] for phase p
+        return h.reshape(taps, up).T.astype(np.float32).copy()
+
+    def _reserve(self, chunk_len: int, out_len: int) -> None:
+        need = self._hist_len + chunk_len
+        if self._ext.shape[0] < need:
+            ext = np.zeros(need, dtype=np.float32)
+            ext[: self._hist_len] = self._ext[: self._hist_len]
+            self._ext = ext
+        if self._win.shape[0] < out_len:
+            self._win = np.empty((out_len, self.taps), dtype=np.float32)
+            self._coef_rows = np.empty((out_len, self.taps), dtype=np.float32)
+            self._acc = np.empty(out_len, dtype=np.float32)
+            self._pcm_out = np.empty(out_len, dtype=np.int16)
+
+    def _process_samples(self, samples: np.ndarray) -> bytes:
+        n_in = samples.shape[0]
+        if n_in == 0:
+            return b""
+
+        up, down, hist = self.up, self.down, self._hist_len
+        span = n_in * up
+        n_out = max(0, -(-(span - self._pos) // down))
+        self._reserve(n_in, n_out)
+
+        ext = self._ext
+        ext[hist: hist + n_in] = samples
+
+        if n_out:
+            positions = self._pos + np.arange(n_out, dtype=np.int64) * down
+            bases = positions // up + hist
+            phases = positions - (positions // up) * up
+
+            win = self._win[:n_out]
+            rows = self._coef_rows[:n_out]
+            acc = self._acc[:n_out]
+            out = self._pcm_out[:n_out]
+
+            np.take(ext, bases[:, None] - self._offsets[None, :], out=win)
+            np.take(self._coeffs, phases, axis=0, out=rows)
+            np.multiply(win, rows, out=win)
+            np.sum(win, axis=1, out=acc)
+            np.clip(acc, -32768, 32767, out=acc)
+            np.rint(acc, out=acc)
+            out[:] = acc
+
+            result = out.tobytes()
+        else:
+            result = b""
+
+        # keep the last (taps - 1) input samples as history for the next chunk
+        if hist:
+            ext[:hist] = ext[n_in: n_in + hist]
+        self._pos += n_out * down - span
+        return result
+
+    def process(self, pcm_chunk: bytes) -> bytes:
+        if self.passthrough or not pcm_chunk:
+            return pcm_chunk
+
+        data = self._odd_byte + pcm_chunk if self._odd_byte else pcm_chunk
+        usable = len(data) - (len(data) % 2)
+        self._odd_byte = bytes(data[usable:])
+        samples = np.frombuffer(data, dtype=np.int16, count=usable // 2)
+        return self._process_samples(samples)
+
+    # push out samples still inside the filter delay (end of a stream/response) and reset
+    def flush(self) -> bytes:
+        if self.passthrough:
+            return b""
+        tail = self._process_samples(np.zeros(self.taps // 2, dtype=np.float32))
+        self.reset()
+        return tail
+
+    def reset(self) -> None:
+        self._pos = 0
+        self._odd_byte = b""
+        self._ext[: self._hist_len] = 0
@@ -0,0 +1,131 @@
+# app/module/ws/tts_pipeline.py
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from app.core.config.audio import LEGACY_TTS_MIN_SENTENCE_CHARS, LEGACY_TTS_PARALLELISM
+
+# sentence end: terminal punctuation (optionally closed by quotes/brackets) followed by whitespace, or a newline
+SENTENCE_END = re.compile(r"[.!?。！？…]+[\"')\]」』]*\s+|\n+")
+
+
+# incremental sentence splitter for streamed text deltas
+class SentenceSplitter:
+    def __init__(self, min_chars: int = LEGACY_TTS_MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buf = ""
+        self._pending = ""  # complete sentences shorter than min_chars, merged with the next one
+
+    # returns the sentences completed by this delta (possibly empty)
+    def feed(self, delta: str) -> list[str]:
+        if not delta:
+            return []
+        self._buf += delta
+
+        out: list[str] = []
+        start = 0
+        for m in SENTENCE_END.finditer(self._buf):
+            sentence = self._buf[start:m.end()]
+            start = m.end()
+            self._pending += sentence
+            if len(self._pending.strip()) >= self.min_chars:
+                out.append(self._pending.strip())
+                self._pending = ""
+        self._buf = self._buf[start:]
+        return out
+
+    # rest of the text at end of stream
+    def flush(self) -> list[str]:
+        rest = (self._pending + self._buf).strip()
+        self._pending = ""
+        self._buf = ""
+        return [rest] if rest else []
+
+
+# concurrent synthesis with bounded parallelism, emitted strictly in submission order
+class TtsPipeline:
+    def __init__(
+        self,
+        synthesize: Callable[[str], Awaitable[tuple[bytes, int]]],
+        emit: Callable[[bytes], Awaitable[None]],
+        parallelism: int = LEGACY_TTS_PARALLELISM,
+    ):
+        self._synthesize = synthesize
+        self._emit = emit
+        self._sem = asyncio.Semaphore(max(1, parallelism))
+
+        self._tasks: deque[asyncio.Task] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._emitter = asyncio.create_task(self._run())
+
+        self.start = time.monotonic()
+        self.first_audio_ms: Optional[int] = None
+        self.sentences = 0
+        self.tokens = 0
+        self.bytes_out = 0
+
+    async def _synth(self, text: str) -> tuple[bytes, int]:
+        async with self._sem:
+            return await self._synthesize(text)
+
+    def submit(self, text: str) -> None:
+        text = (text or "").strip()
+        if not text or self._closed:
+            return
+        self.sentences += 1
+        self._tasks.append(asyncio.create_task(self._synth(text)))
+        self._ready.set()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._tasks:
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            # always await the oldest sentence first so audio stays in order
+            task = self._tasks[0]
+            try:
+                audio, tokens = await task
+            except Exception as e:
+                print(f"Error in tts pipeline: {e}")
+                audio, tokens = b"", 0
+            self._tasks.popleft()
+
+            self.tokens += tokens
+            if not audio:
+                continue
+            if self.first_audio_ms is None:
+                self.first_audio_ms = int((time.monotonic() - self.start) * 1000)
+            self.bytes_out += len(audio)
+            await self._emit(audio)
+
+    # wait until every submitted sentence is emitted
+    async def finish(self) -> None:
+        self._closed = True
+        self._ready.set()
+        await self._emitter
+
+    # abort: drop pending synthesis (disconnect / error)
+    async def cancel(self) -> None:
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        self._emitter.cancel()
+        await asyncio.gather(self._emitter, *self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def stats(self) -> dict:
+        return {
+            "sentences": self.sentences,
+            "first_audio_ms": self.first_audio_ms,
+            "bytes_out": self.bytes_out,
+            "tokens": self.tokens,
+        }
@@ -0,0 +1,178 @@
+# app/module/ws/upstream_sender.py
+from __future__ import annotations
+
+import asyncio
+
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from app.core.config.audio import (
+    REALTIME_SAMPLE_RATE,
+    UPSTREAM_FLUSH_TIMEOUT_MS,
+    UPSTREAM_OVERFLOW_POLICY,
+    UPSTREAM_QUEUE_MAX,
+    UPSTREAM_WINDOW_MS,
+)
+
+OVERFLOW_POLICIES = ("coalesce", "drop_oldest", "disconnect")
+
+# coalesced message cap (~5s @ 24kHz mono 16-bit); past this, coalesce falls back to drop_oldest
+COALESCE_MAX_BYTES = 240_000
+
+# per-connection upstream writer (frontend audio -> OpenAI Realtime)
+# frames are merged into fixed-duration windows before each append message
+class UpstreamSender:
+    def __init__(
+        self,
+        session_id: str,
+        send: Callable[[str, bytes], Awaitable[None]],
+        maxsize: int = UPSTREAM_QUEUE_MAX,
+        policy: str = UPSTREAM_OVERFLOW_POLICY,
+        window_ms: int = UPSTREAM_WINDOW_MS,
+        flush_timeout_ms: int = UPSTREAM_FLUSH_TIMEOUT_MS,
+        sample_rate: int = REALTIME_SAMPLE_RATE,
+    ):
+        self.session_id = session_id
+        self._send = send
+        self.maxsize = max(1, maxsize)
+        self.policy = policy if policy in OVERFLOW_POLICIES else "coalesce"
+
+        # window size in bytes (mono 16-bit), 0 disables windowing
+        window_bytes = int(sample_rate * 2 * max(0, window_ms) / 1000)
+        self.window_bytes = window_bytes - (window_bytes % 2)
+        self.flush_timeout = max(0, flush_timeout_ms) / 1000
+
+        self._queue: deque[bytearray] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._drain = True
+
+        # counters
+        self.enqueued_frames = 0
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.window_flushes = 0
+        self.timeout_flushes = 0
+        self.coalesced_frames = 0
+        self.dropped_frames = 0
+        self.send_errors = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    # enqueue without waiting; returns False when the connection should be dropped
+    def put(self, pcm_chunk: bytes) -> bool:
+        if self._closed or not pcm_chunk:
+            return True
+
+        self.enqueued_frames += 1
+
+        if len(self._queue) >= self.maxsize:
+            if self.policy == "disconnect":
+                self.dropped_frames += 1
+                return False
+            if self.policy == "drop_oldest" or len(self._queue[-1]) >= COALESCE_MAX_BYTES:
+                self._queue.popleft()
+                self.dropped_frames += 1
+                self._queue.append(bytearray(pcm_chunk))
+            else:
+                # coalesce: merge into the newest pending message instead of growing the queue
+                self._queue[-1].extend(pcm_chunk)
+                self.coalesced_frames += 1
+        else:
+            self._queue.append(bytearray(pcm_chunk))
+
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._wakeup.set()
+        return True
+
+    async def _flush(self, pending: bytearray) -> None:
+        try:
+            await self._send(self.session_id, bytes(pending))
+            self.sent_messages += 1
+            self.sent_bytes += len(pending)
+        except Exception as e:
+            self.send_errors += 1
+            print(f"Error in realtime_send_pcm: {e}")
+        pending.clear()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        pending = bytearray()
+        deadline: Optional[float] = None
+
+        while True:
+            # fill the current window from the queue
+            while self._queue and len(pending) < max(1, self.window_bytes):
+                pending.extend(self._queue.popleft())
+                if deadline is None:
+                    deadline = loop.time() + self.flush_timeout
+
+            if pending and len(pending) >= self.window_bytes:
+                self.window_flushes += 1
+                deadline = None
+                await self._flush(pending)
+                continue
+
+            if self._closed:
+                # flush the partial window on close (unless close dropped it)
+                if pending and self._drain:
+                    await self._flush(pending)
+                return
+
+            self._wakeup.clear()
+            if not pending:
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=max(0.0, deadline - loop.time()),
+                )
+            except asyncio.TimeoutError:
+                self.timeout_flushes += 1
+                deadline = None
+                await self._flush(pending)
+
+    # stop accepting frames; drain what is queued when flush=True
+    async def close(self, flush: bool = True) -> None:
+        self._closed = True
+        self._drain = flush
+        if not flush:
+            self._queue.clear()
+        self._wakeup.set()
+
+        task, self._task = self._task, None
+        if task is None:
+            return
+        if not flush:
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"Error in upstream sender close: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "enqueued_frames": self.enqueued_frames,
+            "sent_messages": self.sent_messages,
+            "sent_bytes": self.sent_bytes,
+            "window_flushes": self.window_flushes,
+            "timeout_flushes": self.timeout_flushes,
+            "coalesced_frames": self.coalesced_frames,
+            "dropped_frames": self.dropped_frames,
+            "send_errors": self.send_errors,
+        }
@@ -0,0 +1,191 @@
+# app/module/ws/vad.py
+from __future__ import annotations
+
+from collections import deque
+from typing import Union
+
+import numpy as np
+
+from app.core.config.audio import (
+    VAD_FRAME_MS,
+    VAD_HANGOVER_MS,
+    VAD_MARGIN_DB,
+    VAD_NOISE_FLOOR_MAX_DB,
+    VAD_PREROLL_MS,
+    VAD_THRESHOLD_DB,
+    VAD_TRIM_PAD_MS,
+    VAD_ZCR_MAX,
+)
+
+PcmLike = Union[bytes, bytearray, memoryview]
+
+# loud frames count as speech even with a high zero-crossing rate (fricatives)
+LOUD_EXTRA_DB = 12.0
+
+
+# per-frame energy (dBFS) and zero-crossing rate for mono 16-bit PCM
+def frame_features(pcm: PcmLike, frame_len: int) -> tuple[np.ndarray, np.ndarray]:
+    samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    n_frames = samples.shape[0] // frame_len
+    if n_frames == 0:
+        return np.empty(0), np.empty(0)
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+    energy_db = 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_len - 1)
+    return energy_db, zcr
+
+
+def speech_flags(
+    energy_db: np.ndarray,
+    zcr: np.ndarray,
+    threshold_db: float,
+    zcr_max: float = VAD_ZCR_MAX,
+) -> np.ndarray:
+    return (energy_db >= threshold_db + LOUD_EXTRA_DB) | (
+        (energy_db >= threshold_db) & (zcr <= zcr_max)
+    )
+
+
+# realtime gate: forward speech with pre-roll and hangover, drop silence
+class VadGate:
+    def __init__(
+        self,
+        sample_rate: int,
+        threshold_db: float = VAD_THRESHOLD_DB,
+        margin_db: float = VAD_MARGIN_DB,
+        hangover_ms: int = VAD_HANGOVER_MS,
+        preroll_ms: int = VAD_PREROLL_MS,
+        frame_ms: int = VAD_FRAME_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = max(2, sample_rate * frame_ms // 1000)
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.hangover_ms = hangover_ms
+        self.preroll_ms = preroll_ms
+
+        # adaptive noise floor (dBFS), tracked on non-speech frames
+        self.noise_floor_db = threshold_db - margin_db
+
+        self._open = False
+        self._hangover_left = 0.0
+        self._preroll: deque[bytes] = deque()
+        self._preroll_ms = 0.0
+
+        # counters
+        self.frames_in = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.sent_ms = 0.0
+        self.dropped_ms = 0.0
+
+    def _chunk_ms(self, pcm: PcmLike) -> float:
+        return len(pcm) / 2 * 1000 / self.sample_rate
+
+    def _is_speech(self, pcm: PcmLike) -> bool:
+        energy_db, zcr = frame_features(pcm, min(self.frame_len, max(2, len(pcm) // 2)))
+        if energy_db.size == 0:
+            return False
+
+        threshold = max(self.threshold_db, self.noise_floor_db + self.margin_db)
+        flags = speech_flags(energy_db, zcr, threshold)
+
+        quiet = energy_db[~flags]
+        if quiet.size:
+            self.noise_floor_db = min(
+                VAD_NOISE_FLOOR_MAX_DB,
+                0.95 * self.noise_floor_db + 0.05 * float(quiet.mean()),
+            )
+        return bool(flags.any())
+
+    # returns the chunks to send upstream (possibly empty)
+    def process(self, pcm_chunk: bytes) -> list[bytes]:
+        if not pcm_chunk:
+            return []
+
+        self.frames_in += 1
+        chunk_ms = self._chunk_ms(pcm_chunk)
+
+        if self._is_speech(pcm_chunk):
+            self._hangover_left = self.hangover_ms
+            if not self._open:
+                self._open = True
+                out = list(self._preroll) + [pcm_chunk]
+                self._preroll.clear()
+                self._preroll_ms = 0.0
+                self.frames_sent += len(out)
+                self.sent_ms += sum(self._chunk_ms(c) for c in out)
+                # pre-roll chunks were counted as dropped when they were held back
+                self.frames_dropped -= len(out) - 1
+                self.dropped_ms -= sum(self._chunk_ms(c) for c in out[:-1])
+                return out
+        elif self._open:
+            self._hangover_left -= chunk_ms
+            if self._hangover_left <= 0:
+                self._open = False
+
+        if self._open:
+            self.frames_sent += 1
+            self.sent_ms += chunk_ms
+            return [pcm_chunk]
+
+        # closed: hold the chunk as pre-roll for the next speech onset
+        self._preroll.append(pcm_chunk)
+        self._preroll_ms += chunk_ms
+        while self._preroll and self._preroll_ms - self._chunk_ms(self._preroll[0]) >= self.preroll_ms:
+            self._preroll_ms -= self._chunk_ms(self._preroll.popleft())
+        self.frames_dropped += 1
+        self.dropped_ms += chunk_ms
+        return []
+
+    def stats(self) -> dict:
+        return {
+            "open": self._open,
+            "noise_floor_db": round(self.noise_floor_db, 1),
+            "frames_in": self.frames_in,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "drop_rate": round(self.frames_dropped / self.frames_in, 3) if self.frames_in else 0.0,
+            "sent_ms": int(self.sent_ms),
+            "dropped_ms": int(self.dropped_ms),
+        }
+
+
+# legacy trimmer: cut leading/trailing silence (keeps pad_ms around speech)
+# returns (trimmed view, trimmed head ms, trimmed tail ms); empty view when there is no speech
+def trim_silence(
+    pcm: PcmLike,
+    sample_rate: int,
+    threshold_db: float = VAD_THRESHOLD_DB,
+    margin_db: float = VAD_MARGIN_DB,
+    pad_ms: int = VAD_TRIM_PAD_MS,
+    frame_ms: int = VAD_FRAME_MS,
+) -> tuple[memoryview, int, int]:
+    view = memoryview(pcm).cast("B")
+    total = len(view) - (len(view) % 2)
+    frame_len = max(2, sample_rate * frame_ms // 1000)
+
+    energy_db, zcr = frame_features(view[:total], frame_len)
+    if energy_db.size == 0:
+        return view[:total], 0, 0
+
+    noise_floor_db = min(VAD_NOISE_FLOOR_MAX_DB, float(np.percentile(energy_db, 10)))
+    flags = speech_flags(energy_db, zcr, max(threshold_db, noise_floor_db + margin_db))
+    speech = np.flatnonzero(flags)
+    total_ms = int(total / 2 * 1000 / sample_rate)
+    if speech.size == 0:
+        return view[:0], total_ms, 0
+
+    pad = int(np.ceil(pad_ms / frame_ms))
+    first = max(0, int(speech[0]) - pad)
+    last = int(speech[-1]) + 1 + pad
+
+    start = first * frame_len * 2
+    end = total if last >= energy_db.size else min(total, last * frame_len * 2)
+    head_ms = int(start / 2 * 1000 / sample_rate)
+    tail_ms = int((total - end) / 2 * 1000 / sample_rate)
+    return view[start:end], head_ms, tail_ms
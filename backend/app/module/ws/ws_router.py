@@ -1,7 +1,8 @@
 from fastapi import APIRouter, WebSocket
-from app.core.provider.endpoint import with_provider_ws
-from app.core.provider.login import with_login_ws
+from app.core.provider.endpoint import with_provider, with_provider_ws
+from app.core.provider.login import with_login, with_login_ws
 from app.core.provider.service import ServiceProvider
+from app.core.utils.response import success
 
 router = APIRouter()
 
@@ -10,3 +11,10 @@ router = APIRouter()
 @with_login_ws
 async def stt_ws(p: ServiceProvider, websocket: WebSocket):
     await p.ws_service.init_state(websocket)
+
+
+@router.get("/stats")
+@with_provider
+@with_login("admin")
+async def get_ws_stats(p: ServiceProvider):
+    return success(await p.ws_service.get_ws_stats())
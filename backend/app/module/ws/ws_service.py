@@ -10,8 +10,32 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.core.config.audio import (
+    DOWNLINK_CHUNK_BYTES,
+    DOWNLINK_MODE,
+    LEGACY_GREETING,
+    LEGACY_TTS_PIPELINE,
+    REALTIME_SAMPLE_RATE,
+    VAD_ENABLED,
+)
+from app.core.database.base import SessionPerCall, pool_stats
+from app.module.infra.admission import AdmissionRejected, admission
+from app.module.infra.chatbot_cache import chatbot_cache
+from app.module.infra.response_cache import response_cache
+from app.module.infra.circuit_breaker import CircuitOpen, breakers
 from app.module.infra.gpt_service import GPTService
+from app.module.infra.openai_clients import RESPONSE, STT, TTS, openai_clients
+from app.module.infra.request_policy import request_policy
+from app.module.infra.token_budget import estimate_stats
+from app.module.infra.tts_cache import tts_cache
+from app.module.infra.write_behind import write_behind
 from app.module.infra.gpt import RoleType, MessageType, LatencyType, EndedReasonType
+from app.module.ws.audio_utils import pack_audio_frame, split_pcm
+from app.module.ws.recording_buffer import RecordingBuffer
+from app.module.ws.resampler import StreamResampler
+from app.module.ws.tts_pipeline import SentenceSplitter, TtsPipeline
+from app.module.ws.upstream_sender import UpstreamSender
+from app.module.ws.vad import VadGate, trim_silence
 
 # socket connect status
 @dataclass
@@ -21,11 +45,20 @@ class ConnState:
     chatbot_id: Optional[int] = None
     log_id: Optional[int] = None
     sample_rate: int = 24000
-    audio_buffer: bytearray = field(default_factory=bytearray)
+    audio_buffer: RecordingBuffer = field(default_factory=RecordingBuffer)  # legacy only
     mode: str = "realtime"  # realtime / legacy
+    downlink: str = DOWNLINK_MODE  # buffered / stream
+    downlink_seq: int = 0
+    text_stream: bool = False  # chat: stream gpt_text deltas (partial: true)
+    tts_pipeline: bool = LEGACY_TTS_PIPELINE  # legacy: per-sentence concurrent TTS
 
     rt_ws: Optional[Any] = None
     rt_task: Optional[asyncio.Task] = None
+    upstream: Optional[UpstreamSender] = None
+    uplink_resampler: Optional[StreamResampler] = None    # client rate -> 24kHz
+    downlink_resampler: Optional[StreamResampler] = None  # 24kHz -> client rate
+    vad_gate: Optional[VadGate] = None  # realtime silence gate
+    vad_trimmed_ms: int = 0             # legacy silence trimmed before STT
 
     stt_model: Optional[str] = None
     tts_model: Optional[str] = None
@@ -34,6 +67,15 @@ class ConnState:
 
     stt_start: Optional[float] = None
     tts_start: Optional[float] = None
+    turn_start: Optional[float] = None
+    first_audio_ms: Optional[int] = None
+    tts_ttfb_ms: Optional[int] = None
+    tts_total_ms: Optional[int] = None
+    turn_audio_bytes: int = 0   # upstream counters at the end of the previous turn
+    turn_update_bytes: int = 0
+
+# active connections (session_id -> ConnState), for per-connection stats
+ACTIVE_CONNECTIONS: Dict[str, ConnState] = {}
 
 class WsService:
     def __init__(self, gpt_service: GPTService):
@@ -54,6 +96,243 @@ class WsService:
         except Exception as e:
             print(f"Error in send_json: {e}")
 
+    # common: upstream call rejected (admission control / open circuit); client may retry later
+    async def _send_busy(
+        self,
+        websocket: WebSocket,
+        state: ConnState,
+        e: AdmissionRejected | CircuitOpen,
+    ) -> None:
+        print(f"[{state.session_id}] busy: {e}")
+        payload: Dict[str, Any] = {"type": "busy", "operation": e.operation, "reason": e.reason}
+        if isinstance(e, CircuitOpen):
+            payload["retry_after_ms"] = e.retry_after_ms
+        await self._send_json(websocket, payload)
+
+    # common: send framed PCM chunk (stream downlink)
+    async def _send_audio_frame(
+        self,
+        websocket: WebSocket,
+        state: ConnState,
+        payload: bytes = b"",
+        end: bool = False,
+    ) -> None:
+        frame = pack_audio_frame(state.downlink_seq, payload, end=end)
+        state.downlink_seq += 1
+        await websocket.send_bytes(frame)
+
+    # common: time-to-first-audio of the current turn (legacy sequential / pipelined)
+    def _mark_first_audio(self, state: ConnState, path: str) -> None:
+        if state.turn_start is None:
+            return
+        state.first_audio_ms, state.turn_start = self._finish_latency(state.turn_start)
+        print(f"[{state.session_id}] first audio {state.first_audio_ms}ms ({path})")
+
+    # common: stream TTS as framed PCM chunks + end marker (legacy stream downlink)
+    async def _stream_tts(
+        self,
+        websocket: WebSocket,
+        state: ConnState,
+        text: str,
+    ) -> int:
+        meta: Dict[str, Any] = {}
+        try:
+            async for chunk in self.gpt_service.openai_tts_stream(
+                text,
+                tts_model=state.tts_model,
+                response_format="pcm",
+                chunk_size=DOWNLINK_CHUNK_BYTES,
+                meta=meta,
+            ):
+                self._mark_first_audio(state, "sequential")
+                await self._send_audio_frame(websocket, state, chunk)
+        except (AdmissionRejected, CircuitOpen) as e:
+            await self._send_busy(websocket, state, e)
+        except Exception as e:
+            print(f"Error in openai_tts_stream: {e}")
+
+        try:
+            await self._send_audio_frame(websocket, state, end=True)
+        except Exception as e:
+            print(f"Error in send_bytes: {e}")
+
+        state.tts_ttfb_ms = meta.get("ttfb_ms")
+        state.tts_total_ms = meta.get("total_ms")
+        print(
+            f"[{state.session_id}] tts ttfb {state.tts_ttfb_ms}ms "
+            f"total {state.tts_total_ms}ms{' (cached)' if meta.get('cached') else ''}"
+        )
+        return meta.get("tokens", 0)
+
+    # common: chatbot greeting as text + audio in the connection's downlink format
+    async def _send_greeting(self, websocket: WebSocket, state: ConnState) -> None:
+        config = await chatbot_cache.get(state.chatbot_id)
+        text = ((config.greeting_message if config else None) or "").strip()
+        if not text:
+            return
+
+        payload = {"type": "gpt_text", "text": text, "greeting": True}
+        if state.downlink == "stream":
+            await self._send_json(websocket, payload)
+            await self._stream_tts(websocket, state, text)
+            return
+
+        try:
+            audio, _ = await self.gpt_service.openai_tts(text, tts_model=state.tts_model)
+            if audio:
+                await websocket.send_bytes(audio)
+        except (AdmissionRejected, CircuitOpen) as e:
+            await self._send_busy(websocket, state, e)
+        except Exception as e:
+            print(f"Error in send greeting: {e}")
+        await self._send_json(websocket, payload)
+
+    # common: stream chat response deltas as partial gpt_text frames
+    async def _stream_chat_response(
+        self,
+        websocket: WebSocket,
+        state: ConnState,
+        user_text: str,
+    ) -> tuple[str, int, int]:
+        meta: Dict[str, Any] = {}
+        async for delta in self.gpt_service.openai_response_stream(
+            session_id=state.session_id,
+            text=user_text,
+            gpt_model=state.response_model,
+            meta=meta,
+        ):
+            await self._send_json(
+                websocket,
+                {"type": "gpt_text", "text": delta, "partial": True},
+            )
+
+        print(
+            f"[{state.session_id}] chat first token {meta.get('first_token_ms')}ms "
+            f"total {meta.get('total_ms')}ms"
+        )
+        return (
+            meta.get("text", ""),
+            meta.get("input_tokens", 0),
+            meta.get("output_tokens", 0),
+        )
+
+    # legacy: stream the reply, synthesize each sentence as soon as it completes
+    # (bounded parallelism) and send the audio strictly in sentence order
+    async def _pipelined_voice_response(
+        self,
+        websocket: WebSocket,
+        state: ConnState,
+        user_text: str,
+    ) -> tuple[str, int, int]:
+        stream = state.downlink == "stream"
+
+        busy_sent = False
+
+        async def synthesize(sentence: str) -> tuple[bytes, int]:
+            nonlocal busy_sent
+            try:
+                return await self.gpt_service.openai_tts(
+                    sentence,
+                    tts_model=state.tts_model,
+                    response_format="pcm" if stream else "mp3",
+                )
+            except (AdmissionRejected, CircuitOpen) as e:
+                # the sentence is skipped; tell the client once per turn
+                if not busy_sent:
+                    busy_sent = True
+                    await self._send_busy(websocket, state, e)
+                return b"", 0
+
+        async def emit(audio: bytes) -> None:
+            self._mark_first_audio(state, "pipelined")
+            if stream:
+                for chunk in split_pcm(audio, DOWNLINK_CHUNK_BYTES):
+                    await self._send_audio_frame(websocket, state, chunk)
+            else:
+                # one MP3 per sentence, queued by the client
+                await websocket.send_bytes(audio)
+
+        splitter = SentenceSplitter()
+        pipeline = TtsPipeline(synthesize, emit)
+        meta: Dict[str, Any] = {}
+        gpt_text = ""
+        finished = False
+        try:
+            async for delta in self.gpt_service.openai_response_stream(
+                session_id=state.session_id,
+                text=user_text,
+                gpt_model=state.response_model,
+                meta=meta,
+            ):
+                if state.text_stream:
+                    await self._send_json(
+                        websocket,
+                        {"type": "gpt_text", "text": delta, "partial": True},
+                    )
+                for sentence in splitter.feed(delta):
+                    pipeline.submit(sentence)
+            for sentence in splitter.flush():
+                pipeline.submit(sentence)
+
+            gpt_text = (meta.get("text") or "").strip()
+            if gpt_text:
+                final_payload: Dict[str, Any] = {"type": "gpt_text", "text": gpt_text}
+                if state.text_stream:
+                    final_payload["partial"] = False
+                await self._send_json(websocket, final_payload)
+
+            await pipeline.finish()
+            finished = True
+        except (AdmissionRejected, CircuitOpen) as e:
+            await self._send_busy(websocket, state, e)
+            gpt_text = ""
+        except Exception as e:
+            print(f"Error in tts pipeline: {e}")
+            gpt_text = ""
+        finally:
+            if not finished:
+                await pipeline.cancel()
+
+        if stream:
+            try:
+                await self._send_audio_frame(websocket, state, end=True)
+            except Exception as e:
+                print(f"Error in send_bytes: {e}")
+
+        print(
+            f"[{state.session_id}] tts pipeline: first token {meta.get('first_token_ms')}ms "
+            f"{pipeline.stats()}"
+        )
+        response_tokens = meta.get("input_tokens", 0) + meta.get("output_tokens", 0)
+        return gpt_text, response_tokens, pipeline.tokens
+
+    # realtime: bytes sent upstream this turn (audio appends + session.update)
+    def _log_turn_upstream(self, state: ConnState) -> None:
+        audio_bytes = state.upstream.sent_bytes if state.upstream else 0
+        update_bytes = self.gpt_service.realtime_context_stats(state.session_id).get("bytes_sent", 0)
+        print(
+            f"[{state.session_id}] turn upstream: audio {audio_bytes - state.turn_audio_bytes}B, "
+            f"session.update {update_bytes - state.turn_update_bytes}B"
+        )
+        state.turn_audio_bytes = audio_bytes
+        state.turn_update_bytes = update_bytes
+
+    # common: stop upstream sender (drain queued audio unless flush=False)
+    @staticmethod
+    async def _close_upstream(state: ConnState, flush: bool = True) -> None:
+        upstream, state.upstream = state.upstream, None
+        if not upstream:
+            return
+        await upstream.close(flush=flush)
+        print(f"[{state.session_id}] upstream stats: {upstream.stats()}")
+
+    # common: VAD report (realtime gate / legacy trim)
+    @staticmethod
+    def _vad_stats(state: ConnState) -> Dict[str, Any]:
+        if state.vad_gate:
+            return state.vad_gate.stats()
+        return {"trimmed_ms": state.vad_trimmed_ms}
+
     # common: extract delta text
     @staticmethod
     def _extract_delta_text(delta: Any) -> str:
@@ -70,6 +349,10 @@ class WsService:
 
         # set user id
         state.user_id = websocket.user_id
+        # per-user admission limits (anonymous connections are limited per connection)
+        self.gpt_service.admission_key = (
+            state.user_id if state.user_id is not None else f"ws:{id(websocket)}"
+        )
 
         try:
             while True:
@@ -82,7 +365,9 @@ class WsService:
 
                     # binary frame (audio)
                     if isinstance(data, (bytes, bytearray)):
-                        await self.handle_binary_frame(data, state)
+                        should_break = await self.handle_binary_frame(data, state)
+                        if should_break:
+                            break
                         continue
 
                     # text frame (json)
@@ -110,7 +395,22 @@ class WsService:
                 except Exception as e:
                     print(f"Error in update_log: {e}")
         finally:
+            try:
+                await self._close_upstream(state, flush=False)
+            except Exception as e:
+                print(f"Error in close upstream: {e}")
+            # abrupt disconnect: close the realtime socket too (frees its admission slot)
+            if state.rt_task:
+                state.rt_task.cancel()
             if state.session_id:
+                try:
+                    await self.gpt_service.close_realtime_socket(state.session_id)
+                except Exception as e:
+                    print(f"Error in close_realtime_socket: {e}")
+            state.audio_buffer.close()
+            if state.session_id:
+                ACTIVE_CONNECTIONS.pop(state.session_id, None)
+                print(f"[{state.session_id}] vad stats: {self._vad_stats(state)}")
                 try:
                     await self.gpt_service.clear_session(state.session_id)
                 except Exception as e:
@@ -123,19 +423,32 @@ class WsService:
     # ===================================
     # Binary frame processing (audio chunk)
     # ===================================
-    async def handle_binary_frame(self, binary_data: bytes, state: ConnState) -> None:
+    async def handle_binary_frame(self, binary_data: bytes, state: ConnState) -> bool:
         if not state.session_id:
-            return
+            return False
 
-        # always buffer for STT in legacy mode
-        state.audio_buffer.extend(binary_data)
+        # legacy mode: buffer for STT (bounded, spills to disk when long)
+        if getattr(state, "mode", "realtime") != "realtime":
+            state.audio_buffer.extend(binary_data)
+            return False
 
-        # send to OpenAI Realtime API only in realtime mode
-        if getattr(state, "mode", "realtime") == "realtime":
-            try:
-                await self.gpt_service.realtime_send_pcm(state.session_id, binary_data)
-            except Exception as e:
-                print(f"Error in realtime_send_pcm: {e}")
+        # realtime mode: resample to 24kHz if needed
+        if state.uplink_resampler:
+            binary_data = state.uplink_resampler.process(binary_data)
+
+        # drop silence locally (pre-roll + hangover kept around speech)
+        chunks = state.vad_gate.process(binary_data) if state.vad_gate else [binary_data]
+
+        # hand off to upstream sender (never awaits upstream I/O)
+        for chunk in chunks:
+            if state.upstream and not state.upstream.put(chunk):
+                print(
+                    f"[{state.session_id}] upstream queue overflow, disconnecting: "
+                    f"{state.upstream.stats()}"
+                )
+                return True
+
+        return False
 
     # ===================================
     # Text event routing
@@ -189,17 +502,51 @@ class WsService:
         mode = payload.get("mode", "realtime")
         state.mode = mode
 
+        # legacy recording buffer sized for the client sampleRate
+        state.audio_buffer.close()
+        state.audio_buffer = RecordingBuffer(sample_rate=state.sample_rate)
+
+        # realtime: resample between client sampleRate and the 24kHz Realtime format
+        if mode == "realtime" and state.sample_rate != REALTIME_SAMPLE_RATE:
+            state.uplink_resampler = StreamResampler(state.sample_rate, REALTIME_SAMPLE_RATE)
+            state.downlink_resampler = StreamResampler(REALTIME_SAMPLE_RATE, state.sample_rate)
+        else:
+            state.uplink_resampler = None
+            state.downlink_resampler = None
+
+        state.vad_gate = (
+            VadGate(REALTIME_SAMPLE_RATE) if mode == "realtime" and VAD_ENABLED else None
+        )
+
+        # audio downlink sent from frontend (buffered / stream)
+        downlink = payload.get("downlink")
+        if downlink in ("buffered", "stream"):
+            state.downlink = downlink
+
+        # chat text streaming opt-in
+        state.text_stream = bool(payload.get("text_stream", state.text_stream))
+
+        # legacy per-sentence TTS pipeline (server default, client may override)
+        state.tts_pipeline = bool(payload.get("tts_pipeline", state.tts_pipeline))
+
         chatbot_id = payload.get("chatbot_id") or 1
         state.chatbot_id = chatbot_id
 
+        # legacy: upstream already failing, tell the client now instead of on its first turn
+        # (realtime fails fast in create_realtime_socket below)
+        if mode != "realtime":
+            for operation, retry_after_ms in breakers.open_operations([STT, RESPONSE, TTS]).items():
+                await self._send_busy(websocket, state, CircuitOpen(operation, retry_after_ms))
+
         if state.session_id:
+            ACTIVE_CONNECTIONS[state.session_id] = state
+
             try:
                 # set session storage and base instruction
                 await self.gpt_service.get_or_create_session_storage(state.session_id)
                 await self.gpt_service.build_instruction(state.session_id, chatbot_id)
 
-                # TODO get_current_models에서 get_chatbot_setting으로 수정
-                current_models = await self.gpt_service.get_current_models()
+                current_models = await self.gpt_service.get_current_models(chatbot_id)
 
                 if mode == "realtime":
                     # store ConnState
@@ -235,6 +582,10 @@ class WsService:
                     f"Error in get_or_create_session_storage / create_or_get_log: {e}"
                 )
 
+            # legacy: greeting played when the client asks for it (audio pre-rendered when the chatbot was saved)
+            if mode != "realtime" and payload.get("greeting", LEGACY_GREETING):
+                await self._send_greeting(websocket, state)
+
             if mode == "realtime":
                 # create realtime WebSocket and start receive loop
                 try:
@@ -244,6 +595,12 @@ class WsService:
                         stt_model=state.stt_model,
                     )
                     state.rt_ws = rt_ws
+                    if state.upstream is None:
+                        state.upstream = UpstreamSender(
+                            state.session_id,
+                            self.gpt_service.realtime_send_pcm,
+                        )
+                        state.upstream.start()
                     state.rt_task = asyncio.create_task(
                         self._realtime_receive_loop(
                             state.session_id,
@@ -253,11 +610,26 @@ class WsService:
                         )
                     )
                     print(f"[{state.session_id}] Realtime mode started")
+                except (AdmissionRejected, CircuitOpen) as e:
+                    await self._send_busy(websocket, state, e)
                 except Exception as e:
                     print(f"Error in create_realtime_socket: {e}")
 
         return False
 
+    # (key, answer) from the response cache; lookup errors only skip the cache
+    async def _cached_response(self, state: ConnState, user_text: str) -> tuple[Any, Optional[str]]:
+        try:
+            cache_key, cached = await self.gpt_service.cached_response(
+                state.session_id, user_text, state.response_model
+            )
+        except Exception as e:
+            print(f"Error in cached_response: {e}")
+            return None, None
+        if cached is not None:
+            print(f"[{state.session_id}] response cache hit")
+        return cache_key, cached
+
     # ===================================
     # chat event: send chat to GPT (+ save log/message/history)
     # ===================================
@@ -278,6 +650,9 @@ class WsService:
         if not user_text:
             return False
 
+        # first question of a session: exact-match answer cache (checked before history grows)
+        cache_key, cached = await self._cached_response(state, user_text)
+
         # 메시지 저장 (USER)
         if state.log_id is not None:
             try:
@@ -301,16 +676,29 @@ class WsService:
         except Exception as e:
             print(f"Error in append_history (chat user): {e}")
 
-        # 2) GPT 응답
+        # 2) GPT 응답 (stream: partial deltas first, then one final frame)
         response_start = time.monotonic()
+        stream = bool(payload.get("stream", state.text_stream))
 
         try:
-            gpt_text, input_tokens, output_tokens = await self.gpt_service.openai_response(
-                session_id=state.session_id,
-                text=user_text,
-                gpt_model=state.response_model,
-            )
+            if cached is not None:
+                gpt_text = cached
+            elif stream:
+                gpt_text, input_tokens, output_tokens = await self._stream_chat_response(
+                    websocket, state, user_text
+                )
+            else:
+                gpt_text, input_tokens, output_tokens = await self.gpt_service.openai_response(
+                    session_id=state.session_id,
+                    text=user_text,
+                    gpt_model=state.response_model,
+                )
             gpt_text = (gpt_text or "").strip()
+            if cached is None:
+                self.gpt_service.store_response(cache_key, gpt_text)
+        except (AdmissionRejected, CircuitOpen) as e:
+            await self._send_busy(websocket, state, e)
+            gpt_text = ""
         except Exception as e:
             print(f"Error in openai_response (chat): {e}")
             gpt_text = ""
@@ -318,10 +706,10 @@ class WsService:
         gpt_latency_ms = int((time.monotonic() - response_start) * 1000)
 
         if gpt_text:
-            await self._send_json(
-                websocket,
-                {"type": "gpt_text", "text": gpt_text},
-            )
+            final_payload: Dict[str, Any] = {"type": "gpt_text", "text": gpt_text}
+            if stream:
+                final_payload["partial"] = False
+            await self._send_json(websocket, final_payload)
 
             if state.log_id is not None:
                 try:
@@ -369,22 +757,43 @@ class WsService:
         if not state.session_id:
             return False
 
-        # pcm bytes (record entire)
-        pcm_bytes = bytes(state.audio_buffer)
+        # pcm view (record entire, leading/trailing silence trimmed, no copy)
+        pcm_view = state.audio_buffer.view()
+        speech_view = pcm_view
+        if VAD_ENABLED:
+            speech_view, head_ms, tail_ms = trim_silence(pcm_view, state.sample_rate)
+            state.vad_trimmed_ms += head_ms + tail_ms
+        if state.audio_buffer.truncated:
+            print(
+                f"[{state.session_id}] recording truncated: "
+                f"{state.audio_buffer.stats()}"
+            )
 
         # call STT
+        busy: Optional[AdmissionRejected | CircuitOpen] = None
         state.stt_start = time.monotonic()
         try:
             user_text, stt_tokens = await self.gpt_service.openai_stt(
-                pcm_bytes,
+                speech_view,
                 sample_rate=state.sample_rate,
                 stt_model=state.stt_model,
             )
             user_text = (user_text or "").strip()
             state.stt_tokens = stt_tokens
+        except (AdmissionRejected, CircuitOpen) as e:
+            busy = e
         except Exception as e:
             print(f"Error in openai_stt: {e}")
             user_text = ""
+        finally:
+            speech_view.release()
+            pcm_view.release()
+
+        if busy:
+            state.stt_start = None
+            state.audio_buffer.clear()
+            await self._send_busy(websocket, state, busy)
+            return False
 
         stt_latency_ms, state.stt_start = self._finish_latency(state.stt_start)
 
@@ -396,7 +805,7 @@ class WsService:
 
         # if user message is empty, exit here
         if not user_text:
-            state.audio_buffer = bytearray()
+            state.audio_buffer.clear()
             return False
 
         if state.log_id is not None:
@@ -413,35 +822,66 @@ class WsService:
             except Exception as e:
                 print(f"Error in create_message: {e}")
 
-        # GPT response
+        # GPT response (+ TTS); a cached answer goes straight to TTS (sequential path)
+        cache_key, cached = await self._cached_response(state, user_text)
+        pipelined = state.tts_pipeline and cached is None
         state.tts_start = time.monotonic()
-        try:
-            gpt_text, input_tokens, output_tokens = await self.gpt_service.openai_response(
-                session_id=state.session_id,
-                text=user_text,
-                gpt_model=state.response_model,
+        state.turn_start = state.tts_start
+        state.first_audio_ms = None
+        if cached is not None:
+            gpt_text = cached
+            state.response_tokens = 0
+        elif pipelined:
+            gpt_text, response_tokens, tts_tokens = await self._pipelined_voice_response(
+                websocket, state, user_text
             )
-            response_tokens = input_tokens + output_tokens
             state.response_tokens = response_tokens
-        except Exception as e:
-            print(f"Error in openai_response: {e}")
-            gpt_text = ""
-
-        if gpt_text:
-            # call TTS + send audio
+            self.gpt_service.store_response(cache_key, gpt_text)
+        else:
             try:
-                tts_bytes, tts_tokens = await self.gpt_service.openai_tts(gpt_text, tts_model=state.tts_model)
-                if tts_bytes:
-                    await websocket.send_bytes(tts_bytes)
+                gpt_text, input_tokens, output_tokens = await self.gpt_service.openai_response(
+                    session_id=state.session_id,
+                    text=user_text,
+                    gpt_model=state.response_model,
+                )
+                response_tokens = input_tokens + output_tokens
+                state.response_tokens = response_tokens
+                self.gpt_service.store_response(cache_key, (gpt_text or "").strip())
+            except (AdmissionRejected, CircuitOpen) as e:
+                await self._send_busy(websocket, state, e)
+                gpt_text = ""
             except Exception as e:
-                print(f"Error in send_bytes: {e}")
+                print(f"Error in openai_response: {e}")
+                gpt_text = ""
+
+        # sequential: TTS over the whole reply (the pipeline has already sent text and audio)
+        if gpt_text and not pipelined:
+            if state.downlink == "stream":
+                # send GPT text to client, then stream TTS audio as it arrives
+                await self._send_json(
+                    websocket,
+                    {"type": "gpt_text", "text": gpt_text},
+                )
+                tts_tokens = await self._stream_tts(websocket, state, gpt_text)
+            else:
+                # call TTS + send audio
+                try:
+                    tts_bytes, tts_tokens = await self.gpt_service.openai_tts(gpt_text, tts_model=state.tts_model)
+                    if tts_bytes:
+                        self._mark_first_audio(state, "sequential")
+                        await websocket.send_bytes(tts_bytes)
+                except (AdmissionRejected, CircuitOpen) as e:
+                    await self._send_busy(websocket, state, e)
+                except Exception as e:
+                    print(f"Error in send_bytes: {e}")
 
-            # send GPT text to client
-            await self._send_json(
-                websocket,
-                {"type": "gpt_text", "text": gpt_text},
-            )
+                # send GPT text to client
+                await self._send_json(
+                    websocket,
+                    {"type": "gpt_text", "text": gpt_text},
+                )
 
+        if gpt_text:
             tts_latency_ms, state.tts_start = self._finish_latency(state.tts_start)
 
             if state.log_id is not None:
@@ -474,7 +914,8 @@ class WsService:
             print(f"Error in append_history: {e}")
 
         # initialize audio buffer
-        state.audio_buffer = bytearray()
+        state.audio_buffer.clear()
+        state.turn_start = None
         return False
 
     # ===================================
@@ -546,14 +987,10 @@ class WsService:
                             await self.gpt_service.append_history(
                                 session_id, user_text, role="user"
                             )
-                            await self.gpt_service.update_realtime_instruction(
-                                session_id
-                            )
+                            # session.update only if base/summary changed (debounced)
+                            self.gpt_service.schedule_realtime_update(session_id)
                         except Exception as e:
-                            print(
-                                "Error in append_history / update_realtime_instruction: "
-                                f"{e}"
-                            )
+                            print(f"Error in append_history: {e}")
                         if state.log_id is not None:
                             try:
                                 await self.gpt_service.create_message(
@@ -598,31 +1035,77 @@ class WsService:
                             await self.gpt_service.append_history(
                                 session_id, gpt_text, role="assistant"
                             )
-                            await self.gpt_service.update_realtime_instruction(
-                                session_id
-                            )
+                            # session.update only if base/summary changed (debounced)
+                            self.gpt_service.schedule_realtime_update(session_id)
                         except Exception as e:
-                            print(
-                                "Error in append_history / update_realtime_instruction: "
-                                f"{e}"
-                            )
+                            print(f"Error in append_history: {e}")
 
                     gpt_text_buffer = ""
 
-                # 5. audio delta → buffer
+                # 5. user speech stopped / response created → first audio latency start
+                elif event_type == "input_audio_buffer.speech_stopped":
+                    state.turn_start = time.monotonic()
+
+                elif event_type == "response.created":
+                    if state.turn_start is None:
+                        state.turn_start = time.monotonic()
+
+                # 6. audio delta → stream as framed chunks, or buffer until done
                 elif event_type == "response.output_audio.delta":
                     delta = event.get("delta") or ""
                     if delta:
                         if state.tts_start is None:
                             state.tts_start = time.monotonic()
                         try:
-                            audio_buffer.extend(base64.b64decode(delta))
+                            pcm = base64.b64decode(delta)
                         except Exception as e:
                             print(f"Error in audio delta decode: {e}")
+                            continue
+
+                        if state.downlink_resampler:
+                            pcm = state.downlink_resampler.process(pcm)
 
-                # 6. audio completed → send to frontend
+                        if state.downlink == "stream":
+                            if state.turn_start is not None:
+                                state.first_audio_ms, state.turn_start = self._finish_latency(
+                                    state.turn_start
+                                )
+                                print(
+                                    f"[{session_id}] first audio {state.first_audio_ms}ms"
+                                )
+                            try:
+                                for chunk in split_pcm(pcm, DOWNLINK_CHUNK_BYTES):
+                                    await self._send_audio_frame(frontend_ws, state, chunk)
+                            except Exception as e:
+                                print(f"Error in send_bytes: {e}")
+                        else:
+                            audio_buffer.extend(pcm)
+
+                # 7. audio completed → send to frontend (buffered) / end marker (stream)
                 elif event_type == "response.output_audio.done":
-                    if audio_buffer:
+                    tail = b""
+                    if state.downlink_resampler:
+                        tail = state.downlink_resampler.flush()
+
+                    if state.downlink == "stream":
+                        try:
+                            for chunk in split_pcm(tail, DOWNLINK_CHUNK_BYTES):
+                                await self._send_audio_frame(frontend_ws, state, chunk)
+                            await self._send_audio_frame(frontend_ws, state, end=True)
+                        except Exception as e:
+                            print(f"Error in send_bytes: {e}")
+
+                        tts_latency_ms, state.tts_start = self._finish_latency(
+                            state.tts_start
+                        )
+
+                    elif audio_buffer or tail:
+                        audio_buffer.extend(tail)
+                        if state.turn_start is not None:
+                            state.first_audio_ms, state.turn_start = self._finish_latency(
+                                state.turn_start
+                            )
+                            print(f"[{session_id}] first audio {state.first_audio_ms}ms")
                         try:
                             await frontend_ws.send_bytes(bytes(audio_buffer))
                         except Exception as e:
@@ -633,7 +1116,7 @@ class WsService:
                             state.tts_start
                         )
 
-                # 7. calculate tokens
+                # 8. calculate tokens
                 elif event_type == "response.done":
                     response_obj = event.get("response") or {}
                     usage = response_obj.get("usage") or {}
@@ -652,7 +1135,9 @@ class WsService:
                         except Exception as e:
                             print(f"Error in create_message: {e}")
                     tts_latency_ms = None
+                    state.turn_start = None
                     gpt_text = ""
+                    self._log_turn_upstream(state)
 
         except Exception as e:
             print(f"Error in realtime_receive_loop: {e}")
@@ -662,6 +1147,54 @@ class WsService:
             except Exception as e:
                 print(f"Error in close_realtime_socket: {e}")
 
+    # ===================================
+    # per-connection stats (admin)
+    # ===================================
+    async def get_ws_stats(self) -> Dict[str, Any]:
+        connections = []
+        for session_id, state in list(ACTIVE_CONNECTIONS.items()):
+            connections.append(
+                {
+                    "session_id": session_id,
+                    "user_id": state.user_id,
+                    "mode": state.mode,
+                    "upstream": state.upstream.stats() if state.upstream else None,
+                    "recording": state.audio_buffer.stats(),
+                    "vad": self._vad_stats(state),
+                    "realtime_context": self.gpt_service.realtime_context_stats(session_id),
+                }
+            )
+        return {
+            "active_connections": len(connections),
+            "recording_memory_bytes": sum(
+                c["recording"]["memory_bytes"] for c in connections
+            ),
+            "write_behind": write_behind.stats(),
+            "session_store": self.gpt_service.session_store.stats(),
+            "token_estimates": estimate_stats(),
+            "chatbot_cache": chatbot_cache.stats(),
+            "openai": openai_clients.stats(),
+            "admission": admission.stats(),
+            "request_policy": request_policy.stats(),
+            "circuits": breakers.stats(),
+            "response_cache": response_cache.stats(),
+            "tts_cache": tts_cache.stats(),
+            "db": self._db_stats(len(connections)),
+            "connections": connections,
+        }
+
+    # pooled DB connections held per active call (sessions are per operation, so ~0 while idle)
+    @staticmethod
+    def _db_stats(active_calls: int) -> Dict[str, Any]:
+        pool = pool_stats()
+        return {
+            "pool": pool,
+            "sessions": SessionPerCall.stats(),
+            "connections_per_call": (
+                round(pool["checked_out"] / active_calls, 3) if active_calls else 0.0
+            ),
+        }
+
     # ===================================
     # disconnect processing
     # ===================================
@@ -676,7 +1209,12 @@ class WsService:
             except Exception as e:
                 print(f"Error in clear_session: {e}")
 
-            # realtime ws close
+            # flush queued audio, then realtime ws close
+            try:
+                await self._close_upstream(state)
+            except Exception as e:
+                print(f"Error in close upstream: {e}")
+
             try:
                 if state.rt_ws:
                     state.rt_task.cancel()
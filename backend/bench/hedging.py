@@ -0,0 +1,48 @@
+# bench/hedging.py
+# turn latency of a simulated upstream call with a slow tail: plain vs hedged (RequestPolicy)
+# usage (from backend/): python -m bench.hedging [calls] [tail share]
+import asyncio
+import random
+import sys
+import time
+
+from app.module.infra.request_policy import RequestPolicy
+
+BASE_MS = 400       # typical STT / response latency
+JITTER_MS = 150
+TAIL_MS = 3000      # a slow upstream call (queueing, retry, slow replica)
+
+
+async def run(policy: RequestPolicy, calls: int, tail_share: float) -> tuple[list[float], dict]:
+    async def call() -> None:
+        slow = random.random() < tail_share
+        await asyncio.sleep((TAIL_MS if slow else BASE_MS + random.random() * JITTER_MS) / 1000)
+
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await policy.execute("stt", "bench", call, deadline_ms=10_000)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies, policy.stats()["models"]["stt:bench"]
+
+
+def pct(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tail_share = float(sys.argv[2]) if len(sys.argv) > 2 else 0.03
+    print(f"{calls} calls, {tail_share:.0%} slow ({TAIL_MS}ms)")
+    for label, hedge in (("plain", False), ("hedged", True)):
+        random.seed(7)
+        latencies, stats = await run(RequestPolicy(hedge_enabled=hedge), calls, tail_share)
+        print(
+            f"  {label:>6}: p50 {pct(latencies, 0.5):6.0f}ms  p95 {pct(latencies, 0.95):6.0f}ms  "
+            f"p99 {pct(latencies, 0.99):6.0f}ms  extra calls {stats['extra_cost_ratio']:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
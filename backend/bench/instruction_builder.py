@@ -0,0 +1,79 @@
+# bench/instruction_builder.py
+# per-call cost of the full instruction: full rebuild every call vs incremental PromptBuilder
+# each turn appends one message and builds the instruction (realtime: twice per turn)
+# usage (from backend/): python -m bench.instruction_builder [history lengths ...]
+import asyncio
+import sys
+import time
+
+from app.core.config.session import CONTEXT_TOKEN_BUDGETS
+from app.module.infra import gpt_service
+from app.module.infra.gpt_service import GPTService
+from app.module.infra.session_store import MemorySessionStore
+
+INSTRUCTION = "[지침]\n" + "고객 상담 챗봇입니다. 친절하게 답해주세요. " * 100
+SUMMARIES = ["이전 대화 요약: 고객이 배송 일정과 환불 규정을 문의함. " * 10]
+BENCH_MODEL = "bench"
+MESSAGE = "배송은 보통 얼마나 걸리나요? 주문한 지 이틀 됐는데 아직 출발을 안 했어요."
+
+
+# previous build_full_instruction body (without the summarize step)
+def full_rebuild(storage: dict) -> str:
+    summaries = storage["summary"]
+    history = storage["history"]
+    summary_block = ""
+    if summaries:
+        summary_block = "\n\n[Previous summaries]\n" + "\n".join(f"- {s}" for s in summaries)
+    history_block = ""
+    lines = GPTService._history_to_lines(history)
+    if lines:
+        history_block = "\n\n[Recent history]\n" + "\n".join(lines)
+    return storage["instruction"] + summary_block + history_block
+
+
+async def measure(history_len: int, calls_per_turn: int = 2) -> tuple[float, float]:
+    store = MemorySessionStore()
+    service = GPTService(None, store=store)
+    session_id = f"bench-{history_len}"
+    await store.set_instruction(session_id, INSTRUCTION)
+    for summary in SUMMARIES:
+        await store.commit_summary(session_id, summary, 0)
+    for i in range(history_len - 1):
+        await store.append_history(session_id, {"role": "user" if i % 2 else "assistant", "content": MESSAGE})
+    await service.build_full_instruction(session_id, model=BENCH_MODEL)
+
+    rounds = 200
+    full_total = incr_total = 0.0
+    for _ in range(rounds):
+        # one new message this turn, then drop it so the history length stays fixed
+        await store.append_history(session_id, {"role": "user", "content": MESSAGE})
+        for _ in range(calls_per_turn):
+            start = time.perf_counter()
+            expected = full_rebuild(await store.snapshot(session_id))
+            full_total += time.perf_counter() - start
+
+            start = time.perf_counter()
+            text = await service.build_full_instruction(session_id, model=BENCH_MODEL)
+            incr_total += time.perf_counter() - start
+            assert text == expected
+        store._sessions[session_id].data["history"].pop()
+        service._invalidate_prompt(session_id)
+        await service.build_full_instruction(session_id, model=BENCH_MODEL)
+
+    calls = rounds * calls_per_turn
+    return full_total / calls * 1e6, incr_total / calls * 1e6
+
+
+async def main() -> None:
+    # measure long histories as-is (no trimming, no summarization, which would call OpenAI)
+    CONTEXT_TOKEN_BUDGETS[BENCH_MODEL] = 10**9
+    gpt_service.HISTORY_SUMMARIZE_SHARE = float("inf")
+    lengths = [int(a) for a in sys.argv[1:]] or [1, 10, 30, 100, 300]
+    print("history  full rebuild   incremental   (us per build, 2 builds per turn)")
+    for n in lengths:
+        full_us, incr_us = await measure(n)
+        print(f"{n:7d}  {full_us:12.1f}  {incr_us:12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+# bench/resampler.py
+# StreamResampler throughput in chunks/s on one core
+# usage (from backend/): python -m bench.resampler [chunk_ms] [seconds]
+import sys
+import time
+
+import numpy as np
+
+from app.module.ws.resampler import StreamResampler
+
+PAIRS = [(48000, 24000), (44100, 24000), (16000, 24000), (24000, 48000), (24000, 44100)]
+
+
+def main() -> None:
+    chunk_ms = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    print(f"{chunk_ms}ms chunks, {seconds}s per pair")
+    for in_rate, out_rate in PAIRS:
+        samples = in_rate * chunk_ms // 1000
+        rng = np.random.default_rng(0)
+        chunk = rng.integers(-8000, 8000, samples, dtype=np.int16).tobytes()
+
+        resampler = StreamResampler(in_rate, out_rate)
+        resampler.process(chunk)  # warm up work buffers
+
+        chunks = 0
+        start = time.perf_counter()
+        cpu = time.process_time()
+        while time.perf_counter() - start < seconds:
+            for _ in range(100):
+                resampler.process(chunk)
+            chunks += 100
+        cpu = time.process_time() - cpu
+
+        rate = chunks / cpu
+        print(
+            f"{in_rate:>6} -> {out_rate:<6} taps/phase {resampler.taps:>3}: "
+            f"{rate:10.0f} chunks/s/core ({rate * chunk_ms / 1000:8.0f}x realtime)"
+        )
+
+
+if __name__ == "__main__":
+    main()
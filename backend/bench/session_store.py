@@ -0,0 +1,64 @@
+# bench/session_store.py
+# per-operation latency of the session store backends (memory / redis)
+# redis uses REDIS_HOST/REDIS_PORT/REDIS_DB and is skipped when unreachable
+# usage (from backend/): python -m bench.session_store [iterations]
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+from app.module.infra.session_store import MemorySessionStore, RedisSessionStore, SessionStore
+
+HISTORY_LEN = 30
+MESSAGE = {"role": "user", "content": "배송은 보통 얼마나 걸리나요? 주문한 지 이틀 됐어요."}
+INSTRUCTION = "[지침]\n" + "고객 상담 챗봇입니다. " * 50
+
+
+async def timed(samples: dict, name: str, coro) -> None:
+    start = time.perf_counter()
+    await coro
+    samples.setdefault(name, []).append((time.perf_counter() - start) * 1e6)
+
+
+async def run(store: SessionStore, iterations: int) -> dict:
+    samples: dict = {}
+    for _ in range(iterations):
+        session_id = f"bench-{uuid.uuid4()}"
+        await timed(samples, "ensure", store.ensure(session_id))
+        await timed(samples, "set_instruction", store.set_instruction(session_id, INSTRUCTION))
+        for _ in range(HISTORY_LEN):
+            await timed(samples, "append_history", store.append_history(session_id, MESSAGE))
+        await timed(samples, "snapshot", store.snapshot(session_id))
+        await timed(samples, "commit_summary", store.commit_summary(session_id, "요약", HISTORY_LEN))
+        await timed(samples, "clear", store.clear(session_id))
+    return samples
+
+
+def report(label: str, samples: dict) -> None:
+    print(label)
+    for name, values in samples.items():
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(
+            f"  {name:>15}: p50 {statistics.median(values):8.1f} us, "
+            f"p99 {p99:8.1f} us ({len(values)} ops)"
+        )
+
+
+async def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    report("memory", await run(MemorySessionStore(), iterations))
+
+    store = RedisSessionStore()
+    try:
+        await store.client.ping()
+    except Exception as e:
+        print(f"redis: skipped ({e})")
+        return
+    report("redis", await run(store, iterations))
+    await store.client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+# bench/tts_pipeline.py
+# legacy voice turn: time-to-first-audio, sequential (whole reply -> one TTS) vs sentence pipeline
+# upstream latency is simulated: streamed reply at a fixed char rate, TTS = fixed ttfb + per-char time
+# usage (from backend/): python -m bench.tts_pipeline [parallelism ...]
+import asyncio
+import sys
+import time
+
+from app.module.ws.tts_pipeline import SentenceSplitter, TtsPipeline
+
+REPLY = (
+    "안녕하세요, 무엇을 도와드릴까요? 문의하신 상품은 현재 재고가 있습니다. "
+    "주문은 홈페이지나 앱에서 바로 하실 수 있어요. 배송은 보통 이틀 정도 걸립니다. "
+    "다른 궁금한 점이 있으시면 언제든지 말씀해 주세요."
+)
+CHARS_PER_SEC = 150       # streamed reply speed
+DELTA_CHARS = 4           # chars per response delta
+TTS_TTFB_SEC = 0.35       # per TTS request
+TTS_SEC_PER_CHAR = 0.004  # synthesis time per char
+
+
+async def response_stream():
+    for i in range(0, len(REPLY), DELTA_CHARS):
+        await asyncio.sleep(DELTA_CHARS / CHARS_PER_SEC)
+        yield REPLY[i:i + DELTA_CHARS]
+
+
+async def synthesize(text: str) -> tuple[bytes, int]:
+    await asyncio.sleep(TTS_TTFB_SEC + TTS_SEC_PER_CHAR * len(text))
+    return text.encode(), 0
+
+
+async def sequential() -> tuple[float, float]:
+    start = time.perf_counter()
+    text = "".join([d async for d in response_stream()])
+    await synthesize(text)
+    first = time.perf_counter() - start
+    return first, first
+
+
+async def pipelined(parallelism: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    first: list[float] = []
+
+    async def emit(audio: bytes) -> None:
+        if not first:
+            first.append(time.perf_counter() - start)
+
+    splitter = SentenceSplitter()
+    pipeline = TtsPipeline(synthesize, emit, parallelism=parallelism)
+    async for delta in response_stream():
+        for sentence in splitter.feed(delta):
+            pipeline.submit(sentence)
+    for sentence in splitter.flush():
+        pipeline.submit(sentence)
+    await pipeline.finish()
+    return first[0], time.perf_counter() - start
+
+
+async def main() -> None:
+    levels = [int(a) for a in sys.argv[1:]] or [1, 2, 3, 4]
+    first, total = await sequential()
+    print(f"{len(REPLY)} chars reply")
+    print(f"  sequential   : first audio {first * 1000:6.0f} ms, all audio {total * 1000:6.0f} ms")
+    for n in levels:
+        first, total = await pipelined(n)
+        print(f"  pipelined x{n:<2}: first audio {first * 1000:6.0f} ms, all audio {total * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
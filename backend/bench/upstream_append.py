@@ -0,0 +1,87 @@
+# bench/upstream_append.py
+# input_audio_buffer.append messages / CPU per connection, per-frame vs windowed upstream
+# upstream is a loopback websocket server in a child process, so CPU includes websocket framing
+# usage (from backend/): python -m bench.upstream_append [frame_ms] [seconds]
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+import websockets
+
+from app.core.config.audio import REALTIME_SAMPLE_RATE, UPSTREAM_WINDOW_MS
+from app.module.infra.gpt_service import GPTService
+from app.module.ws.upstream_sender import UpstreamSender
+
+SESSION_ID = "bench"
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def serve_sink() -> None:
+    async def sink(ws):
+        count = 0
+        async for message in ws:
+            if message == "stats":
+                await ws.send(str(count))
+                count = 0
+            else:
+                count += 1
+
+    async def main():
+        async with websockets.serve(sink, HOST, PORT, max_size=None):
+            await asyncio.Future()
+
+    asyncio.run(main())
+
+
+async def run_per_frame(service: GPTService, frames: list[bytes]) -> None:
+    for frame in frames:
+        await service.realtime_send_pcm(SESSION_ID, frame)
+        await asyncio.sleep(0)
+
+
+async def run_windowed(service: GPTService, frames: list[bytes]) -> None:
+    sender = UpstreamSender(SESSION_ID, service.realtime_send_pcm, maxsize=len(frames) + 1)
+    sender.start()
+    for frame in frames:
+        sender.put(frame)
+        await asyncio.sleep(0)
+    await sender.close()
+
+
+async def main() -> None:
+    frame_ms = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    frame_bytes = REALTIME_SAMPLE_RATE * 2 * frame_ms // 1000
+    frames = [os.urandom(frame_bytes) for _ in range(seconds * 1000 // frame_ms)]
+
+    print(f"{seconds}s of audio, {frame_ms}ms frames, window {UPSTREAM_WINDOW_MS}ms")
+    for label, runner in (("per-frame", run_per_frame), ("windowed", run_windowed)):
+        async with websockets.connect(f"ws://{HOST}:{PORT}", max_size=None) as ws:
+            service = GPTService(None)
+            service._rt_sockets[SESSION_ID] = ws
+
+            cpu = time.process_time()
+            await runner(service, frames)
+            cpu = time.process_time() - cpu
+
+            await ws.send("stats")
+            messages = int(await ws.recv())
+
+        print(
+            f"{label:>10}: {messages / seconds:7.1f} msg/s, "
+            f"{cpu * 1000 / seconds:7.3f} ms CPU per audio-second"
+        )
+
+
+if __name__ == "__main__":
+    server = multiprocessing.Process(target=serve_sink, daemon=True)
+    server.start()
+    time.sleep(1.0)
+    try:
+        asyncio.run(main())
+    finally:
+        server.terminate()
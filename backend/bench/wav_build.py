@@ -0,0 +1,66 @@
+# bench/wav_build.py
+# legacy STT payload: temp-file WAV (write + reopen + read) vs in-memory WAV from a buffer view
+# usage (from backend/): python -m bench.wav_build [seconds ...]
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.module.ws.audio_utils import build_wav, convert_pcm_to_wav
+
+SAMPLE_RATE = 24000
+
+
+async def tempfile_wav(recording: bytearray) -> int:
+    # previous path: bytes(state.audio_buffer) -> WAV file -> reopen and read for upload
+    pcm_bytes = bytes(recording)
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        path = tmp.name
+    try:
+        await convert_pcm_to_wav(path, pcm_bytes, SAMPLE_RATE)
+        with open(path, "rb") as f:
+            return len(f.read())
+    finally:
+        os.remove(path)
+
+
+async def memory_wav(recording: bytearray) -> int:
+    view = memoryview(recording)
+    try:
+        return len(build_wav(view, SAMPLE_RATE).getbuffer())
+    finally:
+        view.release()
+
+
+async def measure(fn, recording: bytearray, repeat: int) -> tuple[float, int]:
+    await fn(recording)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await fn(recording)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    await fn(recording)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def main() -> None:
+    durations = [float(a) for a in sys.argv[1:]] or [5.0, 30.0, 120.0]
+    for seconds in durations:
+        recording = bytearray(os.urandom(int(SAMPLE_RATE * seconds) * 2))
+        repeat = max(5, int(200 / seconds))
+        print(f"{seconds:g}s recording ({len(recording) / 1024:.0f} KiB)")
+        for label, fn in (("tempfile", tempfile_wav), ("in-memory", memory_wav)):
+            elapsed, peak = await measure(fn, recording, repeat)
+            print(
+                f"  {label:>9}: {elapsed * 1000:8.3f} ms/call, "
+                f"peak alloc {peak / len(recording):4.2f}x recording"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+# bench/ws_db_sessions.py
+# concurrent voice calls vs a small pool: one session held per call (old get_provider_ws)
+# vs one short session per repository call (SessionPerCall)
+# each simulated call: 1 query at connect, then per turn ~think_ms idle (audio) + 1 query
+# needs the configured MySQL (DATABASE_URL); uses its own engine so the pool size is fixed here
+# usage (from backend/): python -m bench.ws_db_sessions [calls ...]
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config.settings import DATABASE_URL
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 0
+POOL_TIMEOUT_SEC = 2
+TURNS = 5
+THINK_MS = 300
+
+
+class PingRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ping(self) -> None:
+        await self.db.execute(text("SELECT 1"))
+
+
+async def call_held(session_factory) -> None:
+    async with session_factory() as db:
+        repo = PingRepository(db)
+        await repo.ping()
+        for _ in range(TURNS):
+            await asyncio.sleep(THINK_MS / 1000)
+            # reads (chatbot detail, existing log) open a transaction that pins the
+            # connection to the session until the next commit
+            await repo.ping()
+        await db.commit()
+
+
+async def call_per_op(session_factory) -> None:
+    async def ping() -> None:
+        async with session_factory() as db:
+            await PingRepository(db).ping()
+
+    await ping()
+    for _ in range(TURNS):
+        await asyncio.sleep(THINK_MS / 1000)
+        await ping()
+
+
+async def run(label: str, call, calls: int) -> None:
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT_SEC,
+    )
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession)
+    peak = 0
+
+    async def sample() -> None:
+        nonlocal peak
+        while True:
+            peak = max(peak, engine.pool.checkedout())
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(call(session_factory) for _ in range(calls)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    await engine.dispose()
+
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    print(
+        f"  {label:>7}: {calls - failed}/{calls} calls ok, {elapsed:5.2f}s, "
+        f"peak checked out {peak}, per call {peak / calls:.2f}"
+    )
+
+
+async def main() -> None:
+    levels = [int(a) for a in sys.argv[1:]] or [POOL_SIZE, 4 * POOL_SIZE, 20 * POOL_SIZE]
+    print(f"pool_size={POOL_SIZE} max_overflow={MAX_OVERFLOW} timeout={POOL_TIMEOUT_SEC}s")
+    for calls in levels:
+        print(f"{calls} concurrent calls")
+        await run("held", call_held, calls)
+        await run("per-op", call_per_op, calls)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,261 @@
+# tests/resp_stub.py
+# in-process RESP2 server with the subset of Redis the session store uses
+# (hash / list commands, EXPIRE / TTL, EXISTS / DEL, WATCH / MULTI / EXEC)
+from __future__ import annotations
+
+import asyncio
+import time
+
+from typing import Any, Optional
+
+
+# simple-string reply (+OK), distinct from bulk strings that happen to start with "+"
+class _Status(str):
+    pass
+
+
+# null array reply (aborted EXEC)
+class _Nil:
+    pass
+
+
+OK = _Status("OK")
+QUEUED = _Status("QUEUED")
+
+
+class RespStub:
+    def __init__(self):
+        self.data: dict[str, Any] = {}          # key -> dict (hash) / list
+        self.expires: dict[str, float] = {}     # key -> monotonic deadline
+        self.versions: dict[str, int] = {}      # key -> write counter (WATCH)
+        self.commands: list[str] = []
+        # command name -> callback run once before it (another client's write in between)
+        self.before: dict[str, Any] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port = 0
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ---------- keyspace ----------
+    def _live(self, key: str) -> bool:
+        deadline = self.expires.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self._delete(key)
+        return key in self.data
+
+    def _delete(self, key: str) -> bool:
+        self.expires.pop(key, None)
+        if self.data.pop(key, None) is None:
+            return False
+        self._touch(key)
+        return True
+
+    def _touch(self, key: str) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def _hash(self, key: str, create: bool = False) -> Optional[dict]:
+        if self._live(key):
+            return self.data[key]
+        if create:
+            self.data[key] = {}
+            return self.data[key]
+        return None
+
+    def _list(self, key: str, create: bool = False) -> Optional[list]:
+        if self._live(key):
+            return self.data[key]
+        if create:
+            self.data[key] = []
+            return self.data[key]
+        return None
+
+    def _drop_empty(self, key: str) -> None:
+        if key in self.data and not self.data[key]:
+            self._delete(key)
+
+    def ttl(self, key: str) -> int:
+        if not self._live(key):
+            return -2
+        deadline = self.expires.get(key)
+        return -1 if deadline is None else max(0, round(deadline - time.monotonic()))
+
+    def keys(self) -> list[str]:
+        return sorted(key for key in list(self.data) if self._live(key))
+
+    # ---------- commands ----------
+    def execute(self, name: str, args: list[str]) -> Any:
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            raise ValueError(f"unknown command '{name}'")
+        return handler(*args)
+
+    def cmd_ping(self, *args):
+        return _Status("PONG")
+
+    def cmd_client(self, *args):
+        return OK
+
+    def cmd_select(self, *args):
+        return OK
+
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._live(key))
+
+    def cmd_del(self, *keys):
+        return sum(1 for key in keys if self._delete(key))
+
+    def cmd_expire(self, key, seconds):
+        if not self._live(key):
+            return 0
+        self.expires[key] = time.monotonic() + int(seconds)
+        return 1
+
+    def cmd_ttl(self, key):
+        return self.ttl(key)
+
+    def cmd_hset(self, key, *pairs):
+        fields = self._hash(key, create=True)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in fields
+            fields[field] = value
+        self._touch(key)
+        return added
+
+    def cmd_hsetnx(self, key, field, value):
+        fields = self._hash(key, create=True)
+        if field in fields:
+            return 0
+        fields[field] = value
+        self._touch(key)
+        return 1
+
+    def cmd_hgetall(self, key):
+        fields = self._hash(key) or {}
+        return [item for pair in fields.items() for item in pair]
+
+    def cmd_rpush(self, key, *values):
+        items = self._list(key, create=True)
+        items.extend(values)
+        self._touch(key)
+        return len(items)
+
+    def cmd_lpush(self, key, *values):
+        items = self._list(key, create=True)
+        for value in values:
+            items.insert(0, value)
+        self._touch(key)
+        return len(items)
+
+    def cmd_llen(self, key):
+        return len(self._list(key) or [])
+
+    @staticmethod
+    def _range(length: int, start: int, stop: int) -> tuple[int, int]:
+        start = max(0, start + length if start < 0 else start)
+        stop = stop + length if stop < 0 else min(stop, length - 1)
+        return start, stop
+
+    def cmd_lrange(self, key, start, stop):
+        items = self._list(key) or []
+        start, stop = self._range(len(items), int(start), int(stop))
+        return items[start:stop + 1]
+
+    def cmd_ltrim(self, key, start, stop):
+        items = self._list(key)
+        if items is not None:
+            start, stop = self._range(len(items), int(start), int(stop))
+            items[:] = items[start:stop + 1]
+            self._touch(key)
+            self._drop_empty(key)
+        return OK
+
+    # ---------- connection ----------
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        watched: dict[str, int] = {}
+        queued: Optional[list[tuple[str, list[str]]]] = None
+        try:
+            while True:
+                command = await self._read_command(reader)
+                if command is None:
+                    break
+                name, args = command[0].upper(), command[1:]
+                self.commands.append(name)
+                hook = self.before.pop(name, None)
+                if hook is not None:
+                    hook()
+
+                if name == "WATCH":
+                    watched.update({key: self.versions.get(key, 0) for key in args})
+                    reply: Any = OK
+                elif name == "UNWATCH":
+                    watched.clear()
+                    reply = OK
+                elif name == "MULTI":
+                    queued = []
+                    reply = OK
+                elif name == "DISCARD":
+                    queued, reply = None, OK
+                    watched.clear()
+                elif name == "EXEC":
+                    aborted = any(self.versions.get(key, 0) != v for key, v in watched.items())
+                    if aborted or queued is None:
+                        reply = _Nil()
+                    else:
+                        reply = [self._safe(n, a) for n, a in queued]
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append((name, args))
+                    reply = QUEUED
+                else:
+                    reply = self._safe(name, args)
+
+                writer.write(self._encode(reply))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _safe(self, name: str, args: list[str]) -> Any:
+        try:
+            return self.execute(name, args)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[list[str]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        count = int(line[1:])
+        parts = []
+        for _ in range(count):
+            length = int((await reader.readline())[1:])
+            parts.append((await reader.readexactly(length + 2))[:-2].decode("utf-8"))
+        return parts
+
+    def _encode(self, value: Any) -> bytes:
+        if isinstance(value, _Nil):
+            return b"*-1\r\n"
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return f"-ERR {value}\r\n".encode()
+        if isinstance(value, int):
+            return f":{value}\r\n".encode()
+        if isinstance(value, _Status):
+            return f"+{value}\r\n".encode()
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+            return b"$%d\r\n%s\r\n" % (len(data), data)
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(self._encode(item) for item in value)
+        raise TypeError(f"cannot encode {value!r}")
@@ -0,0 +1,131 @@
+# tests/test_admission.py
+import asyncio
+
+import pytest
+
+from app.module.infra.admission import QUEUE_FULL, TIMEOUT, AdmissionRejected, _Gate
+
+pytestmark = pytest.mark.anyio
+
+WAIT_MS = 1000
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# a queued acquire, started and given the chance to reach the wait queue
+async def queued(gate: _Gate, user, max_wait_ms: int = WAIT_MS) -> asyncio.Task:
+    task = asyncio.create_task(gate.acquire(user, max_wait_ms))
+    await asyncio.sleep(0)
+    assert not task.done()
+    return task
+
+
+def assert_idle(gate: _Gate) -> None:
+    assert gate.in_flight == 0
+    assert gate._users == {}
+    assert len(gate._waiters) == 0
+
+
+async def test_waiters_are_granted_in_order():
+    gate = _Gate("stt", global_limit=1, per_user=1, queue_max=4)
+    await gate.acquire("a", WAIT_MS)
+    b = await queued(gate, "b")
+    c = await queued(gate, "c")
+
+    gate.release("a")
+    await b
+    assert not c.done()
+    assert gate._users == {"b": 1}
+
+    gate.release("b")
+    await c
+    gate.release("c")
+    assert_idle(gate)
+
+
+async def test_user_at_its_limit_does_not_block_others():
+    gate = _Gate("stt", global_limit=2, per_user=1, queue_max=4)
+    await gate.acquire("a", WAIT_MS)
+    await gate.acquire("b", WAIT_MS)
+    a2 = await queued(gate, "a")  # first in line, but "a" already has its one slot
+    c = await queued(gate, "c")
+
+    gate.release("b")
+    await c
+    assert not a2.done()
+    assert list(w.user for w in gate._waiters) == ["a"]
+
+    gate.release("a")
+    await a2
+    assert gate._users == {"a": 1, "c": 1}
+
+    gate.release("a")
+    gate.release("c")
+    assert_idle(gate)
+
+
+async def test_queue_full_is_rejected():
+    gate = _Gate("stt", global_limit=1, per_user=1, queue_max=1)
+    await gate.acquire("a", WAIT_MS)
+    b = await queued(gate, "b")
+
+    with pytest.raises(AdmissionRejected) as e:
+        await gate.acquire("c", WAIT_MS)
+    assert e.value.reason == QUEUE_FULL
+    assert gate.rejected == {QUEUE_FULL: 1, TIMEOUT: 0}
+
+    gate.release("a")
+    await b
+    gate.release("b")
+    assert_idle(gate)
+
+
+async def test_wait_times_out_without_taking_a_slot():
+    gate = _Gate("stt", global_limit=1, per_user=1, queue_max=1)
+    await gate.acquire("a", WAIT_MS)
+
+    with pytest.raises(AdmissionRejected) as e:
+        await gate.acquire("b", 20)
+    assert e.value.reason == TIMEOUT
+    assert gate.rejected == {QUEUE_FULL: 0, TIMEOUT: 1}
+    assert len(gate._waiters) == 0
+
+    gate.release("a")
+    assert_idle(gate)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    gate = _Gate("stt", global_limit=1, per_user=1, queue_max=2)
+    await gate.acquire("a", WAIT_MS)
+    b = await queued(gate, "b")
+
+    b.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await b
+    assert len(gate._waiters) == 0
+
+    gate.release("a")
+    assert_idle(gate)
+
+
+async def test_cancelled_after_grant_hands_the_slot_on():
+    gate = _Gate("stt", global_limit=1, per_user=1, queue_max=2)
+    await gate.acquire("a", WAIT_MS)
+    b = await queued(gate, "b")
+    c = await queued(gate, "c")
+
+    # the slot goes to "b", whose caller is cancelled before it resumes
+    gate.release("a")
+    assert gate._users == {"b": 1}
+    b.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await b
+
+    await c
+    assert gate._users == {"c": 1}
+    gate.release("c")
+    assert_idle(gate)
+    assert gate.admitted == 3
@@ -0,0 +1,198 @@
+# tests/test_circuit_breaker.py
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.module.infra.admission import AdmissionRejected
+from app.module.infra.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    is_failure,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(window=10, window_sec=60, min_calls=4, failure_ratio=0.5, open_ms=60_000, half_open_probes=2)
+    options.update(kwargs)
+    return CircuitBreaker("response", **options)
+
+
+def status_error(code: int) -> openai.APIStatusError:
+    response = httpx.Response(code, request=httpx.Request("POST", "https://api.openai.com/v1/responses"))
+    return openai.APIStatusError(f"status {code}", response=response, body=None)
+
+
+async def run(breaker: CircuitBreaker, error: BaseException | None = None, sleep: float = 0, **guard) -> None:
+    async with breaker.guard(**guard):
+        await asyncio.sleep(sleep)
+        if error is not None:
+            raise error
+
+
+async def breaker_wait(breaker: CircuitBreaker, event: asyncio.Event) -> None:
+    async with breaker.guard():
+        await event.wait()
+
+
+async def fail(breaker: CircuitBreaker, times: int = 1) -> None:
+    for _ in range(times):
+        with pytest.raises(RuntimeError):
+            await run(breaker, RuntimeError("upstream"))
+
+
+# open, then let the open period pass without sleeping through it
+async def half_open(breaker: CircuitBreaker) -> None:
+    await fail(breaker, breaker.min_calls)
+    assert breaker.state == OPEN
+    breaker._opened_at -= breaker.open_ms / 1000
+
+
+def test_is_failure_by_status():
+    assert is_failure(status_error(500))
+    assert is_failure(status_error(503))
+    assert is_failure(status_error(429))
+    assert not is_failure(status_error(400))
+    assert not is_failure(status_error(404))
+    assert not is_failure(AdmissionRejected("response", "queue_full"))
+    assert not is_failure(CircuitOpen("response", 100))
+    assert is_failure(RuntimeError("connection reset"))
+
+
+async def test_opens_on_failure_ratio_and_fails_fast():
+    breaker = make_breaker()
+    await run(breaker)
+    await run(breaker)
+    await fail(breaker)
+    assert breaker.state == CLOSED  # 1 of 3, below min_calls
+
+    await fail(breaker)
+    assert breaker.state == OPEN  # 2 of 4
+    with pytest.raises(CircuitOpen) as e:
+        await run(breaker)
+    assert e.value.retry_after_ms > 0
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+    assert breaker.stats()["rejected"] == 2
+
+
+async def test_client_errors_do_not_open():
+    breaker = make_breaker()
+    for _ in range(breaker.min_calls * 2):
+        with pytest.raises(openai.APIStatusError):
+            await run(breaker, status_error(400))
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+async def test_half_open_admits_limited_probes_then_closes():
+    breaker = make_breaker()
+    await half_open(breaker)
+
+    await run(breaker)
+    assert breaker.state == HALF_OPEN
+    assert breaker._probe_successes == 1
+
+    # one success and one probe in flight use up both probe slots
+    release = asyncio.Event()
+    second = asyncio.create_task(breaker_wait(breaker, release))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpen):
+        await run(breaker)
+
+    release.set()
+    await second
+    assert breaker.state == CLOSED
+    assert breaker._probes == 0
+    await run(breaker)
+
+
+async def test_failed_probe_reopens_and_late_probe_is_ignored():
+    breaker = make_breaker()
+    await half_open(breaker)
+    opened = breaker.opened
+
+    release = asyncio.Event()
+    slow_probe = asyncio.create_task(breaker_wait(breaker, release))
+    await asyncio.sleep(0)
+    await fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.opened == opened + 1
+
+    # the other probe succeeds after the circuit already reopened: no effect
+    release.set()
+    await slow_probe
+    assert breaker.state == OPEN
+    assert breaker._probes == 0
+    assert breaker._probe_successes == 0
+
+
+async def test_probe_without_verdict_frees_its_slot():
+    breaker = make_breaker(half_open_probes=1)
+    await half_open(breaker)
+
+    with pytest.raises(openai.APIStatusError):
+        await run(breaker, status_error(400))
+    assert breaker.state == HALF_OPEN
+    assert breaker._probes == 0
+
+    await run(breaker)
+    assert breaker.state == CLOSED
+
+
+async def test_cancelled_call_counts_only_when_already_slow():
+    breaker = make_breaker(slow_ms=20, min_calls=2)
+
+    fast = asyncio.create_task(run(breaker, sleep=10))
+    await asyncio.sleep(0)
+    fast.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await fast
+    assert breaker.slow == 0
+    assert len(breaker._outcomes) == 0
+
+    for _ in range(2):
+        slow = asyncio.create_task(run(breaker, sleep=10))
+        await asyncio.sleep(0.03)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+    assert breaker.slow == 2
+    assert breaker.state == OPEN
+
+
+async def test_cancelled_probe_frees_its_slot():
+    breaker = make_breaker(half_open_probes=1, slow_ms=1000)
+    await half_open(breaker)
+
+    probe = asyncio.create_task(run(breaker, sleep=10))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state == HALF_OPEN
+    assert breaker._probes == 0
+
+
+async def test_slow_success_counts_unless_latency_is_ignored():
+    breaker = make_breaker(slow_ms=20, min_calls=2)
+    await run(breaker, sleep=0.03, slow_ms=0)
+    await run(breaker, sleep=0.03, slow_ms=0)
+    assert breaker.slow == 0
+    assert breaker.state == CLOSED
+
+    await run(breaker, sleep=0.03)
+    await run(breaker, sleep=0.03)
+    assert breaker.slow == 2
+    assert breaker.state == OPEN
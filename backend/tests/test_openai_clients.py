@@ -0,0 +1,60 @@
+# tests/test_openai_clients.py
+import asyncio
+
+import pytest
+
+from app.module.infra.openai_clients import _Pool
+
+pytestmark = pytest.mark.anyio
+
+BODY = b"ok"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# minimal HTTP/1.1 keep-alive server: "ok" for every request
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(BODY), BODY))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.fixture
+async def url():
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    yield f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+    server.close()
+    await server.wait_closed()
+
+
+async def test_stats_count_reuse_and_requests_in_flight(url):
+    pool = _Pool("interactive", max_connections=4, max_keepalive=4)
+    try:
+        for _ in range(3):
+            assert (await pool.http.get(url)).content == BODY
+
+        async with pool.http.stream("GET", url) as response:
+            stats = pool.stats()
+            assert stats["in_flight"] == 1
+            assert stats["utilization"] == 0.25
+            await response.aread()
+
+        stats = pool.stats()
+        assert stats["requests"] == 4
+        assert stats["new_connections"] == 1
+        assert stats["reuse_rate"] == 0.75
+        assert stats["in_flight"] == 0
+        assert stats["peak_in_flight"] == 1
+    finally:
+        await pool.http.aclose()
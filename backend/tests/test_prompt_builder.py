@@ -0,0 +1,35 @@
+# tests/test_prompt_builder.py
+from app.module.infra.prompt_builder import HISTORY_HEADER, PromptBuilder
+
+
+def build(lines: int) -> PromptBuilder:
+    builder = PromptBuilder()
+    history = [{"role": "user", "content": f"message {n} " + "x" * 40} for n in range(lines)]
+    builder.rebuild({"instruction": "base", "summary": [], "history": history, "history_len": lines})
+    return builder
+
+
+def test_fit_leaves_oldest_lines_out_of_this_prompt_only():
+    builder = build(10)
+    full = builder.text
+
+    tight = builder.fit(builder.prefix_tokens + 30)
+    assert builder.trimmed > 0
+    assert "message 0 " not in tight and "message 9 " in tight
+    assert builder.prompt_tokens <= builder.prefix_tokens + 30
+
+    # the cached state still has every line: a larger budget gets them back
+    assert builder.text == full
+    assert builder.fit(10**6) == full
+    assert builder.trimmed == 0
+    assert builder.prompt_tokens == builder.tokens
+
+
+def test_fit_keeps_appending_after_a_trimmed_prompt():
+    builder = build(4)
+    builder.fit(builder.prefix_tokens)  # nothing but the prefix fits
+    assert builder.fit(builder.prefix_tokens) == builder.prefix
+
+    builder.extend([{"role": "assistant", "content": "late"}])
+    assert builder.text.startswith("base" + HISTORY_HEADER + "user: message 0")
+    assert builder.text.endswith("assistant: late")
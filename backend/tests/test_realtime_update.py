@@ -0,0 +1,63 @@
+# tests/test_realtime_update.py
+import asyncio
+
+import pytest
+
+from app.module.infra import gpt_service as gpt_module
+from app.module.infra.gpt_service import REALTIME_CONTEXTS, GPTService, RealtimeContext
+
+pytestmark = pytest.mark.anyio
+
+SID = "rt1"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# update_realtime_instruction stand-in: takes a while, records what it saw
+class SlowUpdates(GPTService):
+    def __init__(self):
+        super().__init__(gpt_repository=None)
+        self.version = 0
+        self.sent: list[int] = []
+        self.building = asyncio.Event()
+
+    async def update_realtime_instruction(self, session_id: str) -> int:
+        seen = self.version
+        self.building.set()
+        await asyncio.sleep(0.05)  # building the prompt / ws.send
+        if not self.sent or self.sent[-1] != seen:
+            self.sent.append(seen)
+        return 1
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(gpt_module, "REALTIME_UPDATE_DEBOUNCE_MS", 10)
+    REALTIME_CONTEXTS[SID] = RealtimeContext()
+    yield SlowUpdates()
+    REALTIME_CONTEXTS.pop(SID, None)
+
+
+async def test_changes_within_the_debounce_window_coalesce(service):
+    for _ in range(5):
+        service.version += 1
+        service.schedule_realtime_update(SID)
+    await REALTIME_CONTEXTS[SID].pending
+
+    assert service.sent == [5]
+
+
+async def test_change_during_an_update_is_sent_after_it(service):
+    service.version = 1
+    service.schedule_realtime_update(SID)
+    await service.building.wait()
+
+    # summary committed while the first update is being built / sent
+    service.version = 2
+    service.schedule_realtime_update(SID)
+    await REALTIME_CONTEXTS[SID].pending
+
+    assert service.sent == [1, 2]
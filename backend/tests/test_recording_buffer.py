@@ -0,0 +1,81 @@
+# tests/test_recording_buffer.py
+import pytest
+
+from app.module.ws.recording_buffer import RecordingBuffer
+from app.module.ws.vad import trim_silence
+
+RATE = 1000  # 2000 bytes per second
+
+
+def pcm(n: int, value: int = 1) -> bytes:
+    return bytes([value]) * n
+
+
+def test_recording_is_capped_at_max_seconds():
+    buffer = RecordingBuffer(sample_rate=RATE, max_sec=1, spill_threshold=10_000)
+    buffer.extend(pcm(1500, 1))
+    buffer.extend(pcm(1000, 2))
+
+    assert len(buffer) == 2000
+    assert buffer.truncated
+    assert buffer.dropped_bytes == 500
+    assert bytes(buffer.view()) == pcm(1500, 1) + pcm(500, 2)
+
+    buffer.extend(pcm(10))
+    assert len(buffer) == 2000
+    assert buffer.dropped_bytes == 510
+
+    buffer.clear()
+    assert not buffer.truncated
+    assert len(buffer) == 0
+
+
+def test_spills_to_a_temp_file_past_the_threshold():
+    buffer = RecordingBuffer(sample_rate=RATE, max_sec=10, spill_threshold=1000)
+    buffer.extend(pcm(600, 1))
+    assert not buffer.spilled
+    assert buffer.memory_bytes == 600
+
+    buffer.extend(pcm(600, 2))
+    assert buffer.spilled
+    assert buffer.spills == 1
+    assert buffer.memory_bytes == 0
+    assert len(buffer) == 1200
+
+    view = buffer.view()
+    assert bytes(view) == pcm(600, 1) + pcm(600, 2)
+    view.release()
+    buffer.close()
+
+
+def test_mmap_view_is_released_before_the_file_grows_or_closes():
+    buffer = RecordingBuffer(sample_rate=RATE, max_sec=10, spill_threshold=100)
+    buffer.extend(pcm(400, 1))
+    file = buffer._file
+
+    # same use as the legacy turn: view, derived views, release both
+    view = buffer.view()
+    speech, _, _ = trim_silence(view, RATE)
+    assert buffer._mmap is not None
+    speech.release()
+    view.release()
+
+    # the next chunk unmaps first; a new view covers the whole recording
+    buffer.extend(pcm(200, 2))
+    assert buffer._mmap is None
+    view = buffer.view()
+    assert bytes(view) == pcm(400, 1) + pcm(200, 2)
+    view.release()
+
+    buffer.close()
+    assert buffer._mmap is None
+    assert file.closed
+    assert not buffer.spilled
+    assert bytes(buffer.view()) == b""
+
+
+def test_view_is_read_only():
+    buffer = RecordingBuffer(sample_rate=RATE, max_sec=1, spill_threshold=10_000)
+    buffer.extend(pcm(4))
+    with pytest.raises(TypeError):
+        buffer.view()[0] = 0
@@ -0,0 +1,60 @@
+# tests/test_request_policy.py
+import asyncio
+
+import pytest
+
+from app.module.infra.request_policy import DeadlineExceeded, RequestPolicy
+
+pytestmark = pytest.mark.anyio
+
+OP = "stt"
+MODEL = "m"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def test_call_within_deadline_returns_result():
+    policy = RequestPolicy(hedge_enabled=False)
+
+    async def call():
+        return "ok"
+
+    assert await policy.execute(OP, MODEL, call, deadline_ms=1000) == "ok"
+    assert policy._stats_for(OP, MODEL).deadline_exceeded == 0
+
+
+async def test_slow_call_is_cancelled_at_the_deadline():
+    policy = RequestPolicy(hedge_enabled=False)
+    cancelled = asyncio.Event()
+
+    async def call():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(DeadlineExceeded):
+        await policy.execute(OP, MODEL, call, deadline_ms=20)
+
+    assert cancelled.is_set()
+    stats = policy._stats_for(OP, MODEL).stats()
+    assert stats["deadline_exceeded"] == 1
+    assert stats["errors"] == 0
+
+
+async def test_upstream_error_is_not_a_deadline():
+    policy = RequestPolicy(hedge_enabled=False)
+
+    async def call():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await policy.execute(OP, MODEL, call, deadline_ms=1000)
+
+    stats = policy._stats_for(OP, MODEL).stats()
+    assert stats["deadline_exceeded"] == 0
+    assert stats["errors"] == 1
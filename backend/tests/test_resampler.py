@@ -0,0 +1,83 @@
+# tests/test_resampler.py
+import numpy as np
+import pytest
+
+from app.module.ws.resampler import StreamResampler
+
+
+def noise(n: int, seed: int = 1) -> bytes:
+    rng = np.random.default_rng(seed)
+    return rng.integers(-12000, 12000, n, dtype=np.int16).tobytes()
+
+
+def tone(rate: int, seconds: float, freq: float = 1000.0) -> bytes:
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * freq * t) * 10000).astype(np.int16).tobytes()
+
+
+def samples(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+# odd sizes on purpose: chunks split samples in half
+def chunked(resampler: StreamResampler, pcm: bytes, sizes=(1, 7, 480, 3, 1999, 960)) -> bytes:
+    out, i, n = [], 0, 0
+    while i < len(pcm):
+        size = sizes[n % len(sizes)]
+        out.append(resampler.process(pcm[i: i + size]))
+        i += size
+        n += 1
+    return b"".join(out)
+
+
+@pytest.mark.parametrize("in_rate, out_rate", [(48000, 24000), (44100, 24000), (24000, 48000), (16000, 24000)])
+def test_chunked_input_matches_one_shot(in_rate, out_rate):
+    pcm = noise(in_rate // 2)
+    whole = StreamResampler(in_rate, out_rate)
+    streamed = StreamResampler(in_rate, out_rate)
+
+    assert chunked(streamed, pcm) == whole.process(pcm)
+    assert streamed.flush() == whole.flush()
+
+
+@pytest.mark.parametrize("in_rate, out_rate", [(48000, 24000), (44100, 24000), (24000, 48000)])
+def test_output_length_follows_the_ratio(in_rate, out_rate):
+    resampler = StreamResampler(in_rate, out_rate)
+    out = chunked(resampler, noise(in_rate))  # one second
+
+    assert len(samples(out)) == out_rate
+
+
+def test_flush_emits_the_tail_and_resets():
+    resampler = StreamResampler(48000, 24000)
+    pcm = tone(48000, 0.1)
+    first = resampler.process(pcm)
+    tail = resampler.flush()
+
+    # the filter delay (taps // 2 input samples) comes out on flush, then the state is clean
+    assert len(samples(tail)) == resampler.taps // 2 // 2
+    assert np.abs(samples(tail)).max() > 0
+    assert resampler.process(pcm) == first
+
+
+def test_tone_survives_resampling():
+    out = samples(StreamResampler(44100, 24000).process(tone(44100, 0.5)))
+    steady = out[200:-200].astype(np.float64)
+
+    spectrum = np.abs(np.fft.rfft(steady))
+    peak_hz = np.argmax(spectrum) * 24000 / len(steady)
+    assert abs(peak_hz - 1000) < 5
+    # amplitude 10000 -> rms ~7071
+    assert 6800 < np.sqrt(np.mean(steady ** 2)) < 7300
+
+
+def test_same_rate_is_passthrough():
+    resampler = StreamResampler(24000, 24000)
+    pcm = noise(100)
+    assert resampler.process(pcm) is pcm
+    assert resampler.flush() == b""
+
+
+def test_rejects_bad_rates():
+    with pytest.raises(ValueError):
+        StreamResampler(0, 24000)
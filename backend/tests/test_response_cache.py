@@ -0,0 +1,112 @@
+# tests/test_response_cache.py
+import pytest
+
+from app.module.infra import response_cache as cache_module
+from app.module.infra.response_cache import ResponseCache, normalize_question
+
+MODEL = "gpt-4o-mini"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def make_cache(**kwargs) -> ResponseCache:
+    options = dict(enabled=True, ttl_sec=60, max_entries=100, max_question_chars=200)
+    options.update(kwargs)
+    return ResponseCache(**options)
+
+
+def test_normalize_question_equivalence():
+    same = [
+        "영업시간이 어떻게 되나요?",
+        "  영업시간이   어떻게 되나요 ?? ",
+        "영업시간이 어떻게 되나요",
+        "영업시간이\n어떻게 되나요…",
+    ]
+    assert {normalize_question(text) for text in same} == {"영업시간이 어떻게 되나요"}
+
+    # full-width / case differences too
+    assert normalize_question("ＷＨＡＴ is Open?") == normalize_question("what is open")
+    # but not a different question
+    assert normalize_question("영업시간이 언제인가요?") != normalize_question("영업시간이 어떻게 되나요?")
+    assert normalize_question("?? ") == ""
+
+
+def test_key_covers_chatbot_version_and_model():
+    cache = make_cache()
+    key = cache.key(1, 3, MODEL, "Hello?")
+    assert key == (1, 3, MODEL, "hello")
+    assert cache.key(1, 4, MODEL, "Hello?") != key
+    assert cache.key(2, 3, MODEL, "Hello?") != key
+    assert cache.key(1, 3, "gpt-4o", "Hello?") != key
+
+    assert cache.key(1, 3, MODEL, "!!") is None
+    assert cache.key(1, 3, MODEL, "x" * 201) is None
+
+
+def test_hit_and_miss(clock):
+    cache = make_cache()
+    cache.put(cache.key(1, 1, MODEL, "hours?"), "9 to 6")
+
+    assert cache.get(cache.key(1, 1, MODEL, "Hours")) == "9 to 6"
+    assert cache.get(cache.key(1, 1, MODEL, "address?")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = make_cache(ttl_sec=60)
+    key = cache.key(1, 1, MODEL, "hours?")
+    cache.put(key, "9 to 6")
+
+    clock.now += 59
+    assert cache.get(key) == "9 to 6"
+    clock.now += 1
+    assert cache.get(key) is None
+    assert cache.expired == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = make_cache(max_entries=2)
+    a, b, c = (cache.key(1, 1, MODEL, q) for q in ("a", "b", "c"))
+    cache.put(a, "A")
+    cache.put(b, "B")
+    assert cache.get(a) == "A"  # b is now the oldest
+
+    cache.put(c, "C")
+    assert cache.get(b) is None
+    assert cache.get(a) == "A"
+    assert cache.get(c) == "C"
+    assert cache.evictions == 1
+
+
+def test_invalidate_drops_every_answer_of_the_chatbot(clock):
+    cache = make_cache()
+    for version in (1, 2):
+        for model in (MODEL, "gpt-4o"):
+            cache.put(cache.key(1, version, model, "hours"), "old")
+    other = cache.key(2, 1, MODEL, "hours")
+    cache.put(other, "kept")
+
+    cache.invalidate(1)
+    assert cache.stats()["entries"] == 1
+    assert cache.get(cache.key(1, 2, MODEL, "hours")) is None
+    assert cache.get(other) == "kept"
+
+
+def test_empty_answer_is_not_stored(clock):
+    cache = make_cache()
+    cache.put(cache.key(1, 1, MODEL, "hours"), "")
+    assert cache.stores == 0
@@ -0,0 +1,218 @@
+# tests/test_session_store.py
+# the same behaviour against both SessionStore backends (Redis through an in-process RESP stub)
+import secrets
+
+import pytest
+import redis.asyncio as aioredis
+
+from app.module.infra.session_store import MemorySessionStore, RedisSessionStore
+from tests.resp_stub import RespStub
+
+pytestmark = pytest.mark.anyio
+
+TTL = 60
+SID = "s1"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request):
+    if request.param == "memory":
+        store = MemorySessionStore(idle_ttl_sec=TTL, hibernate_after_sec=10 * TTL)
+        yield store
+        await store.close()
+        return
+
+    stub = RespStub()
+    port = await stub.start()
+    # the stub speaks RESP2 only
+    client = aioredis.Redis(host="127.0.0.1", port=port, decode_responses=True, protocol=2)
+    store = RedisSessionStore(client, ttl=TTL, prefix="test")
+    store.stub = stub
+    yield store
+    await store.close()
+    await stub.stop()
+
+
+def exists(store, session_id: str) -> bool:
+    if isinstance(store, MemorySessionStore):
+        return session_id in store._sessions
+    return any(key.startswith(f"test:{session_id}:") for key in store.stub.keys())
+
+
+# pretend `seconds` passed without any access, then let the backend expire what is due
+def age(store, session_id: str, seconds: float) -> None:
+    if isinstance(store, MemorySessionStore):
+        entry = store._sessions.get(session_id)
+        if entry is not None:
+            entry.last_access -= seconds
+        store.sweep()
+        return
+    for key in store._keys(session_id):
+        if key in store.stub.expires:
+            store.stub.expires[key] -= seconds
+
+
+def message(n: int) -> dict:
+    return {"role": "user" if n % 2 == 0 else "assistant", "content": f"m{n}"}
+
+
+async def test_ensure_creates_empty_session(store):
+    await store.ensure(SID)
+    assert exists(store, SID)
+    assert await store.snapshot(SID) == {
+        "instruction": "",
+        "history": [],
+        "history_len": 0,
+        "summary": [],
+        "vector_store_id": None,
+    }
+
+
+async def test_ensure_keeps_existing_state(store):
+    await store.ensure(SID)
+    await store.set_instruction(SID, "base")
+    await store.append_history(SID, message(0))
+    await store.ensure(SID)
+
+    snapshot = await store.snapshot(SID)
+    assert snapshot["instruction"] == "base"
+    assert snapshot["history"] == [message(0)]
+
+
+async def test_append_history_and_snapshot_from(store):
+    await store.ensure(SID)
+    for n in range(5):
+        await store.append_history(SID, message(n))
+
+    snapshot = await store.snapshot(SID)
+    assert snapshot["history"] == [message(n) for n in range(5)]
+    assert snapshot["history_len"] == 5
+
+    tail = await store.snapshot(SID, history_from=3)
+    assert tail["history"] == [message(3), message(4)]
+    assert tail["history_len"] == 5
+
+
+async def test_commit_summary_drops_consumed_history(store):
+    await store.ensure(SID)
+    for n in range(4):
+        await store.append_history(SID, message(n))
+
+    # two messages summarized; the ones appended meanwhile stay
+    await store.commit_summary(SID, "sum-a", 2)
+    snapshot = await store.snapshot(SID)
+    assert snapshot["summary"] == ["sum-a"]
+    assert snapshot["history"] == [message(2), message(3)]
+
+    await store.commit_summary(SID, "sum-b", 2)
+    snapshot = await store.snapshot(SID)
+    assert snapshot["summary"] == ["sum-a", "sum-b"]
+    assert snapshot["history"] == []
+    assert snapshot["history_len"] == 0
+
+
+async def test_compact_summaries_merges_oldest(store):
+    await store.ensure(SID)
+    for summary in ("a", "b", "c", "d"):
+        await store.commit_summary(SID, summary, 0)
+
+    await store.compact_summaries(SID, "abc", 3)
+    assert (await store.snapshot(SID))["summary"] == ["abc", "d"]
+
+
+async def test_clear_removes_session(store):
+    await store.ensure(SID)
+    await store.set_instruction(SID, "base")
+    await store.append_history(SID, message(0))
+    await store.commit_summary(SID, "sum", 0)
+
+    await store.clear(SID)
+    assert not exists(store, SID)
+
+
+async def test_summary_after_clear_does_not_recreate_session(store):
+    await store.ensure(SID)
+    await store.append_history(SID, message(0))
+    await store.commit_summary(SID, "sum", 0)
+    await store.clear(SID)
+
+    # background summarization finishing after clear_session
+    await store.commit_summary(SID, "late", 1)
+    await store.compact_summaries(SID, "late-merged", 1)
+    assert not exists(store, SID)
+
+
+async def test_writes_refresh_ttl(store):
+    await store.ensure(SID)
+    await store.append_history(SID, message(0))
+
+    age(store, SID, TTL - 5)
+    await store.append_history(SID, message(1))
+    age(store, SID, TTL - 5)
+    await store.commit_summary(SID, "sum", 1)
+    age(store, SID, TTL - 5)
+    await store.set_instruction(SID, "base")
+    age(store, SID, TTL - 5)
+    assert exists(store, SID)
+
+    snapshot = await store.snapshot(SID)
+    assert snapshot["instruction"] == "base"
+    assert snapshot["summary"] == ["sum"]
+    assert snapshot["history"] == [message(1)]
+
+
+async def test_idle_session_expires(store):
+    await store.ensure(SID)
+    await store.append_history(SID, message(0))
+
+    age(store, SID, TTL + 1)
+    assert not exists(store, SID)
+
+
+async def test_redis_clear_between_watch_and_exec(store):
+    if not isinstance(store, RedisSessionStore):
+        pytest.skip("redis only")
+    await store.ensure(SID)
+    await store.append_history(SID, message(0))
+
+    # another worker clears the session while the summary transaction is queued
+    store.stub.before["EXEC"] = lambda: store.stub.cmd_del(*store._keys(SID))
+    start = len(store.stub.commands)
+    await store.commit_summary(SID, "late", 1)
+
+    # EXEC aborted by WATCH, the retry sees no session and writes nothing
+    commands = store.stub.commands[start:]
+    assert commands.count("EXEC") == 1
+    assert commands.count("EXISTS") == 2
+    assert not exists(store, SID)
+
+
+async def test_memory_budget_never_drops_pinned_sessions():
+    store = MemorySessionStore(max_bytes=20_000, idle_ttl_sec=TTL)
+    await store.ensure("live")
+    store.pin("live")
+    await store.set_instruction("live", "base")
+    await store.append_history("live", {"role": "user", "content": "x" * 4000})
+
+    # other sessions push the store over budget (random text: hibernation alone is not enough)
+    for n in range(20):
+        await store.ensure(f"idle{n}")
+        await store.append_history(f"idle{n}", {"role": "user", "content": secrets.token_hex(2000)})
+
+    assert store.budget_evictions > 0
+    assert "live" in store._sessions
+    snapshot = await store.snapshot("live")
+    assert snapshot["instruction"] == "base"
+    assert snapshot["history_len"] == 1
+
+    # idle expiry skips it too, clear releases it
+    age(store, "live", TTL + 1)
+    assert "live" in store._sessions
+    await store.clear("live")
+    assert store.stats()["pinned"] == 0
+    await store.close()
@@ -0,0 +1,138 @@
+# tests/test_tts_cache.py
+import os
+
+import pytest
+
+from app.module.infra.tts_cache import TMP_SUFFIX, TtsCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_cache(root, **kwargs) -> TtsCache:
+    options = dict(
+        enabled=True,
+        memory_max_bytes=1000,
+        memory_item_max_bytes=400,
+        disk_max_bytes=2500,
+        max_text_chars=100,
+    )
+    options.update(kwargs)
+    return TtsCache(root, **options)
+
+
+def audio(n: int, size: int) -> bytes:
+    return bytes([n]) * size
+
+
+def test_key_is_per_model_voice_format_and_text(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.key("tts-1", "alloy", "mp3", "안녕하세요")
+    assert key.endswith(".mp3")
+    assert cache.key("tts-1", "alloy", "mp3", "안녕하세요") == key
+    assert len({
+        key,
+        cache.key("tts-1", "nova", "mp3", "안녕하세요"),
+        cache.key("tts-1", "alloy", "pcm", "안녕하세요"),
+        cache.key("gpt-4o-mini-tts", "alloy", "mp3", "안녕하세요"),
+        cache.key("tts-1", "alloy", "mp3", "안녕"),
+    }) == 5
+
+    assert cache.key("tts-1", "alloy", "mp3", "") is None
+    assert cache.key("tts-1", "alloy", "mp3", "x" * 101) is None
+    assert make_cache(tmp_path, enabled=False).key("tts-1", "alloy", "mp3", "hi") is None
+
+
+async def test_memory_then_disk_then_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.key("tts-1", "alloy", "mp3", "hi")
+    assert await cache.get(key) is None
+
+    cache.put(key, audio(1, 100))
+    await cache.close()
+    assert await cache.get(key) == audio(1, 100)
+    assert cache.memory_hits == 1
+
+    # a new process finds it on disk, then keeps it in memory
+    restarted = make_cache(tmp_path)
+    assert await restarted.get(key) == audio(1, 100)
+    assert await restarted.get(key) == audio(1, 100)
+    assert (restarted.disk_hits, restarted.memory_hits, restarted.misses) == (1, 1, 0)
+
+
+async def test_large_items_skip_the_memory_tier(tmp_path):
+    cache = make_cache(tmp_path)
+    small = cache.key("tts-1", "alloy", "mp3", "small")
+    large = cache.key("tts-1", "alloy", "mp3", "large")
+    cache.put(small, audio(1, 400))
+    cache.put(large, audio(2, 401))
+    await cache.close()
+
+    assert cache.stats()["memory"]["entries"] == 1
+    assert await cache.get(large) == audio(2, 401)
+    assert cache.disk_hits == 1
+    assert cache.stats()["memory"]["entries"] == 1
+
+
+async def test_memory_tier_is_bounded(tmp_path):
+    cache = make_cache(tmp_path)
+    keys = [cache.key("tts-1", "alloy", "mp3", str(n)) for n in range(4)]
+    for n, key in enumerate(keys):
+        cache.put(key, audio(n, 300))
+    await cache.close()
+
+    memory = cache.stats()["memory"]
+    assert memory["entries"] == 3
+    assert memory["bytes"] == 900
+    assert memory["evictions"] == 1
+    assert keys[0] not in cache._memory
+
+
+async def test_disk_tier_evicts_least_recently_used_by_size(tmp_path):
+    cache = make_cache(tmp_path, memory_max_bytes=1, memory_item_max_bytes=1)
+    keys = [cache.key("tts-1", "alloy", "mp3", str(n)) for n in range(3)]
+    for n, key in enumerate(keys[:2]):
+        cache.put(key, audio(n, 1000))
+        await cache.close()
+    assert await cache.get(keys[0]) == audio(0, 1000)  # keys[1] is now the oldest
+
+    cache.put(keys[2], audio(2, 1000))
+    await cache.close()
+
+    assert cache.disk_evictions == 1
+    assert cache.stats()["disk"]["bytes"] == 2000
+    assert not cache._path(keys[1]).exists()
+    assert await cache.get(keys[1]) is None
+    assert await cache.get(keys[0]) == audio(0, 1000)
+    assert await cache.get(keys[2]) == audio(2, 1000)
+
+
+async def test_scan_skips_unfinished_writes(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.key("tts-1", "alloy", "mp3", "hi")
+    cache.put(key, audio(1, 100))
+    await cache.close()
+
+    # a write interrupted by a crash leaves a tmp file next to the entries
+    tmp = cache._path(key).with_name(f"{key}.{os.getpid()}{TMP_SUFFIX}")
+    tmp.write_bytes(audio(9, 50))
+
+    restarted = make_cache(tmp_path)
+    disk = await restarted._load_index()
+    assert list(disk) == [key]
+    assert restarted.stats()["disk"]["bytes"] == 100
+
+
+async def test_contains_does_not_count_as_a_lookup(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.key("tts-1", "alloy", "mp3", "hi")
+    assert not await cache.contains(key)
+    cache.put(key, audio(1, 10))
+    assert await cache.contains(key)
+    await cache.close()
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,138 @@
+# tests/test_tts_pipeline.py
+import asyncio
+
+import pytest
+
+from app.module.ws.tts_pipeline import SentenceSplitter, TtsPipeline
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def split(deltas: list[str], min_chars: int = 10) -> list[str]:
+    splitter = SentenceSplitter(min_chars=min_chars)
+    out = []
+    for delta in deltas:
+        out += splitter.feed(delta)
+    return out + splitter.flush()
+
+
+# ---------- SentenceSplitter ----------
+def test_splits_english_across_deltas():
+    deltas = ["Hello the", "re. How are", " you today?", " I am fine"]
+    assert split(deltas) == ["Hello there.", "How are you today?", "I am fine"]
+
+
+def test_splits_korean_punctuation():
+    text = "안녕하세요, 만나서 반갑습니다. 오늘 무엇을 도와드릴까요? 날씨가 정말 좋네요！ 끝"
+    assert split([text], min_chars=5) == [
+        "안녕하세요, 만나서 반갑습니다.",
+        "오늘 무엇을 도와드릴까요?",
+        "날씨가 정말 좋네요！",
+        "끝",
+    ]
+
+
+def test_sentence_waits_for_the_following_whitespace():
+    splitter = SentenceSplitter(min_chars=1)
+    assert splitter.feed("The value is 3.") == []
+    assert splitter.feed("14 today.") == []
+    assert splitter.feed(" Next") == ["The value is 3.14 today."]
+
+
+def test_closing_quotes_and_newlines_end_a_sentence():
+    assert split(['He said "stop." Then', " left\nNew line here"], min_chars=1) == [
+        'He said "stop."',
+        "Then left",
+        "New line here",
+    ]
+
+
+def test_short_fragments_are_merged_into_the_next_sentence():
+    splitter = SentenceSplitter(min_chars=10)
+    assert splitter.feed("Yes. ") == []
+    assert splitter.feed("Ok. ") == []
+    assert splitter.feed("I can do that. ") == ["Yes. Ok. I can do that."]
+
+
+def test_flush_returns_a_held_short_fragment():
+    splitter = SentenceSplitter(min_chars=10)
+    assert splitter.feed("Sure. ") == []
+    assert splitter.flush() == ["Sure."]
+    assert splitter.flush() == []
+
+
+# ---------- TtsPipeline ----------
+class Synth:
+    def __init__(self, delays: dict[str, float], fail: tuple[str, ...] = ()):
+        self.delays = delays
+        self.fail = fail
+        self.running = 0
+        self.max_running = 0
+        self.emitted: list[bytes] = []
+
+    async def synthesize(self, text: str) -> tuple[bytes, int]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0))
+            if text in self.fail:
+                raise RuntimeError("tts failed")
+            return text.encode(), 1
+        finally:
+            self.running -= 1
+
+    async def emit(self, audio: bytes) -> None:
+        self.emitted.append(audio)
+
+
+async def test_audio_is_emitted_in_order_when_rendered_out_of_order():
+    synth = Synth({"one": 0.06, "two": 0.02, "three": 0.0, "four": 0.01})
+    pipeline = TtsPipeline(synth.synthesize, synth.emit, parallelism=4)
+    for text in ("one", "two", "three", "four"):
+        pipeline.submit(text)
+    await pipeline.finish()
+
+    assert synth.emitted == [b"one", b"two", b"three", b"four"]
+    assert synth.max_running == 4
+    assert pipeline.stats()["tokens"] == 4
+    assert pipeline.first_audio_ms is not None
+
+
+async def test_parallelism_is_bounded():
+    synth = Synth({text: 0.01 for text in "abcdefgh"})
+    pipeline = TtsPipeline(synth.synthesize, synth.emit, parallelism=2)
+    for text in "abcdefgh":
+        pipeline.submit(text)
+    await pipeline.finish()
+
+    assert synth.max_running == 2
+    assert synth.emitted == [text.encode() for text in "abcdefgh"]
+
+
+async def test_failed_sentence_is_skipped():
+    synth = Synth({}, fail=("two",))
+    pipeline = TtsPipeline(synth.synthesize, synth.emit, parallelism=2)
+    for text in ("one", "two", "three"):
+        pipeline.submit(text)
+    await pipeline.finish()
+
+    assert synth.emitted == [b"one", b"three"]
+
+
+async def test_cancel_drops_pending_sentences():
+    synth = Synth({"one": 0.0, "two": 10.0, "three": 0.0})
+    pipeline = TtsPipeline(synth.synthesize, synth.emit, parallelism=3)
+    for text in ("one", "two", "three"):
+        pipeline.submit(text)
+    await asyncio.sleep(0.01)
+    await pipeline.cancel()
+
+    assert synth.emitted == [b"one"]
+    assert synth.running == 0
+    pipeline.submit("four")
+    assert pipeline.sentences == 3
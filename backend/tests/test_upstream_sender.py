@@ -0,0 +1,157 @@
+# tests/test_upstream_sender.py
+import asyncio
+
+import pytest
+
+from app.module.ws.upstream_sender import COALESCE_MAX_BYTES, UpstreamSender
+
+pytestmark = pytest.mark.anyio
+
+RATE = 24000
+FRAME = 960  # 20ms mono 16-bit @ 24kHz
+WINDOW = 4800  # 100ms
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def frame(n: int, size: int = FRAME) -> bytes:
+    return bytes([n % 256]) * size
+
+
+class Recorder:
+    def __init__(self):
+        self.messages: list[bytes] = []
+
+    async def __call__(self, session_id: str, pcm: bytes) -> None:
+        self.messages.append(pcm)
+
+
+def make_sender(send=None, **kwargs) -> UpstreamSender:
+    options = dict(maxsize=50, policy="coalesce", window_ms=100, flush_timeout_ms=150, sample_rate=RATE)
+    options.update(kwargs)
+    return UpstreamSender("s1", send or Recorder(), **options)
+
+
+# ---------- overflow (sender not started, so the queue only fills) ----------
+def test_coalesce_merges_into_the_newest_message():
+    sender = make_sender(maxsize=3, policy="coalesce")
+    for n in range(5):
+        assert sender.put(frame(n))
+
+    assert sender.depth == 3
+    assert list(sender._queue) == [frame(0), frame(1), frame(2) + frame(3) + frame(4)]
+    assert sender.coalesced_frames == 2
+    assert sender.dropped_frames == 0
+
+
+def test_coalesce_falls_back_to_drop_oldest_at_the_cap():
+    sender = make_sender(maxsize=2, policy="coalesce")
+    sender.put(frame(0))
+    sender.put(frame(1, COALESCE_MAX_BYTES))
+    sender.put(frame(2))
+
+    assert list(sender._queue) == [frame(1, COALESCE_MAX_BYTES), frame(2)]
+    assert sender.dropped_frames == 1
+
+
+def test_drop_oldest_keeps_the_newest_frames():
+    sender = make_sender(maxsize=3, policy="drop_oldest")
+    for n in range(5):
+        assert sender.put(frame(n))
+
+    assert list(sender._queue) == [frame(2), frame(3), frame(4)]
+    assert sender.dropped_frames == 2
+
+
+def test_disconnect_asks_to_drop_the_connection():
+    sender = make_sender(maxsize=3, policy="disconnect")
+    assert all(sender.put(frame(n)) for n in range(3))
+    assert sender.put(frame(3)) is False
+    assert sender.depth == 3
+    assert sender.dropped_frames == 1
+
+
+def test_unknown_policy_means_coalesce():
+    assert make_sender(policy="nope").policy == "coalesce"
+
+
+# ---------- windowing ----------
+async def test_frames_are_sent_in_100ms_windows():
+    send = Recorder()
+    sender = make_sender(send)
+    sender.start()
+    for n in range(10):
+        sender.put(frame(n))
+    await asyncio.sleep(0.01)
+
+    assert send.messages == [
+        b"".join(frame(n) for n in range(5)),
+        b"".join(frame(n) for n in range(5, 10)),
+    ]
+    assert sender.window_flushes == 2
+    await sender.close()
+
+
+async def test_partial_window_is_sent_after_the_timeout():
+    send = Recorder()
+    sender = make_sender(send)
+    sender.start()
+    sender.put(frame(0))
+    sender.put(frame(1))
+
+    await asyncio.sleep(0.08)
+    assert send.messages == []  # still within 150ms of the first frame
+
+    await asyncio.sleep(0.15)
+    assert send.messages == [frame(0) + frame(1)]
+    assert sender.timeout_flushes == 1
+    assert sender.window_flushes == 0
+    await sender.close()
+
+
+# ---------- close ----------
+async def test_close_drains_the_queue_and_partial_window():
+    send = Recorder()
+    sender = make_sender(send)
+    for n in range(7):
+        sender.put(frame(n))
+    sender.start()
+    await sender.close()
+
+    assert b"".join(send.messages) == b"".join(frame(n) for n in range(7))
+    assert [len(m) for m in send.messages] == [WINDOW, 2 * FRAME]
+    assert sender.put(frame(9))  # ignored after close
+    assert sender.depth == 0
+
+
+async def test_close_without_flush_drops_pending_frames():
+    send = Recorder()
+    sender = make_sender(send)
+    sender.start()
+    sender.put(frame(0))
+    await asyncio.sleep(0)
+    await sender.close(flush=False)
+
+    assert send.messages == []
+
+
+async def test_send_error_does_not_stop_the_sender():
+    calls = []
+
+    async def flaky(session_id: str, pcm: bytes) -> None:
+        calls.append(pcm)
+        if len(calls) == 1:
+            raise ConnectionError("closed")
+
+    sender = make_sender(flaky)
+    sender.start()
+    for n in range(10):
+        sender.put(frame(n))
+    await sender.close()
+
+    assert len(calls) == 2
+    assert sender.send_errors == 1
+    assert sender.sent_messages == 1
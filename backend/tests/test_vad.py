@@ -0,0 +1,85 @@
+# tests/test_vad.py
+import numpy as np
+
+from app.module.ws.vad import VadGate, trim_silence
+
+RATE = 16000
+FRAME_MS = 20
+CHUNK = RATE * FRAME_MS // 1000  # samples per 20ms chunk
+
+
+def silence(chunks: int = 1, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    return rng.integers(-10, 10, CHUNK * chunks, dtype=np.int16).tobytes()
+
+
+def speech(chunks: int = 1) -> bytes:
+    t = np.arange(CHUNK * chunks) / RATE
+    return (np.sin(2 * np.pi * 300 * t) * 8000).astype(np.int16).tobytes()
+
+
+def make_gate() -> VadGate:
+    return VadGate(RATE, threshold_db=-40, margin_db=10, hangover_ms=100, preroll_ms=60, frame_ms=FRAME_MS)
+
+
+def test_silence_is_dropped():
+    gate = make_gate()
+    for n in range(20):
+        assert gate.process(silence(seed=n)) == []
+    assert gate.frames_dropped == 20
+    assert gate.frames_sent == 0
+
+
+def test_onset_sends_the_preroll_first():
+    gate = make_gate()
+    quiet = [silence(seed=n) for n in range(10)]
+    for chunk in quiet:
+        gate.process(chunk)
+
+    onset = speech()
+    # 60ms of pre-roll = the last three 20ms chunks, in order, then the speech itself
+    assert gate.process(onset) == quiet[-3:] + [onset]
+    assert gate.frames_sent == 4
+    assert gate.frames_sent + gate.frames_dropped == gate.frames_in
+
+
+def test_trailing_silence_is_cut_after_the_hangover():
+    gate = make_gate()
+    gate.process(speech())
+    assert gate.process(speech()) == [speech()]
+
+    # 100ms hangover: four more 20ms chunks go through, the fifth closes the gate
+    tail = [silence(seed=n) for n in range(8)]
+    sent = [gate.process(chunk) for chunk in tail]
+    assert sent[:4] == [[chunk] for chunk in tail[:4]]
+    assert sent[4:] == [[], [], [], []]
+    assert not gate.stats()["open"]
+
+    # speech again reopens with the held-back pre-roll
+    assert gate.process(speech()) == tail[-3:] + [speech()]
+
+
+def test_trim_silence_keeps_speech_with_padding():
+    pcm = silence(25) + speech(15) + silence(25, seed=1)
+    view, head_ms, tail_ms = trim_silence(pcm, RATE, threshold_db=-40, margin_db=10, pad_ms=40, frame_ms=FRAME_MS)
+
+    # 2 frames of padding on each side
+    assert head_ms == 460
+    assert tail_ms == 460
+    assert bytes(view) == pcm[23 * CHUNK * 2: 42 * CHUNK * 2]
+
+
+def test_trim_silence_drops_all_silence():
+    pcm = silence(50)
+    view, head_ms, tail_ms = trim_silence(pcm, RATE, threshold_db=-40, margin_db=10, frame_ms=FRAME_MS)
+    assert len(view) == 0
+    assert head_ms == 1000
+    assert tail_ms == 0
+
+
+def test_trim_silence_keeps_speech_touching_the_end():
+    pcm = silence(10) + speech(10)
+    view, head_ms, tail_ms = trim_silence(pcm, RATE, threshold_db=-40, margin_db=10, pad_ms=40, frame_ms=FRAME_MS)
+    assert head_ms == 160
+    assert tail_ms == 0
+    assert bytes(view) == pcm[8 * CHUNK * 2:]
@@ -0,0 +1,57 @@
+# tests/test_write_behind.py
+import pytest
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.module.infra.write_behind import INVALID, LOG_END, MESSAGE, TRANSIENT, WriteBehindQueue
+
+pytestmark = pytest.mark.anyio
+
+BAD_LOG_ID = -1  # no such log
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+# records what reached the DB; a batch with a stale log_id fails as a whole (FK violation)
+class FakeQueue(WriteBehindQueue):
+    def __init__(self, error=None, **kwargs):
+        super().__init__(retry_base_ms=0, **kwargs)
+        self.error = error
+        self.stored: list[dict] = []
+
+    async def _write(self, messages, log_ends):
+        if self.error is not None:
+            raise self.error
+        if any(m["log_id"] == BAD_LOG_ID for m in messages):
+            raise IntegrityError("INSERT INTO messages", {}, Exception("foreign key constraint fails"))
+        self.stored.extend(messages + log_ends)
+
+
+def batch(size: int, bad: tuple[int, ...] = ()) -> list[tuple[str, dict]]:
+    records = [(MESSAGE, {"log_id": BAD_LOG_ID if n in bad else n, "message": f"m{n}"}) for n in range(size)]
+    records.append((LOG_END, {"session_id": "s1", "ended_reason": "user", "ended_at": None}))
+    return records
+
+
+async def test_bad_record_is_isolated():
+    queue = FakeQueue()
+    await queue._flush(batch(100, bad=(7, 61)))
+
+    assert len(queue.stored) == 99
+    assert all(record.get("log_id") != BAD_LOG_ID for record in queue.stored)
+    assert queue.written == 99
+    assert queue.failed == {TRANSIENT: 0, INVALID: 2}
+    assert queue.retries == 0
+
+
+async def test_transient_error_retries_whole_batch_then_drops_it():
+    queue = FakeQueue(error=OperationalError("INSERT", {}, Exception("server has gone away")), max_retries=2)
+    await queue._flush(batch(10))
+
+    assert queue.stored == []
+    assert queue.retries == 2
+    assert queue.splits == 0
+    assert queue.failed == {TRANSIENT: 11, INVALID: 0}
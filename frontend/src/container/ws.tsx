@@ -9,6 +9,7 @@ interface LogItem {
   type: LogType;
   text: string;
   time: string;
+  partial?: boolean;
 }
 
 const WsPage = () => {
@@ -91,11 +92,45 @@ const WsPage = () => {
     });
   };
 
+  // gpt_text: partial 델타는 마지막 항목에 이어 붙이고, 최종 프레임이 오면 교체
+  const addGptLog = (
+    setter: React.Dispatch<React.SetStateAction<LogItem[]>>,
+    text: string,
+    isPartial?: boolean
+  ) => {
+    if (!text) return;
+
+    setter((prev) => {
+      const last = prev[prev.length - 1];
+
+      if (last && last.type === "gpt_text" && last.partial) {
+        const updatedLast: LogItem = {
+          ...last,
+          text: isPartial ? last.text + text : text,
+          partial: !!isPartial,
+        };
+        return [...prev.slice(0, -1), updatedLast];
+      }
+
+      return [
+        ...prev,
+        {
+          id: prev.length + 1,
+          type: "gpt_text",
+          text,
+          time: new Date().toLocaleTimeString(),
+          partial: !!isPartial,
+        },
+      ];
+    });
+  };
+
   // ----------------------------------
   // realtime 훅 (mode: "realtime")
   // ----------------------------------
   const realtimeWs = useAudioWs({
     mode: "realtime",
+    textStream: true,
     onConnect: (sid) =>
       pushLog(
         setRealtimeLogs,
@@ -107,9 +142,11 @@ const WsPage = () => {
     onSttText: (text) => {
       addSttLog(setRealtimeLogs, text);
     },
-    onGptText: (text) => pushLog(setRealtimeLogs, "gpt_text", text),
+    onGptText: (text, isPartial) => addGptLog(setRealtimeLogs, text, isPartial),
     onTtsStart: () => pushLog(setRealtimeLogs, "system", "TTS start"),
     onTtsEnd: () => pushLog(setRealtimeLogs, "system", "TTS end"),
+    onBusy: (operation, reason) =>
+      pushLog(setRealtimeLogs, "system", `Server busy (${operation}: ${reason}), please retry`),
   });
 
   // ----------------------------------
@@ -117,6 +154,7 @@ const WsPage = () => {
   // ----------------------------------
   const legacyWs = useAudioWs({
     mode: "legacy",
+    textStream: true,
     onConnect: (sid) =>
       pushLog(setLegacyLogs, "system", `Connected (legacy) | session=${sid}`),
     onDisconnect: () =>
@@ -124,9 +162,11 @@ const WsPage = () => {
     onSttText: (text) => {
       addSttLog(setLegacyLogs, text);
     },
-    onGptText: (text) => pushLog(setLegacyLogs, "gpt_text", text),
+    onGptText: (text, isPartial) => addGptLog(setLegacyLogs, text, isPartial),
     onTtsStart: () => pushLog(setLegacyLogs, "system", "TTS start"),
     onTtsEnd: () => pushLog(setLegacyLogs, "system", "TTS end"),
+    onBusy: (operation, reason) =>
+      pushLog(setLegacyLogs, "system", `Server busy (${operation}: ${reason}), please retry`),
   });
 
   // ----------------------------------
@@ -2,9 +2,14 @@ import { useRef } from "react";
 import { baseURL } from "./useAPI";
 
 type Mode = "realtime" | "legacy";
+// stream: 프레임 단위 PCM16 청크 (realtime/legacy 공통), buffered: 응답 전체를 한 번에
+type Downlink = "stream" | "buffered";
 
 interface AudioWsProps {
   mode?: Mode;
+  downlink?: Downlink;
+  // chat 응답을 partial gpt_text 델타로 스트리밍 받을지 여부
+  textStream?: boolean;
   onConnect?: (sessionId: string) => void;
   onDisconnect?: () => void;
   onSttText?: (text: string, isPartial?: boolean) => void;
@@ -12,13 +17,20 @@ interface AudioWsProps {
   onTtsStart?: () => void;
   onTtsEnd?: () => void;
   onChatText?: (text: string) => void;
+  // 서버 과부하 / 업스트림 장애로 요청이 거절됨 (operation: stt / response / tts / summary / realtime)
+  // reason: queue_full / timeout / circuit_open (circuit_open이면 retryAfterMs 후 재시도)
+  onBusy?: (operation: string, reason: string, retryAfterMs?: number) => void;
 }
 
 // WebSocket의 OPEN 상태
 const WS_OPEN = 1;
 
+// 스트리밍 오디오 프레임 헤더: seq(uint32 LE) + flags(uint32 LE)
+const AUDIO_FRAME_HEADER_BYTES = 8;
+const AUDIO_FRAME_FLAG_END = 0x01;
+
 export const useAudioWs = (props: AudioWsProps = {}) => {
-  const { mode = "realtime" } = props;
+  const { mode = "realtime", downlink = "stream", textStream = false } = props;
   // 실제 WebSocket 인스턴스를 보관하는 ref
   const wsRef = useRef<WebSocket | null>(null);
   // 서버와 공유하는 session id (config/send/disconnect에서 사용)
@@ -31,6 +43,12 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
   const playbackCtxRef = useRef<AudioContext | null>(null);
   // legacy 모드에서 <audio> 인스턴스 저장용
   const legacyAudioRef = useRef<HTMLAudioElement | null>(null);
+  // legacy 모드에서 재생 대기 중인 MP3 (문장 단위로 도착)
+  const legacyQueueRef = useRef<Blob[]>([]);
+  // 스트리밍 재생: 다음 청크 시작 시각 / 마지막 소스 / 응답 재생 중 여부
+  const nextPlayTimeRef = useRef(0);
+  const lastSourceRef = useRef<AudioBufferSourceNode | null>(null);
+  const streamingRef = useRef(false);
 
   // WebSocket 서버에 연결하는 함수
   const connect = async (chatbot_id: number = 1) => {
@@ -41,7 +59,7 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
     sessionIdRef.current = sessionId;
 
     const ws = new WebSocket(wsUrl);
-    ws.binaryType = "blob";
+    ws.binaryType = "arraybuffer";
     wsRef.current = ws;
 
     ws.onopen = () => {
@@ -52,7 +70,11 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
           sampleRate: 24000,
           clientSampleRate: 24000,
           mode,
+          downlink,
+          text_stream: textStream,
           chatbot_id: chatbot_id,
+          // legacy: 연결 시 챗봇 인사말(텍스트 + 음성) 재생
+          greeting: mode !== "realtime",
         })
       );
       props.onConnect?.(sessionId);
@@ -70,6 +92,9 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
             case "gpt_text":
               props.onGptText?.(msg.text ?? "", msg.partial);
               break;
+            case "busy":
+              props.onBusy?.(msg.operation ?? "", msg.reason ?? "", msg.retry_after_ms);
+              break;
             default:
               console.log("WS text msg:", msg);
           }
@@ -80,59 +105,32 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
       }
 
       // 바이너리 프레임 (TTS 오디오)
-      const blob = e.data as Blob;
-      props.onTtsStart?.();
-
-      if (mode === "realtime") {
-        // Realtime: PCM16(24kHz) → Web Audio 재생
-        blob
-          .arrayBuffer()
-          .then((buf) => playPcm16(buf))
-          .then(() => {
-            props.onTtsEnd?.();
-          })
-          .catch((err) => {
-            console.error("audio play error (realtime):", err);
+      const buf = e.data as ArrayBuffer;
+
+      if (downlink === "stream") {
+        // 스트리밍: 프레임 단위 PCM16(24kHz) → Web Audio 순차 재생
+        playPcmFrame(buf);
+      } else if (mode === "realtime") {
+        // Realtime(buffered): 응답 전체 PCM16(24kHz) → Web Audio 재생
+        props.onTtsStart?.();
+        try {
+          const src = schedulePcm16(buf);
+          if (src) {
+            src.onended = () => props.onTtsEnd?.();
+          } else {
             props.onTtsEnd?.();
-          });
-      } else {
-        // Legacy: MP3 → <audio> 재생
-        // 기존에 재생 중이던 게 있으면 먼저 정리
-        if (legacyAudioRef.current) {
-          legacyAudioRef.current.pause();
-          legacyAudioRef.current.currentTime = 0;
-          legacyAudioRef.current = null;
-        }
-
-        const url = URL.createObjectURL(blob);
-        const audio = new Audio(url);
-        legacyAudioRef.current = audio;
-
-        audio.onended = () => {
-          URL.revokeObjectURL(url);
-          if (legacyAudioRef.current === audio) {
-            legacyAudioRef.current = null;
           }
+        } catch (err) {
+          console.error("audio play error (realtime):", err);
           props.onTtsEnd?.();
-        };
-
-        audio.onerror = (err) => {
-          console.error("audio play error (legacy):", err);
-          URL.revokeObjectURL(url);
-          if (legacyAudioRef.current === audio) {
-            legacyAudioRef.current = null;
-          }
-          props.onTtsEnd?.();
-        };
-
-        audio.play().catch((err) => {
-          console.error("audio play error (legacy play):", err);
-          URL.revokeObjectURL(url);
-          if (legacyAudioRef.current === audio) {
-            legacyAudioRef.current = null;
-          }
-          props.onTtsEnd?.();
-        });
+        }
+      } else {
+        // Legacy: 문장 단위 MP3 → 큐에 쌓아서 <audio>로 순서대로 재생
+        legacyQueueRef.current.push(new Blob([buf], { type: "audio/mpeg" }));
+        if (!legacyAudioRef.current) {
+          props.onTtsStart?.();
+          playNextLegacy();
+        }
       }
     };
 
@@ -148,6 +146,38 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
     };
   };
 
+  // legacy: 큐의 다음 MP3 재생, 큐가 비면 onTtsEnd
+  const playNextLegacy = () => {
+    const blob = legacyQueueRef.current.shift();
+    if (!blob) {
+      legacyAudioRef.current = null;
+      props.onTtsEnd?.();
+      return;
+    }
+
+    const url = URL.createObjectURL(blob);
+    const audio = new Audio(url);
+    legacyAudioRef.current = audio;
+
+    const next = () => {
+      URL.revokeObjectURL(url);
+      // 재생이 중단된 경우(stopPlaybackImmediately)에는 이어서 재생하지 않음
+      if (legacyAudioRef.current === audio) {
+        playNextLegacy();
+      }
+    };
+
+    audio.onended = next;
+    audio.onerror = (err) => {
+      console.error("audio play error (legacy):", err);
+      next();
+    };
+    audio.play().catch((err) => {
+      console.error("audio play error (legacy play):", err);
+      next();
+    });
+  };
+
   /**
    * 마이크 캡처 시작
    */
@@ -235,7 +265,8 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
    * - legacy: <audio> pause
    */
   const stopPlaybackImmediately = () => {
-    // legacy: HTMLAudio 정지
+    // legacy: HTMLAudio 정지 + 대기 큐 비우기
+    legacyQueueRef.current = [];
     if (legacyAudioRef.current) {
       try {
         legacyAudioRef.current.pause();
@@ -248,6 +279,9 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
     }
 
     // realtime: playback AudioContext 정리
+    streamingRef.current = false;
+    lastSourceRef.current = null;
+    nextPlayTimeRef.current = 0;
     if (playbackCtxRef.current) {
       try {
         playbackCtxRef.current.close();
@@ -304,14 +338,16 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
     );
   };
 
-  // 서버에서 온 PCM16(24kHz) 버퍼 재생 (realtime)
-  const playPcm16 = async (buf: ArrayBuffer) => {
+  // 서버에서 온 PCM16(24kHz) 버퍼를 이전 청크 뒤에 이어서 재생
+  const schedulePcm16 = (buf: ArrayBuffer, byteOffset = 0) => {
     if (!playbackCtxRef.current) {
       playbackCtxRef.current = new AudioContext({ sampleRate: 24000 });
+      nextPlayTimeRef.current = 0;
     }
     const ctx = playbackCtxRef.current;
 
-    const int16 = new Int16Array(buf);
+    const int16 = new Int16Array(buf, byteOffset);
+    if (!int16.length) return null;
     const float32 = new Float32Array(int16.length);
     for (let i = 0; i < int16.length; i++) {
       let v = int16[i] / 0x8000;
@@ -326,7 +362,41 @@ export const useAudioWs = (props: AudioWsProps = {}) => {
     const src = ctx.createBufferSource();
     src.buffer = audioBuffer;
     src.connect(ctx.destination);
-    src.start();
+
+    const startAt = Math.max(ctx.currentTime, nextPlayTimeRef.current);
+    src.start(startAt);
+    nextPlayTimeRef.current = startAt + audioBuffer.duration;
+    lastSourceRef.current = src;
+    return src;
+  };
+
+  // realtime 스트리밍 프레임 처리 (seq + flags 헤더 + PCM16)
+  const playPcmFrame = (buf: ArrayBuffer) => {
+    if (buf.byteLength < AUDIO_FRAME_HEADER_BYTES) return;
+    const flags = new DataView(buf).getUint32(4, true);
+
+    if (!(flags & AUDIO_FRAME_FLAG_END)) {
+      if (!streamingRef.current) {
+        streamingRef.current = true;
+        props.onTtsStart?.();
+      }
+      try {
+        schedulePcm16(buf, AUDIO_FRAME_HEADER_BYTES);
+      } catch (err) {
+        console.error("audio play error (realtime):", err);
+      }
+      return;
+    }
+
+    // 응답 종료 마커: 마지막 청크 재생이 끝나면 onTtsEnd
+    streamingRef.current = false;
+    const last = lastSourceRef.current;
+    lastSourceRef.current = null;
+    if (last) {
+      last.onended = () => props.onTtsEnd?.();
+    } else {
+      props.onTtsEnd?.();
+    }
   };
 
   return {